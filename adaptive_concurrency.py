@@ -0,0 +1,142 @@
+"""
+Adaptive (AIMD) concurrency limits per model deployment.
+Each deployment starts at MAX_CONCURRENCY_PER_DEPLOYMENT calls in flight. Every
+healthy call adds 1/limit (so the limit grows by about one per round of calls); a
+429, a timeout or latency well above its unloaded latency cuts it multiplicatively.
+Each deployment settles near the most concurrency it can sustain without hand tuning.
+"""
+
+import os
+import time
+import asyncio
+from collections import deque
+
+import instrumentation
+
+ADAPTIVE = os.environ.get("ADAPTIVE_CONCURRENCY", "1") != "0"
+MIN_CONCURRENCY = int(os.environ.get("MIN_CONCURRENCY_PER_DEPLOYMENT", "1"))
+MAX_CONCURRENCY_CEILING = int(os.environ.get("MAX_CONCURRENCY_CEILING", "64"))
+DECREASE_FACTOR = 0.5
+LATENCY_TOLERANCE = 2.0  # back off when recent latency exceeds this multiple of the unloaded latency
+SHORT_ALPHA = 0.2  # EWMA weight of recent latency
+BASELINE_ALPHA = 0.05  # EWMA weight of the smoother latency whose minimum estimates the unloaded latency
+BASELINE_DRIFT = 0.001  # the minimum is forgotten slowly, so a deployment that really got slower is re-learned
+WARMUP_CALLS = 20  # successes seen before latency is judged
+
+class AdaptiveLimit:
+    """asyncio concurrency limit for one deployment (use with `async with`, or acquire/release)
+
+    With adaptive=False it behaves like a plain semaphore of the initial size. The ceiling
+    should not exceed the worker threads the calls run on: calls admitted beyond that only
+    queue for a thread.
+    """
+
+    def __init__(self, model, initial, adaptive=None, min_limit=MIN_CONCURRENCY, max_limit=MAX_CONCURRENCY_CEILING):
+        self.model = model
+        self.adaptive = ADAPTIVE if adaptive is None else adaptive
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, initial)
+        self.limit = float(initial)
+        self.in_flight = 0
+        self.waiters = deque()
+        self.recent = None  # short-term latency EWMA
+        self.smoothed = None  # smoother latency EWMA
+        self.baseline = None  # unloaded latency: the lowest smoothed latency seen, drifting up slowly
+        self.samples = 0
+        self.draining = 0  # completions to wait for after a cut before cutting again
+        self.throttled_seen = 0
+        self.stats = {"increases": 0, "decreases": 0, "peak": initial}
+        instrumentation.gauge(self.gauge_name, initial)
+
+    @property
+    def gauge_name(self):
+        return f"concurrency[{self.model}]"
+
+    @property
+    def current(self):
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self):
+        while self.in_flight >= self.current:
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+                else:
+                    self.wake()  # we were woken but won't use the slot; pass it on
+                raise
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self.wake()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+    def wake(self):
+        """Let as many waiters retry as there are free slots"""
+        free = self.current - self.in_flight
+        while free > 0 and self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def observe(self, latency, status, throttled_total=0):
+        """Adjust the limit after a call (latency in seconds, result status, the deployment's 429 count so far)"""
+        throttled = throttled_total > self.throttled_seen
+        self.throttled_seen = throttled_total
+        if not self.adaptive or status in ("cancelled", "skipped"):
+            return
+
+        if status == "success":
+            self.samples += 1
+            self.recent = latency if self.recent is None else SHORT_ALPHA * latency + (1 - SHORT_ALPHA) * self.recent
+            # Plain mean over the first calls, so one lucky sample can't set the baseline
+            alpha = max(BASELINE_ALPHA, 1 / self.samples)
+            self.smoothed = latency if self.smoothed is None else alpha * latency + (1 - alpha) * self.smoothed
+            if self.samples <= WARMUP_CALLS:
+                self.baseline = self.smoothed
+            else:
+                self.baseline = min(self.baseline * (1 + BASELINE_DRIFT), self.smoothed)
+        slow = self.samples > WARMUP_CALLS and self.recent > LATENCY_TOLERANCE * self.baseline
+
+        if throttled or slow or status == "timeout":
+            # One cut per round trip: the calls still in flight were sent under the old limit,
+            # so their latency and errors say nothing about the new one
+            if self.draining <= 0:
+                self.draining = self.in_flight
+                self.set_limit(max(self.min_limit, self.limit * DECREASE_FACTOR))
+                self.stats["decreases"] += 1
+            else:
+                self.draining -= 1
+        elif status == "success":
+            self.draining -= 1
+            self.set_limit(min(self.max_limit, self.limit + 1 / self.limit))
+            self.stats["increases"] += 1
+
+    def set_limit(self, limit):
+        before = self.current
+        self.limit = limit
+        if self.current != before:
+            self.stats["peak"] = max(self.stats["peak"], self.current)
+            instrumentation.gauge(self.gauge_name, self.current)
+            self.wake()
+
+    def format_stats(self):
+        return f"{self.model} {self.current} (peak {self.stats['peak']}, {self.stats['decreases']} cuts)"
+
+def format_limits(limits):
+    """One line summarizing the final limit of each deployment"""
+    adaptive = [limit for limit in limits if limit.adaptive]
+    if not adaptive:
+        return ""
+    return "🎚️  Concurrency limits: " + ", ".join(limit.format_stats() for limit in adaptive)
@@ -1,124 +1,280 @@
 import os
+import sys
+import time
 import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
-from azure.ai.projects.models import PromptAgentDefinition
+
+import live_view
+import batch_runner
+import response_cache
+import instrumentation
+import hedging
+import deadlines
+import throttling
+import circuit_breaker
+import adaptive_concurrency
+import summary_compaction
+import quorum
+import single_flight
+import conversation_pool
+import foundry_clients
+import agent_registry
+from agent_provisioning import describe
 
 load_dotenv()
 
-# Coordinator agent configuration
+# Coordinator agent configuration (model and instructions live in agents.toml)
 AGENT_NAME = "agent-coordinator"
-MODEL_DEPLOYMENT_NAME = "gpt-5.2"  # Use GPT for orchestration
-
-# Target agents to coordinate
-TARGET_AGENTS = [
-    {"name": "agent-deepseek", "model": "DeepSeek-V3.2"},
-    {"name": "agent-gpt", "model": "gpt-5.2"}, 
-    {"name": "agent-mistral", "model": "Mistral-Large-3"}
-]
-
-print(f"Using PROJECT_ENDPOINT: {os.environ['PROJECT_ENDPOINT']}")
-print(f"Using MODEL_DEPLOYMENT_NAME: {MODEL_DEPLOYMENT_NAME}")
-
-project_client = AIProjectClient(
-    endpoint=os.environ["PROJECT_ENDPOINT"],
-    credential=DefaultAzureCredential(),
-)
-
-# Create coordinator agent using NEW Foundry Agent Service
-coordinator_agent = project_client.agents.create_version(
-    agent_name=AGENT_NAME,
-    definition=PromptAgentDefinition(
-        model=MODEL_DEPLOYMENT_NAME,
-        instructions="You are a coordinator agent that orchestrates storytelling from multiple AI agents. You present their responses in a clear, side-by-side format for comparison.",
-    ),
-)
-print(f"NEW Foundry Coordinator Agent created (id: {coordinator_agent.id}, name: {coordinator_agent.name}, version: {coordinator_agent.version})")
-
-# Get OpenAI client for NEW Foundry Responses API
-openai_client = project_client.get_openai_client()
-
-async def call_agent_async(agent_info, user_input, timeout=30):
-    """Call a specific agent asynchronously with error handling"""
+COORDINATOR_SPEC = agent_registry.get_agent(AGENT_NAME)
+MODEL_DEPLOYMENT_NAME = COORDINATOR_SPEC.model
+
+# Target agents to coordinate: the "storytelling" group in agents.toml
+TARGET_AGENTS = [{"name": spec.name, "model": spec.model} for spec in agent_registry.select(group="storytelling")]
+
+# Concurrency limits for the parallel fan-out (the per-deployment limit is the starting point
+# for adaptive limits, see adaptive_concurrency.py; ADAPTIVE_CONCURRENCY=0 keeps it fixed)
+MAX_CONCURRENCY_PER_DEPLOYMENT = int(os.environ.get("MAX_CONCURRENCY_PER_DEPLOYMENT", "4"))
+MAX_WORKER_THREADS = int(os.environ.get("MAX_WORKER_THREADS", "32"))
+
+# Live view refresh interval for streaming mode (seconds)
+STREAM_REFRESH_INTERVAL = 0.1
+
+# Clients are created by connect(), so importing this module (e.g. from benchmarks) has no network side effects
+project_client = None
+openai_client = None
+coordinator_agent = None
+
+# Set to a hedging.HedgePolicy (--hedge) to duplicate slow calls to a backup agent
+hedge_policy = None
+
+def connect():
+    """Create the project and OpenAI clients and provision the coordinator agent"""
+    global project_client, openai_client, coordinator_agent
+    
+    print(f"Using PROJECT_ENDPOINT: {os.environ['PROJECT_ENDPOINT']}")
+    print(f"Using MODEL_DEPLOYMENT_NAME: {MODEL_DEPLOYMENT_NAME}")
+    
+    # Shared, pooled clients; traced when --trace / FOUNDRY_TRACE=1 is on
+    instrumentation.AGENT_MODELS.update({agent['name']: agent['model'] for agent in TARGET_AGENTS})
+    instrumentation.AGENT_MODELS[AGENT_NAME] = MODEL_DEPLOYMENT_NAME
+    project_client = foundry_clients.get_project_client()
+    
+    # Create coordinator agent using NEW Foundry Agent Service
+    coordinator_agent = agent_registry.provision(project_client, COORDINATOR_SPEC)
+    print(f"NEW Foundry Coordinator Agent {describe(coordinator_agent)} (id: {coordinator_agent.id}, name: {coordinator_agent.name}, version: {coordinator_agent.version})")
+    
+    # Get OpenAI client for NEW Foundry Responses API
+    openai_client = foundry_clients.get_openai_client()
+
+# Shared worker pool for blocking SDK calls, plus one limiter per model deployment
+agent_executor = ThreadPoolExecutor(max_workers=MAX_WORKER_THREADS, thread_name_prefix="agent-call")
+deployment_semaphores = {}
+
+def get_deployment_semaphore(model):
+    """Get the (adaptive) concurrency limiter for a model deployment, creating it on first use"""
+    if model not in deployment_semaphores:
+        # More calls in flight than worker threads would only queue for a thread
+        ceiling = min(adaptive_concurrency.MAX_CONCURRENCY_CEILING, MAX_WORKER_THREADS)
+        deployment_semaphores[model] = adaptive_concurrency.AdaptiveLimit(model, MAX_CONCURRENCY_PER_DEPLOYMENT, max_limit=ceiling)
+    return deployment_semaphores[model]
+
+async def run_limited(agent_info, func, *args):
+    """Run a blocking call on the worker pool within its deployment's limit, feeding the outcome back to it
+    
+    Latency is measured from when a worker thread picks the call up. A cancelled call keeps
+    its slot until its thread is done, so the limit counts every call really in flight.
+    """
+    limit = get_deployment_semaphore(agent_info['model'])
+    await limit.acquire()
+    loop = asyncio.get_running_loop()
+    timing = {}
+    
+    def timed():
+        timing['started'] = time.perf_counter()
+        return func(*args)
+    
+    future = agent_executor.submit(timed)
+    status = "timeout"  # unless the call returns: cancelled at a deadline
     try:
-        print(f"Calling {agent_info['name']}...")
-        
-        # Create conversation for this agent
-        conversation = openai_client.conversations.create()
-        
-        # Use NEW Foundry Responses API with agent reference
-        response = openai_client.responses.create(
-            conversation=conversation.id,
-            extra_body={"agent": {"name": agent_info['name'], "type": "agent_reference"}},
-            input=user_input
-        )
-        
+        result = await asyncio.wrap_future(future)
+        status = result['status']
+        return result
+    except asyncio.CancelledError as error:
+        status = deadlines.cancelled_status(error)
+        raise
+    finally:
+        if 'started' in timing:  # a call cancelled while queued for a thread says nothing about the model
+            limit.observe(time.perf_counter() - timing['started'], status, throttling.get_limiter(agent_info['model']).throttled)
+        if future.done():
+            limit.release()
+        else:
+            future.add_done_callback(lambda _: release_soon(loop, limit))
+
+def release_soon(loop, limit):
+    """Release a limit slot from a worker thread once its call is done"""
+    try:
+        loop.call_soon_threadsafe(limit.release)
+    except RuntimeError:  # the event loop is already closed, and its limits with it
+        pass
+
+def lookup_cached_response(agent_info, user_input):
+    """Check the (opt-in) response cache; returns (fingerprint, cached text or None)"""
+    cache = response_cache.get_response_cache()
+    if cache is None:
+        return None, None
+    fingerprint = response_cache.agent_fingerprint(agent_info['name'], project_client)
+    return fingerprint, cache.lookup(agent_info['name'], fingerprint, user_input)
+
+def store_cached_response(agent_info, fingerprint, user_input, response_text):
+    cache = response_cache.get_response_cache()
+    # An empty answer is never worth replaying
+    if cache is not None and response_text:
+        cache.store(agent_info['name'], fingerprint, user_input, response_text)
+
+def invoke_agent(agent_info, user_input):
+    """Call a specific agent (blocking) and wrap the outcome in a result dict"""
+    fingerprint, cached = lookup_cached_response(agent_info, user_input)
+    if cached is not None:
         return {
             "agent": agent_info['name'],
             "model": agent_info['model'],
-            "response": response.output_text,
-            "status": "success"
-        }
-    except Exception as e:
-        return {
-            "agent": agent_info['name'],
-            "model": agent_info['model'], 
-            "response": f"Sorry, {agent_info['name']} is currently unavailable. Error: {str(e)}",
-            "status": "error"
+            "response": cached,
+            "status": "success",
+            "cached": True
         }
+    
+    with instrumentation.traced("agent.call", agent_info['name'], agent_info['model']) as span:
+        try:
+            # Use NEW Foundry Responses API with agent reference (stateless by default, see AGENT_CALL_MODE)
+            kwargs = conversation_pool.conversation_kwargs(openai_client)
+            estimated = throttling.estimate_tokens(user_input)
+            response = throttling.call_with_retries(
+                lambda: openai_client.responses.create(
+                    **kwargs,
+                    extra_body={"agent": {"name": agent_info['name'], "type": "agent_reference"}},
+                    input=user_input
+                ),
+                agent_info['model'], estimated,
+            )
+            throttling.record_usage(agent_info['model'], estimated, getattr(response, "usage", None))
+            store_cached_response(agent_info, fingerprint, user_input, response.output_text)
+            
+            return {
+                "agent": agent_info['name'],
+                "model": agent_info['model'],
+                "response": response.output_text,
+                "status": "success"
+            }
+        except Exception as e:
+            span.status, span.error = "error", str(e)
+            return {
+                "agent": agent_info['name'],
+                "model": agent_info['model'], 
+                "response": f"Sorry, {agent_info['name']} is currently unavailable. Error: {str(e)}",
+                "status": "error"
+            }
+
+def hedge_backups():
+    """Backup agents for hedged calls, from the `backup` fields in agents.toml"""
+    specs = agent_registry.load_registry()
+    return {
+        spec.name: {"name": specs[spec.backup].name, "model": specs[spec.backup].model}
+        for spec in specs.values() if spec.backup
+    }
+
+async def call_agent_cancellable(agent_info, user_input, cancel):
+    """Stream one agent's answer on the worker pool; setting cancel closes the stream"""
+    state = {"text": "", "status": "pending", "ttft": None, "total_time": None}
+    return await run_limited(agent_info, stream_agent, agent_info, user_input, state, cancel)
+
+async def call_agent_hedged(agent_info, user_input, cancel=None):
+    """Call an agent, duplicating the request to its backup if it is slower than usual; setting cancel stops both"""
+    # Each attempt takes a slot on its own deployment, so hedges never exceed the limits
+    async def start(info, attempt_cancel):
+        return await call_agent_cancellable(info, user_input, attempt_cancel)
+    
+    return await hedging.hedged_call(hedge_policy, agent_info, start, cancel)
+
+async def with_circuit_breaker(agent_info, call):
+    """Skip the agent at once while its circuit is open; otherwise await call() and record the outcome"""
+    breaker = circuit_breaker.get_breaker()
+    if breaker is None:
+        return await call()
+    if not breaker.allow(agent_info['name']):
+        return breaker.skipped_result(agent_info)
+    status = "timeout"  # unless call() returns: cancelled at the overall deadline
+    try:
+        result = await call()
+        status = result['status']
+        return result
+    except asyncio.CancelledError as error:
+        status = deadlines.cancelled_status(error)
+        raise
+    finally:
+        breaker.record(agent_info['name'], agent_info['model'], status)
+
+async def call_agent_async(agent_info, user_input, timeout=None, quiet=False):
+    """Call a specific agent asynchronously, bounded by its deployment's concurrency limit
+    
+    The call is streamed under the hood so that, once timeout seconds (AGENT_TIMEOUT) have
+    passed, closing the stream cancels the response server-side and a "timeout" result is returned.
+    Concurrent identical calls share one request (see single_flight).
+    """
+    timeout = timeout or deadlines.AGENT_TIMEOUT
+    if not quiet:
+        print(f"Calling {agent_info['name']}{' (hedged)' if hedge_policy is not None else ''}...")
+    
+    async def start(cancel):
+        if hedge_policy is not None:
+            return await call_agent_hedged(agent_info, user_input, cancel)
+        return await call_agent_cancellable(agent_info, user_input, cancel)
+    
+    call = lambda: with_circuit_breaker(agent_info, lambda: deadlines.run_with_deadline(agent_info, start, timeout))
+    # Identical calls already in flight (same agent, same prompt) are joined instead of repeated
+    flights = single_flight.get_single_flight()
+    if flights is None:
+        return await call()
+    return await flights.do(single_flight.flight_key(agent_info['name'], user_input), call)
 
 def call_agent_sync(agent_info, user_input):
     """Synchronous fallback for calling agents"""
-    try:
-        print(f"Calling {agent_info['name']} (sync)...")
-        
-        conversation = openai_client.conversations.create()
-        response = openai_client.responses.create(
-            conversation=conversation.id,
-            extra_body={"agent": {"name": agent_info['name'], "type": "agent_reference"}},
-            input=user_input
-        )
-        
-        return {
-            "agent": agent_info['name'],
-            "model": agent_info['model'],
-            "response": response.output_text,
-            "status": "success"
-        }
-    except Exception as e:
-        return {
-            "agent": agent_info['name'],
-            "model": agent_info['model'],
-            "response": f"Sorry, {agent_info['name']} is currently unavailable. Error: {str(e)}",
-            "status": "error"
-        }
+    breaker = circuit_breaker.get_breaker()
+    if breaker is not None and not breaker.allow(agent_info['name']):
+        return breaker.skipped_result(agent_info)
+    print(f"Calling {agent_info['name']} (sync)...")
+    result = invoke_agent(agent_info, user_input)
+    if breaker is not None:
+        breaker.record(agent_info['name'], agent_info['model'], result['status'])
+    return result
 
-async def orchestrate_agents_parallel(user_input):
-    """Try parallel execution first"""
+async def orchestrate_agents_parallel(user_input, deadline=None):
+    """Try parallel execution first; agents still running at the deadline are reported as timed out"""
     try:
         print("Attempting parallel execution...")
         tasks = [call_agent_async(agent, user_input) for agent in TARGET_AGENTS]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Convert exceptions to error responses
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    "agent": TARGET_AGENTS[i]['name'],
-                    "model": TARGET_AGENTS[i]['model'],
-                    "response": f"Sorry, {TARGET_AGENTS[i]['name']} failed during parallel execution.",
-                    "status": "error"
-                })
-            else:
-                processed_results.append(result)
-        
-        return processed_results
+        return await deadlines.gather_with_deadline(TARGET_AGENTS, tasks, deadline or deadlines.ORCHESTRATION_TIMEOUT)
     except Exception as e:
         print(f"Parallel execution failed: {e}")
         return None
 
+async def orchestrate_agents_quorum(user_input, size=None, deadline=None):
+    """Call every agent in parallel but return as soon as `size` of them (QUORUM_SIZE) have answered
+    
+    The calls still running are cancelled, or left to finish into the cache (QUORUM_LEFTOVERS=finish).
+    """
+    size = size or quorum.QUORUM_SIZE
+    print(f"Racing {len(TARGET_AGENTS)} agents for the first {size} answers...")
+    started = time.perf_counter()
+    
+    def report(result, successes):
+        emoji = "✅" if result['status'] == "success" else "❌"
+        print(f"{emoji} {result['agent']} {result['status']} after {time.perf_counter() - started:.2f}s ({successes}/{size} answers)")
+    
+    tasks = [call_agent_async(agent, user_input, quiet=True) for agent in TARGET_AGENTS]
+    return await quorum.race(TARGET_AGENTS, tasks, size, deadline or deadlines.ORCHESTRATION_TIMEOUT, on_result=report)
+
 def orchestrate_agents_sequential(user_input):
     """Sequential fallback execution"""
     print("Using sequential execution...")
@@ -128,6 +284,141 @@ def orchestrate_agents_sequential(user_input):
         results.append(result)
     return results
 
+def stream_agent(agent_info, user_input, state, cancel=None):
+    """Stream a specific agent's answer (blocking), recording deltas and timings into state
+    
+    Setting the optional cancel event stops the stream early, which cancels the request.
+    """
+    from azure.ai.projects.models import ResponseStreamEventType
+    
+    started = time.perf_counter()
+    fingerprint, cached = lookup_cached_response(agent_info, user_input)
+    if cached is not None:
+        elapsed = time.perf_counter() - started
+        state.update(text=cached, status="success", ttft=elapsed, total_time=elapsed)
+        return {
+            "agent": agent_info['name'],
+            "model": agent_info['model'],
+            "response": cached,
+            "status": "success",
+            "cached": True,
+            "ttft": elapsed,
+            "total_time": elapsed,
+        }
+    
+    with instrumentation.traced("agent.call", agent_info['name'], agent_info['model']) as span:
+        try:
+            # Throttling and transient errors surface when the stream is opened, so that is what gets retried
+            kwargs = conversation_pool.conversation_kwargs(openai_client)
+            estimated = throttling.estimate_tokens(user_input)
+            stream = throttling.call_with_retries(
+                lambda: openai_client.responses.create(
+                    **kwargs,
+                    extra_body={"agent": {"name": agent_info['name'], "type": "agent_reference"}},
+                    input=user_input,
+                    stream=True,
+                ),
+                agent_info['model'], estimated, cancel,
+            )
+            if cancel is not None:
+                cancel.attach(stream)
+            state['status'] = "streaming"
+            completed = False
+            
+            for event in stream:
+                if cancel is not None and cancel.is_set():
+                    stream.close()
+                    break
+                if event.type == ResponseStreamEventType.RESPONSE_OUTPUT_TEXT_DELTA:
+                    if state['ttft'] is None:
+                        state['ttft'] = span.ttft = time.perf_counter() - started
+                    state['text'] += event.delta
+                elif event.type == ResponseStreamEventType.RESPONSE_COMPLETED:
+                    completed = True
+                    throttling.record_usage(agent_info['model'], estimated, getattr(event.response, "usage", None))
+                elif event.type == ResponseStreamEventType.RESPONSE_FAILED:
+                    raise RuntimeError(f"response failed: {event.response.error}")
+                elif event.type == ResponseStreamEventType.ERROR:
+                    raise RuntimeError(event.message)
+            
+            # A stream closed by the token before its first event just ends, so check it here too
+            if cancel is not None and cancel.is_set():
+                state['status'] = span.status = "cancelled"
+            elif not completed:
+                raise RuntimeError("stream ended before the response completed")
+            else:
+                state['status'] = "success"
+                store_cached_response(agent_info, fingerprint, user_input, state['text'])
+        except Exception as e:
+            if cancel is not None and cancel.is_set():
+                # The stream was closed under us at a deadline or by a winning hedge
+                state['status'] = span.status = "cancelled"
+            else:
+                state['status'] = "error"
+                state['text'] = f"Sorry, {agent_info['name']} is currently unavailable. Error: {str(e)}"
+                span.status, span.error = "error", str(e)
+        finally:
+            state['total_time'] = time.perf_counter() - started
+    
+    return {
+        "agent": agent_info['name'],
+        "model": agent_info['model'],
+        "response": state['text'],
+        "status": state['status'],
+        "ttft": state['ttft'],
+        "total_time": state['total_time'],
+    }
+
+async def stream_agent_async(agent_info, user_input, state, cancel=None):
+    """Stream a specific agent's answer on the worker pool, bounded by its deployment's limit"""
+    return await run_limited(agent_info, stream_agent, agent_info, user_input, state, cancel)
+
+async def orchestrate_agents_streaming(user_input, timeout=None, deadline=None):
+    """Stream all agents concurrently into one live side-by-side view
+    
+    Agents that miss their deadline are cancelled; whatever text they streamed is kept.
+    """
+    print("Streaming all agents...")
+    timeout = timeout or deadlines.AGENT_TIMEOUT
+    deadline = deadline or deadlines.ORCHESTRATION_TIMEOUT
+    states = [
+        {"agent": agent['name'], "model": agent['model'], "text": "", "status": "pending", "ttft": None, "total_time": None}
+        for agent in TARGET_AGENTS
+    ]
+    
+    def call(agent, state):
+        return lambda: deadlines.run_with_deadline(
+            agent, lambda cancel: stream_agent_async(agent, user_input, state, cancel), timeout
+        )
+    
+    tasks = [
+        asyncio.ensure_future(with_circuit_breaker(agent, call(agent, state)))
+        for agent, state in zip(TARGET_AGENTS, states)
+    ]
+    
+    # Only redraw in place on a real terminal; pipes just get the final output
+    live = sys.stdout.isatty()
+    started = time.perf_counter()
+    while not all(task.done() for task in tasks) and time.perf_counter() - started < deadline:
+        if live:
+            live_view.draw(states)
+        await asyncio.wait(tasks, timeout=min(STREAM_REFRESH_INTERVAL, max(0, deadline - (time.perf_counter() - started))))
+    results = deadlines.collect_results(TARGET_AGENTS, tasks, deadline)
+    await deadlines.unwind(tasks)
+    for result, state in zip(results, states):
+        if result['status'] == "skipped":
+            state.update(status="skipped", text=result['response'])
+        if result['status'] == "timeout":
+            state['status'] = "timeout"
+            if state['text']:
+                result['response'] = f"{state['text']} […cut off after {result['total_time']:g}s]"
+            result['ttft'] = state['ttft']
+    if live:
+        live_view.draw(states)
+        print()
+    
+    return results
+
 def format_responses_side_by_side(results):
     """Format agent responses in side-by-side layout"""
     output = "\n" + "="*80 + "\n"
@@ -135,47 +426,174 @@ def format_responses_side_by_side(results):
     output += "="*80 + "\n\n"
     
     for result in results:
-        status_emoji = "✅" if result['status'] == 'success' else "❌"
-        output += f"{status_emoji} {result['agent'].upper()} ({result['model']})\n"
+        status_emoji = {"success": "✅", "timeout": "⏱️", "skipped": "⚡", "cancelled": "🚫"}.get(result['status'], "❌")
+        note = {"timeout": " - TIMED OUT", "skipped": " - SKIPPED", "cancelled": " - NOT NEEDED"}.get(result['status'], "")
+        output += f"{status_emoji} {result['agent'].upper()} ({result['model']}){note}\n"
         output += "-" * 60 + "\n"
         output += f"{result['response']}\n\n"
     
     output += "="*80 + "\n"
     return output
 
+def summarize(coordinator_input, stream=False):
+    """Ask the coordinator agent to summarize the results and print its answer (blocking)"""
+    kwargs = conversation_pool.conversation_kwargs(openai_client)
+    estimated = throttling.estimate_tokens(coordinator_input)
+    create = lambda **options: throttling.call_with_retries(
+        lambda: openai_client.responses.create(
+            **kwargs,
+            extra_body={"agent": {"name": coordinator_agent.name, "type": "agent_reference"}},
+            input=coordinator_input,
+            **options,
+        ),
+        MODEL_DEPLOYMENT_NAME, estimated,
+    )
+    if stream:
+        from azure.ai.projects.models import ResponseStreamEventType
+        
+        for event in create(stream=True):
+            if event.type == ResponseStreamEventType.RESPONSE_OUTPUT_TEXT_DELTA:
+                print(event.delta, end="", flush=True)
+            elif event.type == ResponseStreamEventType.RESPONSE_COMPLETED:
+                throttling.record_usage(MODEL_DEPLOYMENT_NAME, estimated, getattr(event.response, "usage", None))
+        print()
+    else:
+        coordinator_response = create()
+        throttling.record_usage(MODEL_DEPLOYMENT_NAME, estimated, getattr(coordinator_response, "usage", None))
+        print(coordinator_response.output_text)
+
 # Main orchestration workflow
-async def run_coordinator_workflow():
+async def run_coordinator_workflow(stream=False):
     user_input = "Tell me a story about a robot who dreams of becoming a chef"
     
     print(f"🚀 Starting multi-agent orchestration for: '{user_input}'")
     
-    # Try parallel execution first
-    results = await orchestrate_agents_parallel(user_input)
-    
-    # Fallback to sequential if parallel fails
-    if results is None:
-        results = orchestrate_agents_sequential(user_input)
+    started = time.perf_counter()
+    if stream:
+        results = await orchestrate_agents_streaming(user_input)
+    elif quorum.QUORUM_SIZE:
+        results = await orchestrate_agents_quorum(user_input)
+    else:
+        # Try parallel execution first
+        results = await orchestrate_agents_parallel(user_input)
+        
+        # Fallback to sequential if parallel fails
+        if results is None:
+            results = orchestrate_agents_sequential(user_input)
+    print(f"⏱️  Agents answered in {time.perf_counter() - started:.2f}s")
     
     # Format and display results
     formatted_output = format_responses_side_by_side(results)
     print(formatted_output)
+    if stream:
+        print(live_view.format_stream_timings(results))
     
-    # Create coordinator conversation to show workflow completion
-    coordinator_conversation = openai_client.conversations.create()
-    coordinator_response = openai_client.responses.create(
-        conversation=coordinator_conversation.id,
-        extra_body={"agent": {"name": coordinator_agent.name, "type": "agent_reference"}},
-        input=f"Summarize this multi-agent coordination result: {formatted_output}"
-    )
+    coordinator_input = f"Summarize this multi-agent coordination result: {formatted_output}"
+    if summary_compaction.SUMMARY_TOKEN_BUDGET:
+        coordinator_input, compaction = summary_compaction.build_summary_input(user_input, results, original=coordinator_input)
+        print(summary_compaction.format_stats(compaction))
     
     print("🎯 Coordinator Summary:")
     print("-" * 40)
-    print(coordinator_response.output_text)
+    # On the worker pool, so calls cancelled at a deadline or quorum can still unwind meanwhile
+    await asyncio.get_running_loop().run_in_executor(agent_executor, summarize, coordinator_input, stream)
+    
+    if quorum.background:
+        print(f"⏳ Waiting for {len(quorum.background)} agents still answering in the background...")
+        cached = await quorum.drain()
+        print(f"📥 {cached} background answers finished{'' if response_cache.get_response_cache() else ' (use --cache to keep them for the next run)'}")
     
     return results
 
+async def run_batch_mode(input_path, output_path, workers):
+    """Run every prompt in a JSONL file across all TARGET_AGENTS"""
+    print(f"📦 Batch: {input_path} -> {output_path} ({len(TARGET_AGENTS)} agents, {workers} workers)")
+    
+    async def call_quietly(agent_info, prompt):
+        return await call_agent_async(agent_info, prompt, quiet=True)
+    
+    stats = await batch_runner.run_batch(input_path, output_path, TARGET_AGENTS, call_quietly, workers=workers)
+    print(batch_runner.format_batch_summary(stats))
+
 if __name__ == "__main__":
-    # Run the async orchestration
-    results = asyncio.run(run_coordinator_workflow())
-    print(f"\n✨ Multi-agent workflow completed! All agents should appear in the Microsoft Foundry portal.")
-    print(f"📊 Coordination Results: {len([r for r in results if r['status'] == 'success'])}/{len(results)} agents responded successfully")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Multi-agent storytelling coordinator")
+    parser.add_argument("--stream", action="store_true", help="stream every agent live, side by side")
+    parser.add_argument("--cache", action="store_true", help="reuse cached responses for identical prompts (also RESPONSE_CACHE=1)")
+    parser.add_argument("--batch", metavar="PROMPTS_JSONL", help="run every prompt in a JSONL file across all agents")
+    parser.add_argument("--output", help="batch results JSONL (appended to, so re-running resumes)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKER_THREADS, help="batch calls in flight")
+    parser.add_argument("--trace", action="store_true", help="time every Foundry API call and print a span summary (also FOUNDRY_TRACE=1)")
+    parser.add_argument("--trace-output", metavar="SPANS_JSONL", help="also append the spans to a JSONL file (implies --trace)")
+    parser.add_argument("--timeout", type=float, default=deadlines.AGENT_TIMEOUT,
+                        help="seconds before an agent call is cancelled and reported as timed out (also AGENT_TIMEOUT)")
+    parser.add_argument("--deadline", type=float, default=deadlines.ORCHESTRATION_TIMEOUT,
+                        help="seconds for the whole fan-out; agents still running are cancelled (also ORCHESTRATION_TIMEOUT)")
+    parser.add_argument("--no-circuit-breaker", action="store_true",
+                        help="call every agent even if it has been failing (also CIRCUIT_BREAKER=0)")
+    parser.add_argument("--reset-circuits", action="store_true", help="forget remembered agent failures before running")
+    parser.add_argument("--fixed-concurrency", action="store_true",
+                        help="keep MAX_CONCURRENCY_PER_DEPLOYMENT fixed instead of adapting it (also ADAPTIVE_CONCURRENCY=0)")
+    parser.add_argument("--hedge", action="store_true",
+                        help="re-send calls slower than the agent's p95 (HEDGE_PERCENTILE) to its backup agent and take the first answer")
+    parser.add_argument("--quorum", type=int, default=quorum.QUORUM_SIZE, metavar="K",
+                        help="return once K agents have answered instead of waiting for all of them (also QUORUM_SIZE)")
+    parser.add_argument("--quorum-leftovers", choices=quorum.LEFTOVER_MODES, default=quorum.QUORUM_LEFTOVERS,
+                        help="after a quorum, cancel the other calls or let them finish into the response cache (also QUORUM_LEFTOVERS)")
+    parser.add_argument("--no-coalesce", action="store_true",
+                        help="send every call even when an identical one is already in flight (also SINGLE_FLIGHT=0)")
+    parser.add_argument("--summary-budget", type=int, default=summary_compaction.SUMMARY_TOKEN_BUDGET,
+                        help="token budget for the coordinator summary input; 0 sends the full side-by-side text (also SUMMARY_TOKEN_BUDGET)")
+    parser.add_argument("--call-mode", choices=conversation_pool.CALL_MODES, default=conversation_pool.CALL_MODE,
+                        help="stateless: no conversation per call (default); pool: pre-created conversations; conversation: one created per call")
+    args = parser.parse_args()
+    conversation_pool.CALL_MODE = args.call_mode
+    deadlines.AGENT_TIMEOUT, deadlines.ORCHESTRATION_TIMEOUT = args.timeout, args.deadline
+    summary_compaction.SUMMARY_TOKEN_BUDGET = args.summary_budget
+    quorum.QUORUM_SIZE, quorum.QUORUM_LEFTOVERS = args.quorum, args.quorum_leftovers
+    if args.cache:
+        response_cache.enable_response_cache()
+    if args.trace or args.trace_output:
+        instrumentation.enable_tracing()
+    if args.fixed_concurrency:
+        adaptive_concurrency.ADAPTIVE = False
+    if args.no_coalesce:
+        single_flight.ENABLED = False
+    if args.no_circuit_breaker:
+        circuit_breaker.ENABLED = False
+    elif args.reset_circuits:
+        circuit_breaker.get_breaker().reset()
+    if args.hedge:
+        hedge_policy = hedging.HedgePolicy(backups=hedge_backups())
+    connect()
+    
+    if args.batch:
+        output_path = args.output or os.path.splitext(args.batch)[0] + ".results.jsonl"
+        asyncio.run(run_batch_mode(args.batch, output_path, args.workers))
+    else:
+        # Run the async orchestration
+        results = asyncio.run(run_coordinator_workflow(stream=args.stream))
+        print(f"\n✨ Multi-agent workflow completed! All agents should appear in the Microsoft Foundry portal.")
+        print(f"📊 Coordination Results: {len([r for r in results if r['status'] == 'success'])}/{len(results)} agents responded successfully")
+    conversation_pool.close_pools()
+    cache = response_cache.get_response_cache()
+    if cache is not None:
+        print(cache.format_stats())
+    if hedge_policy is not None:
+        print(hedge_policy.format_stats())
+    flights = single_flight.get_single_flight()
+    if flights is not None and flights.stats["coalesced"]:
+        print(flights.format_stats())
+    if throttling.stats["retries"] or throttling.stats["waited"]:
+        print(throttling.format_stats())
+    if adaptive_concurrency.format_limits(deployment_semaphores.values()):
+        print(adaptive_concurrency.format_limits(deployment_semaphores.values()))
+    breaker = circuit_breaker.get_breaker()
+    if breaker is not None:
+        breaker.save()
+        if breaker.format_status():
+            print(breaker.format_status())
+    tracer = instrumentation.get_tracer()
+    if tracer is not None:
+        print(tracer.format_summary())
+        if args.trace_output:
+            print(f"📄 {tracer.export_jsonl(args.trace_output)} spans appended to {args.trace_output}")
\ No newline at end of file
@@ -1,35 +1,27 @@
 import os
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
-from azure.ai.projects.models import PromptAgentDefinition
+
+from agent_provisioning import describe
+import agent_registry
+import foundry_clients
 
 load_dotenv()
 
 # DeepSeek-specific configuration
-MODEL_DEPLOYMENT_NAME = "DeepSeek-V3.2"
 AGENT_NAME = "agent-deepseek"
+spec = agent_registry.get_agent(AGENT_NAME)  # model and instructions live in agents.toml
 
 print(f"Using PROJECT_ENDPOINT: {os.environ['PROJECT_ENDPOINT']}")
-print(f"Using MODEL_DEPLOYMENT_NAME: {MODEL_DEPLOYMENT_NAME}")
+print(f"Using MODEL_DEPLOYMENT_NAME: {spec.model}")
 
-project_client = AIProjectClient(
-    endpoint=os.environ["PROJECT_ENDPOINT"],
-    credential=DefaultAzureCredential(),
-)
+project_client = foundry_clients.get_project_client()
 
 # Create a NEW Foundry agent (not classic) using DeepSeek
-agent = project_client.agents.create_version(
-    agent_name=AGENT_NAME,
-    definition=PromptAgentDefinition(
-        model=MODEL_DEPLOYMENT_NAME,
-        instructions="You are a storytelling agent. You craft engaging one-line stories based on user prompts and context.",
-    ),
-)
-print(f"NEW Foundry Agent created (id: {agent.id}, name: {agent.name}, version: {agent.version})")
+agent = agent_registry.provision(project_client, spec)
+print(f"NEW Foundry Agent {describe(agent)} (id: {agent.id}, name: {agent.name}, version: {agent.version})")
 
 # Get OpenAI client for the new Responses API
-openai_client = project_client.get_openai_client()
+openai_client = foundry_clients.get_openai_client()
 
 # Create a conversation for context
 conversation = openai_client.conversations.create()
@@ -39,7 +31,7 @@ print(f"Created conversation (id: {conversation.id})")
 response = openai_client.responses.create(
     conversation=conversation.id,
     extra_body={"agent": {"name": agent.name, "type": "agent_reference"}},
-    input="What makes DeepSeek-V3.2 special compared to other language models?",
+    input=spec.prompt,
 )
 print(f"Response output: {response.output_text}")
 
@@ -0,0 +1,105 @@
+"""
+Idempotent agent provisioning for the NEW Foundry Agent Service.
+Hashes each agent definition and only calls create_version when it changed,
+using a local manifest first and the latest server version as a fallback.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import NamedTuple
+
+MANIFEST_PATH = os.environ.get("AGENT_MANIFEST_PATH", os.path.join(".foundry", "agent-manifest.json"))
+HASH_METADATA_KEY = "definition_hash"
+
+# Serializes manifest read-modify-write when agents are provisioned from several threads
+_manifest_lock = threading.Lock()
+
+class ProvisionedAgent(NamedTuple):
+    id: str
+    name: str
+    version: str
+    definition_hash: str
+    created: bool
+
+def definition_hash(definition):
+    """Stable content hash of a PromptAgentDefinition/WorkflowAgentDefinition"""
+    canonical = json.dumps(definition.as_dict(), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the local provisioning manifest (empty if missing or unreadable)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Atomically write the local provisioning manifest"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def get_latest_version(project_client, agent_name):
+    """Fetch the latest server-side version of an agent, or None if it doesn't exist"""
+    from azure.core.exceptions import ResourceNotFoundError  # lazy: keeps local-only commands fast
+
+    try:
+        return project_client.agents.get(agent_name).versions.latest
+    except ResourceNotFoundError:
+        return None
+
+def server_version_matches(latest, digest):
+    """Check whether a server-side agent version was built from the same definition"""
+    if latest is None:
+        return False
+    if (latest.metadata or {}).get(HASH_METADATA_KEY) == digest:
+        return True
+    return latest.definition is not None and definition_hash(latest.definition) == digest
+
+def ensure_agent_version(project_client, agent_name, definition, verify=None, manifest_path=MANIFEST_PATH):
+    """Return an agent version matching definition, creating one only if the definition changed
+
+    With verify=False (the default, unless AGENT_MANIFEST_VERIFY=1) a manifest hit
+    skips the network entirely; otherwise the latest server version is checked too.
+    """
+    if verify is None:
+        verify = os.environ.get("AGENT_MANIFEST_VERIFY") == "1"
+
+    digest = definition_hash(definition)
+    scope = os.environ.get("PROJECT_ENDPOINT", "")
+    manifest = load_manifest(manifest_path)
+    entry = manifest.get(scope, {}).get(agent_name)
+
+    if entry and entry["definition_hash"] == digest and not verify:
+        return ProvisionedAgent(entry["id"], agent_name, entry["version"], digest, created=False)
+
+    latest = get_latest_version(project_client, agent_name)
+    if server_version_matches(latest, digest):
+        agent = ProvisionedAgent(latest.id, latest.name, latest.version, digest, created=False)
+    else:
+        details = project_client.agents.create_version(
+            agent_name=agent_name,
+            definition=definition,
+            metadata={HASH_METADATA_KEY: digest},
+        )
+        agent = ProvisionedAgent(details.id, details.name, details.version, digest, created=True)
+
+    with _manifest_lock:
+        # Re-read so entries written concurrently by other threads aren't lost
+        manifest = load_manifest(manifest_path)
+        manifest.setdefault(scope, {})[agent_name] = {
+            "id": agent.id,
+            "version": agent.version,
+            "definition_hash": digest,
+        }
+        save_manifest(manifest, manifest_path)
+    return agent
+
+def describe(agent):
+    """Short human-readable provisioning outcome"""
+    return "created" if agent.created else "unchanged, reused"
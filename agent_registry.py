@@ -0,0 +1,128 @@
+"""
+Data-driven registry of the project's prompt agents (agents.toml) and a bulk
+provisioner that creates or updates them concurrently with bounded parallelism.
+"""
+
+import os
+import time
+import tomllib
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from agent_provisioning import ensure_agent_version, describe
+
+REGISTRY_PATH = os.environ.get(
+    "AGENT_REGISTRY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "agents.toml")
+)
+PROVISION_CONCURRENCY = int(os.environ.get("PROVISION_CONCURRENCY", "8"))
+
+class RegistryError(Exception):
+    """Raised when agents.toml is missing fields or names an unknown agent"""
+
+class AgentSpec(NamedTuple):
+    name: str
+    model: str
+    instructions: str
+    groups: tuple = ()
+    prompt: str = None
+    backup: str = None  # agent that hedged requests fall back to
+
+class ProvisionResult(NamedTuple):
+    spec: AgentSpec
+    agent: object  # ProvisionedAgent, or None on failure
+    elapsed: float
+    error: str = None
+
+def load_registry(path=REGISTRY_PATH):
+    """Parse agents.toml into {name: AgentSpec}, in file order"""
+    with open(path, "rb") as f:
+        document = tomllib.load(f)
+
+    specs = {}
+    for name, table in document.get("agents", {}).items():
+        missing = [key for key in ("model", "instructions") if not table.get(key)]
+        if missing:
+            raise RegistryError(f"{path}: agent '{name}' is missing {', '.join(missing)}")
+        specs[name] = AgentSpec(
+            name, table["model"], table["instructions"], tuple(table.get("groups", ())), table.get("prompt"), table.get("backup")
+        )
+    for spec in specs.values():
+        if spec.backup and spec.backup not in specs:
+            raise RegistryError(f"{path}: agent '{spec.name}' has unknown backup '{spec.backup}'")
+    return specs
+
+def deployment_quotas(path=REGISTRY_PATH):
+    """Client-side rate limits from the [deployments.<model>] tables: {model: {requests_per_minute, tokens_per_minute}}"""
+    with open(path, "rb") as f:
+        document = tomllib.load(f)
+
+    quotas = {}
+    for model, table in document.get("deployments", {}).items():
+        unknown = set(table) - {"requests_per_minute", "tokens_per_minute"}
+        if unknown:
+            raise RegistryError(f"{path}: deployment '{model}' has unknown setting(s) {', '.join(sorted(unknown))}")
+        quotas[model] = dict(table)
+    return quotas
+
+def get_agent(name, path=REGISTRY_PATH):
+    specs = load_registry(path)
+    if name not in specs:
+        raise RegistryError(f"unknown agent '{name}' (known: {', '.join(specs)})")
+    return specs[name]
+
+def select(names=None, group=None, path=REGISTRY_PATH):
+    """Specs by name and/or group; everything when neither is given"""
+    specs = load_registry(path)
+    unknown = [name for name in names or () if name not in specs]
+    if unknown:
+        raise RegistryError(f"unknown agent(s) {', '.join(unknown)} (known: {', '.join(specs)})")
+    return [
+        spec for spec in specs.values()
+        if (not names or spec.name in names) and (group is None or group in spec.groups)
+    ]
+
+def definition_for(spec):
+    from azure.ai.projects.models import PromptAgentDefinition
+
+    return PromptAgentDefinition(model=spec.model, instructions=spec.instructions)
+
+def provision(project_client, spec):
+    """Create or reuse one agent version for a registry entry"""
+    return ensure_agent_version(project_client, agent_name=spec.name, definition=definition_for(spec))
+
+def provision_one(project_client, spec):
+    started = time.perf_counter()
+    try:
+        agent = provision(project_client, spec)
+        return ProvisionResult(spec, agent, time.perf_counter() - started)
+    except Exception as e:
+        return ProvisionResult(spec, None, time.perf_counter() - started, str(e))
+
+def provision_all(project_client, specs, max_workers=PROVISION_CONCURRENCY, on_result=None):
+    """Provision every spec concurrently (at most max_workers at a time)
+
+    Returns ProvisionResults in registry order; on_result(result) is called as each finishes.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="provision") as pool:
+        futures = [pool.submit(provision_one, project_client, spec) for spec in specs]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.spec.name] = result
+            if on_result:
+                on_result(result)
+    return [results[spec.name] for spec in specs]
+
+def format_provision_result(result):
+    if result.error:
+        return f"❌ {result.spec.name} ({result.spec.model}) failed after {result.elapsed:.2f}s: {result.error}"
+    return f"✅ {result.spec.name} ({result.spec.model}) {describe(result.agent)} in {result.elapsed:.2f}s (version: {result.agent.version})"
+
+def format_provision_summary(results, wall_time):
+    failed = len([result for result in results if result.error])
+    created = len([result for result in results if result.agent and result.agent.created])
+    busy = sum(result.elapsed for result in results)
+    return (
+        f"📋 {len(results) - failed}/{len(results)} agents ready ({created} created) in {wall_time:.2f}s "
+        f"({busy:.2f}s of provisioning work)"
+    )
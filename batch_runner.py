@@ -0,0 +1,120 @@
+"""
+Batch prompt runner: streams prompts from a JSONL file, fans each one out to every
+agent through a bounded pool of workers, and appends results to a JSONL output file.
+Re-running with the same output file resumes where the previous run stopped.
+"""
+
+import json
+import time
+import asyncio
+
+PROGRESS_EVERY = 50
+
+def read_prompts(input_path):
+    """Yield (prompt_id, prompt) pairs from a JSONL file without loading it all
+
+    Each line is either a JSON string or an object with "prompt" (or "input") and an optional "id".
+    """
+    with open(input_path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"⚠️  Skipping invalid JSON on line {line_number} of {input_path}")
+                continue
+            if isinstance(record, str):
+                yield str(line_number), record
+            else:
+                yield str(record.get("id", line_number)), record.get("prompt") or record.get("input")
+
+def completed_keys(output_path):
+    """(prompt_id, agent) pairs that already have a successful result in the output file"""
+    done = set()
+    try:
+        with open(output_path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    continue  # a torn line from a crash mid-write (possibly cut inside a multibyte character)
+                if record.get("status") == "success":
+                    done.add((record["id"], record["agent"]))
+    except FileNotFoundError:
+        pass
+    return done
+
+def terminate_torn_line(output_path):
+    """End a line torn by a crash so the next record starts cleanly (in bytes: it may end mid-character)"""
+    try:
+        with open(output_path, "rb+") as f:
+            if f.seek(0, 2) > 0:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+    except FileNotFoundError:
+        pass
+
+async def run_batch(input_path, output_path, agents, call_agent, workers=16):
+    """Run every prompt in input_path against every agent with at most `workers` calls in flight
+
+    call_agent(agent_info, prompt) is an async callable returning the coordinator's result dict.
+    Returns a summary dict with counts and throughput.
+    """
+    done = completed_keys(output_path)
+    queue = asyncio.Queue(maxsize=workers * 2)
+    stats = {"skipped": 0, "success": 0, "error": 0}
+    started = time.perf_counter()
+
+    terminate_torn_line(output_path)
+    with open(output_path, "a", encoding="utf-8") as output:
+        async def produce():
+            for prompt_id, prompt in read_prompts(input_path):
+                for agent in agents:
+                    if (prompt_id, agent['name']) in done:
+                        stats["skipped"] += 1
+                        continue
+                    await queue.put((prompt_id, prompt, agent))
+            for _ in range(workers):
+                await queue.put(None)
+
+        async def work():
+            while True:
+                job = await queue.get()
+                if job is None:
+                    return
+                prompt_id, prompt, agent = job
+                call_started = time.perf_counter()
+                result = await call_agent(agent, prompt)
+                record = {
+                    "id": prompt_id,
+                    "agent": result['agent'],
+                    "model": result['model'],
+                    "status": result['status'],
+                    "elapsed": round(time.perf_counter() - call_started, 3),
+                    "response": result['response'],
+                }
+                # One complete line per result, flushed, so a crash loses at most the in-flight calls
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+
+                stats[result['status'] if result['status'] in stats else "error"] += 1
+                finished = stats["success"] + stats["error"]
+                if finished % PROGRESS_EVERY == 0:
+                    rate = finished / (time.perf_counter() - started)
+                    print(f"📦 {finished} calls done ({stats['error']} errors, {rate:.1f} calls/s)", flush=True)
+
+        await asyncio.gather(produce(), *(work() for _ in range(workers)))
+
+    elapsed = time.perf_counter() - started
+    finished = stats["success"] + stats["error"]
+    stats.update(elapsed=elapsed, throughput=finished / elapsed if elapsed else 0.0)
+    return stats
+
+def format_batch_summary(stats):
+    return (
+        f"📊 Batch finished in {stats['elapsed']:.1f}s: {stats['success']} succeeded, {stats['error']} failed, "
+        f"{stats['skipped']} already done ({stats['throughput']:.1f} calls/s)"
+    )
@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import contextlib
+import importlib.util
+from datetime import datetime, timezone
+
+import hedging
+import throttling
+import circuit_breaker
+import conversation_pool
+from fake_foundry import FakeOpenAIClient, LatencyModel
+from latency_stats import summarize
+
+COORDINATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "agent-coordinator.py")
+DEPLOYMENTS = ["DeepSeek-V3.2", "gpt-5.2", "Mistral-Large-3"]
+
+def load_coordinator():
+    """Import agent-coordinator.py as a module (its name isn't a valid identifier)"""
+    spec = importlib.util.spec_from_file_location("agent_coordinator", COORDINATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def synthetic_agents(count):
+    """count agents spread round-robin over the real model deployments"""
+    return [
+        {"name": f"bench-agent-{index:03d}", "model": DEPLOYMENTS[index % len(DEPLOYMENTS)]}
+        for index in range(count)
+    ]
+
+async def run_sequential(coordinator, user_input):
+    return coordinator.orchestrate_agents_sequential(user_input)
+
+async def run_parallel(coordinator, user_input):
+    return await coordinator.orchestrate_agents_parallel(user_input)
+
+async def run_streaming(coordinator, user_input):
+    return await coordinator.orchestrate_agents_streaming(user_input)
+
+async def run_hedged(coordinator, user_input):
+    """Parallel fan-out with every call hedged after HEDGE_DELAY"""
+    coordinator.hedge_policy = hedging.HedgePolicy(initial_delay=HEDGE_DELAY)
+    try:
+        return await coordinator.orchestrate_agents_parallel(user_input)
+    finally:
+        coordinator.hedge_policy = None
+
+async def run_quorum(coordinator, user_input):
+    """Parallel fan-out that returns after the first QUORUM answers"""
+    return await coordinator.orchestrate_agents_quorum(user_input, size=QUORUM)
+
+# Orchestration paths under test; each takes (coordinator, user_input) and returns the result dicts
+MODES = {
+    "sequential": run_sequential,
+    "parallel": run_parallel,
+    "streaming": run_streaming,
+    "hedged": run_hedged,
+    "quorum": run_quorum,
+}
+
+# Hedge delay for the "hedged" mode (set from --hedge-delay-ms); each agent is only called
+# once per run, so the policy never has enough history to derive it from a percentile
+HEDGE_DELAY = 0.1
+
+# Answers the "quorum" mode waits for (set from --quorum)
+QUORUM = 1
+
+def bench_once(coordinator, mode, agent_count, args, seed):
+    """Run one orchestration against a fresh fake client and measure it"""
+    fake = FakeOpenAIClient(
+        latency=LatencyModel(median=args.latency_ms / 1000, distribution=args.distribution, sigma=args.sigma, seed=seed),
+        error_rate=args.error_rate,
+        conversation_latency=args.conversation_latency_ms / 1000,
+        seed=seed,
+        capacity=args.capacity,
+        requests_per_minute=args.quota_rpm,
+    )
+    coordinator.openai_client = fake
+    # Fresh (empty) rate limiters per run; --client-rpm applies the same quota to every deployment
+    throttling.configure({model: {"requests_per_minute": args.client_rpm} for model in DEPLOYMENTS} if args.client_rpm else {})
+    coordinator.TARGET_AGENTS = synthetic_agents(agent_count)
+    # Semaphores bind to the event loop that first uses them
+    coordinator.deployment_semaphores.clear()
+    # Fake failures must not open circuits that skip agents in later runs (or in real use)
+    circuit_breaker.ENABLED = False
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        results = asyncio.run(MODES[mode](coordinator, "Tell me a story about a benchmark"))
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    conversation_pool.close_pools()
+
+    # Each call's own duration, from responses.create to its last event (or to being cancelled)
+    latencies = [finished - call_started for _, _, finished, _, call_started in fake.calls]
+    stats = summarize(latencies)
+    return {
+        "mode": mode,
+        "agents": agent_count,
+        "wall_s": wall,
+        "p50_s": stats["p50"],
+        "p95_s": stats["p95"],
+        "p99_s": stats["p99"],
+        "cpu_s": cpu,
+        "cpu_per_call_ms": cpu / max(1, len(results)) * 1000,
+        "errors": len([r for r in results if r["status"] not in ("success", "cancelled")]),
+        "throttled": fake.throttled_count,
+        "cancelled_calls": len([call for call in fake.calls if call[3] == "cancelled"]),
+        "concurrency_limits": {model: limit.current for model, limit in coordinator.deployment_semaphores.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the coordinator orchestration paths against a fake Responses client")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--agents", nargs="+", type=int, default=[1, 3, 10, 30, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="median model latency")
+    parser.add_argument("--distribution", default="lognormal", choices=["fixed", "uniform", "lognormal"])
+    parser.add_argument("--sigma", type=float, default=0.5, help="lognormal sigma / uniform relative spread")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--conversation-latency-ms", type=float, default=5.0)
+    parser.add_argument("--quota-rpm", type=float, help="fake service quota (requests/min, all deployments together); excess calls get 429")
+    parser.add_argument("--capacity", type=int, help="fake service capacity: calls beyond this many in flight slow down proportionally")
+    parser.add_argument("--client-rpm", type=float, help="client-side rate limit per deployment (requests/min)")
+    parser.add_argument("--hedge-delay-ms", type=float, default=100.0, help="how long the hedged mode waits before a backup call")
+    parser.add_argument("--quorum", type=int, default=1, help="answers the quorum mode waits for before cancelling the rest")
+    parser.add_argument("--call-mode", choices=conversation_pool.CALL_MODES, default=conversation_pool.CALL_MODE)
+    parser.add_argument("--output", default="bench_orchestration.json", help="machine-readable results file")
+    args = parser.parse_args()
+
+    global HEDGE_DELAY, QUORUM
+    HEDGE_DELAY = args.hedge_delay_ms / 1000
+    QUORUM = args.quorum
+    conversation_pool.CALL_MODE = args.call_mode
+    coordinator = load_coordinator()
+    # stream_agent imports the SDK models lazily; do it now so the first streamed run isn't charged ~2s
+    import azure.ai.projects.models  # noqa: F401
+    runs = []
+    print(f"{'MODE':<12}{'AGENTS':>7}{'WALL':>9}{'P50':>9}{'P95':>9}{'P99':>9}{'CPU/CALL':>10}{'ERR':>5}{'429':>6}")
+    for mode in args.modes:
+        for agent_count in args.agents:
+            for repeat in range(args.repeat):
+                run = bench_once(coordinator, mode, agent_count, args, seed=repeat)
+                run["repeat"] = repeat
+                runs.append(run)
+                print(
+                    f"{mode:<12}{agent_count:>7}{run['wall_s']:>8.3f}s{run['p50_s']:>8.3f}s{run['p95_s']:>8.3f}s"
+                    f"{run['p99_s']:>8.3f}s{run['cpu_per_call_ms']:>8.2f}ms{run['errors']:>5}{run['throttled']:>6}",
+                    flush=True,
+                )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "max_concurrency_per_deployment": coordinator.MAX_CONCURRENCY_PER_DEPLOYMENT,
+            "max_worker_threads": coordinator.MAX_WORKER_THREADS,
+            "config": vars(args),
+        },
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import os
+import sys
+import re
+import json
+import shutil
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCOPE = "https://ai.azure.com/.default"
+
+# Runs in a fresh interpreter: time from start to the first usable access token
+TOKEN_PROBE = f"""
+import json, time
+started = time.perf_counter()
+from dotenv import load_dotenv
+load_dotenv()
+import foundry_clients
+foundry_clients.get_credential().get_token("{SCOPE}")
+print(json.dumps({{"token_s": time.perf_counter() - started}}))
+"""
+
+def run_probe(code, env):
+    """Run code in a new process; returns (process wall seconds, parsed JSON output or error text)"""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines() or ["failed"]
+        errors = [line for line in lines if re.match(r"[\w.]+(Error|Exception): ", line)]
+        return wall, (errors or lines)[-1][:120]
+    return wall, json.loads(completed.stdout.strip().splitlines()[-1])
+
+# Fresh-process commands for the CLI startup suite: name -> argv after the interpreter
+CLI_COMMANDS = {
+    "python (empty interpreter)": ["-c", "pass"],
+    "import azure + openai SDKs": ["-c", "import azure.ai.projects, azure.identity, openai"],
+    "main.py --help": ["main.py", "--help"],
+    "main.py coordinate --help": ["main.py", "coordinate", "--help"],
+    "main.py workflow validate": ["main.py", "workflow", "validate", "--no-agent-check"],
+}
+
+def bench_cli(repeat):
+    """Median wall time of each CLI command in a fresh process"""
+    results = {}
+    for name, argv in CLI_COMMANDS.items():
+        walls = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            completed = subprocess.run([sys.executable, *argv], cwd=ROOT, capture_output=True)
+            walls.append(time.perf_counter() - started)
+        results[name] = {"process_s": statistics.median(walls), "returncode": completed.returncode}
+    return results
+
+def strip_tokens(path):
+    """Keep the pinned credential type but drop the cached tokens"""
+    with open(path, encoding="utf-8") as f:
+        cache = json.load(f)
+    for entry in cache.values():
+        entry["tokens"] = {}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+
+def bench_credentials(repeat):
+    """Cold-start token time: full DefaultAzureCredential chain vs pinned type vs cached token"""
+    scratch = tempfile.mkdtemp(prefix="bench-startup-")
+    cache_path = os.path.join(scratch, "token-cache.json")
+    scenarios = {
+        "default chain (CREDENTIAL_CACHE=0)": ({"CREDENTIAL_CACHE": "0"}, None),
+        "pinned credential, no cached token": ({"CREDENTIAL_CACHE_PATH": cache_path}, strip_tokens),
+        "cached token": ({"CREDENTIAL_CACHE_PATH": cache_path}, None),
+    }
+    results = {}
+    try:
+        # Populate the cache (and the pin) once before measuring
+        run_probe(TOKEN_PROBE, {**os.environ, "CREDENTIAL_CACHE_PATH": cache_path})
+        for name, (overrides, prepare) in scenarios.items():
+            walls, tokens, errors = [], [], []
+            for _ in range(repeat):
+                if prepare and os.path.exists(cache_path):
+                    prepare(cache_path)
+                wall, output = run_probe(TOKEN_PROBE, {**os.environ, **overrides})
+                if isinstance(output, dict):
+                    walls.append(wall)
+                    tokens.append(output["token_s"])
+                else:
+                    errors.append(output)
+            results[name] = {
+                "process_s": statistics.median(walls) if walls else None,
+                "token_s": statistics.median(tokens) if tokens else None,
+                "errors": errors,
+            }
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI and credential cold-start time in fresh processes")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario (median is reported)")
+    parser.add_argument("--suites", nargs="+", default=["cli", "credentials"], choices=["cli", "credentials"])
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    if "cli" in args.suites:
+        results["cli"] = bench_cli(args.repeat)
+        print(f"{'COMMAND':<38}{'PROCESS':>10}")
+        for name, row in results["cli"].items():
+            status = "" if row["returncode"] == 0 else f"  ❌ exit {row['returncode']}"
+            print(f"{name:<38}{row['process_s'] * 1000:>8.0f}ms{status}")
+        print()
+
+    if "credentials" in args.suites:
+        results["credentials"] = bench_credentials(args.repeat)
+        print(f"{'CREDENTIAL SCENARIO':<38}{'PROCESS':>10}{'TOKEN':>10}")
+        for name, row in results["credentials"].items():
+            if row["process_s"] is None:
+                print(f"{name:<38}  ❌ {row['errors'][0]}")
+                continue
+            print(f"{name:<38}{row['process_s']:>9.3f}s{row['token_s']:>9.3f}s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
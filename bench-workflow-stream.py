@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import contextlib
+import importlib.util
+from datetime import datetime, timezone
+
+import stream_recording
+from fake_foundry import workflow_events
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def load_script(filename, module_name):
+    """Import a workflow script as a module (its name isn't a valid identifier)"""
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def visual_consumer():
+    return load_script("workflow-visual.py", "workflow_visual").consume_workflow_stream
+
+def fixed_consumer():
+    return load_script("workflow-visual-fixed.py", "workflow_visual_fixed").print_execution_stream
+
+# Stream consumers under test; each takes the stream returned by responses.create(stream=True)
+CONSUMERS = {
+    "visual": visual_consumer,
+    "fixed": fixed_consumer,
+}
+
+def bench_once(consume, events, speed):
+    """Feed the events through one consumer via a ReplayClient and measure it"""
+    client = stream_recording.ReplayClient(events, speed)
+    stream = client.responses.create(stream=True)
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        consume(stream)
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    return {
+        "events": stream.delivered,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "events_per_s": stream.delivered / wall if wall else 0.0,
+        "us_per_event": cpu / max(1, stream.delivered) * 1e6,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded (or synthetic) workflow stream through the workflow scripts' consumers")
+    parser.add_argument("recording", nargs="?", help="file written with RECORD_STREAMS=1 (default: a synthetic workflow stream)")
+    parser.add_argument("--consumers", nargs="+", default=list(CONSUMERS), choices=list(CONSUMERS))
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = original pace, 2 = twice as fast, 0 = as fast as possible")
+    parser.add_argument("--scale", nargs="+", type=int, default=[1, 10, 100], help="play the stream this many times back to back")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--agents", type=int, default=4, help="InvokeAzureAgent actions in the synthetic stream")
+    parser.add_argument("--words", type=int, default=200, help="text deltas per agent in the synthetic stream")
+    parser.add_argument("--save-synthetic", help="also write the synthetic stream as a recording")
+    parser.add_argument("--output", default="bench_workflow_stream.json", help="machine-readable results file")
+    args = parser.parse_args()
+
+    if args.recording:
+        header, events = stream_recording.load_recording(args.recording)
+        print(f"📼 {args.recording}: {len(events)} events, {events[-1][0] if events else 0:.2f}s, request {header['request']}")
+    else:
+        events = workflow_events(agents=args.agents, words=args.words, seed=0)
+        print(f"🧪 Synthetic workflow stream: {len(events)} events, {events[-1][0]:.2f}s")
+        if args.save_synthetic:
+            stream_recording.write_recording(args.save_synthetic, events, {"synthetic": True, "agents": args.agents, "words": args.words})
+        # Same attribute-access events a loaded recording yields
+        events = [(offset, stream_recording.to_event(stream_recording.to_jsonable(event))) for offset, event in events]
+
+    runs = []
+    print(f"{'CONSUMER':<10}{'SCALE':>7}{'EVENTS':>9}{'WALL':>10}{'EVENTS/S':>12}{'CPU/EVENT':>12}")
+    for name in args.consumers:
+        consume = CONSUMERS[name]()
+        for scale in args.scale:
+            scaled = stream_recording.repeated(events, scale)
+            for repeat in range(args.repeat):
+                run = bench_once(consume, scaled, args.speed)
+                run.update(consumer=name, scale=scale, repeat=repeat)
+                runs.append(run)
+                print(
+                    f"{name:<10}{scale:>7}{run['events']:>9}{run['wall_s']:>9.3f}s"
+                    f"{run['events_per_s']:>12.0f}{run['us_per_event']:>10.1f}µs",
+                    flush=True,
+                )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+        },
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
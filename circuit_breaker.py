@@ -0,0 +1,146 @@
+"""
+Per-agent circuit breakers, remembered across runs.
+Each agent's recent call outcomes are kept in .foundry/circuit-breakers.json. When
+too many of them failed the circuit opens and the agent is skipped immediately
+instead of costing every run a full timeout; after a probe interval a single call is
+let through (half-open), and its outcome closes the circuit or opens it again.
+"""
+
+import os
+import json
+import time
+import threading
+
+ENABLED = os.environ.get("CIRCUIT_BREAKER", "1") != "0"
+BREAKER_PATH = os.environ.get("CIRCUIT_BREAKER_PATH", os.path.join(".foundry", "circuit-breakers.json"))
+BREAKER_WINDOW = int(os.environ.get("CIRCUIT_BREAKER_WINDOW", "10"))  # recent outcomes kept per agent
+BREAKER_MIN_CALLS = int(os.environ.get("CIRCUIT_BREAKER_MIN_CALLS", "3"))  # outcomes needed before it can open
+BREAKER_FAILURE_RATE = float(os.environ.get("CIRCUIT_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_PROBE_INTERVAL = float(os.environ.get("CIRCUIT_BREAKER_PROBE_INTERVAL", "60"))  # seconds open before a probe
+
+# Outcomes that say nothing about the agent's health
+IGNORED_STATUSES = ("cancelled", "skipped")
+
+def load_circuits(path=BREAKER_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_circuits(circuits, path=BREAKER_PATH):
+    """Write the circuit states atomically"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(circuits, f, indent=1)
+    os.replace(tmp_path, path)
+
+class CircuitBreaker:
+    """Closed / open / half-open circuits keyed by agent name"""
+
+    def __init__(self, path=BREAKER_PATH, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS,
+                 failure_rate=BREAKER_FAILURE_RATE, probe_interval=BREAKER_PROBE_INTERVAL):
+        self.path = path
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.probe_interval = probe_interval
+        self.lock = threading.Lock()
+        self.circuits = load_circuits(path)
+        self.probing = set()  # agents with a half-open probe in flight (not persisted)
+        self.stats = {"skipped": 0, "opened": 0, "closed": 0}
+
+    def circuit(self, agent_name):
+        return self.circuits.setdefault(agent_name, {"state": "closed", "outcomes": [], "opened_at": None})
+
+    def allow(self, agent_name):
+        """Whether a call may go to the agent now; an open circuit only lets one probe through"""
+        with self.lock:
+            circuit = self.circuit(agent_name)
+            if circuit["state"] == "open" and time.time() - circuit["opened_at"] >= self.probe_interval:
+                circuit["state"] = "half_open"
+            allowed = circuit["state"] == "closed" or (circuit["state"] == "half_open" and agent_name not in self.probing)
+            if circuit["state"] == "half_open" and allowed:
+                self.probing.add(agent_name)
+            if not allowed:
+                self.stats["skipped"] += 1
+            return allowed
+
+    def record(self, agent_name, model, status):
+        """Feed a call's result status into the agent's circuit"""
+        with self.lock:
+            circuit = self.circuit(agent_name)
+            circuit["model"] = model
+            probe = agent_name in self.probing
+            self.probing.discard(agent_name)
+            if status in IGNORED_STATUSES:
+                return
+            failed = status != "success"
+            circuit["outcomes"] = (circuit["outcomes"] + [int(failed)])[-self.window:]
+            before = circuit["state"]
+            if probe:
+                circuit["state"] = "open" if failed else "closed"
+            elif before == "closed":
+                outcomes = circuit["outcomes"]
+                if len(outcomes) >= self.min_calls and sum(outcomes) / len(outcomes) >= self.failure_rate:
+                    circuit["state"] = "open"
+            if circuit["state"] != before:
+                if circuit["state"] == "open":
+                    circuit["opened_at"] = time.time()
+                else:
+                    circuit["outcomes"] = []  # a successful probe starts a fresh window
+                self.stats["opened" if circuit["state"] == "open" else "closed"] += 1
+                save_circuits(self.circuits, self.path)
+
+    def skipped_result(self, agent_info):
+        """Result dict for a call skipped because the agent's circuit is open"""
+        with self.lock:
+            circuit = self.circuit(agent_info['name'])
+            retry_in = max(0.0, (circuit["opened_at"] or 0) + self.probe_interval - time.time())
+        return {
+            "agent": agent_info['name'],
+            "model": agent_info['model'],
+            "response": f"Skipped: {agent_info['name']} has been failing (circuit open), next try in {retry_in:.0f}s.",
+            "status": "skipped",
+        }
+
+    def save(self):
+        with self.lock:
+            save_circuits(self.circuits, self.path)
+
+    def reset(self):
+        with self.lock:
+            self.circuits.clear()
+            self.probing.clear()
+            save_circuits(self.circuits, self.path)
+
+    def format_status(self):
+        """One line per agent whose circuit isn't closed, plus skip counts"""
+        lines = []
+        with self.lock:
+            for agent_name, circuit in self.circuits.items():
+                if circuit["state"] == "closed":
+                    continue
+                failures = f"{sum(circuit['outcomes'])}/{len(circuit['outcomes'])} recent calls failed"
+                retry_in = max(0.0, circuit["opened_at"] + self.probe_interval - time.time())
+                lines.append(
+                    f"⚡ Circuit {circuit['state'].replace('_', '-')}: {agent_name} ({circuit.get('model', '?')}), "
+                    f"{failures}, next probe in {retry_in:.0f}s"
+                )
+            if self.stats["skipped"]:
+                lines.append(f"⚡ {self.stats['skipped']} calls skipped by open circuits")
+        return "\n".join(lines)
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+def get_breaker():
+    """The process-wide breaker, loaded on first use; None when disabled (CIRCUIT_BREAKER=0)"""
+    global _breaker
+    if not ENABLED:
+        return None
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker()
+        return _breaker
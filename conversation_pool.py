@@ -0,0 +1,100 @@
+"""
+How single-shot agent calls get their conversation.
+"stateless" (default) sends the prompt straight to responses.create with no conversation,
+saving a round trip and leaving no conversation behind; "pool" hands out single-use
+conversations pre-created in the background; "conversation" creates one per call (the
+original behaviour, for agents that need server-side history).
+"""
+
+import os
+import threading
+from collections import deque
+
+CALL_MODES = ("stateless", "pool", "conversation")
+CALL_MODE = os.environ.get("AGENT_CALL_MODE", "stateless")
+POOL_SIZE = int(os.environ.get("CONVERSATION_POOL_SIZE", "8"))
+
+class ConversationPool:
+    """Keeps up to `size` unused conversations ready so calls don't wait on conversations.create"""
+
+    def __init__(self, openai_client, size=POOL_SIZE):
+        from concurrent.futures import ThreadPoolExecutor  # lazy: main.py imports CALL_MODES at startup
+
+        self.openai_client = openai_client
+        self.size = size
+        self.ready = deque()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.refiller = ThreadPoolExecutor(max_workers=2, thread_name_prefix="conversation-pool")
+        self.stats = {"hits": 0, "misses": 0, "created": 0}
+        self.refill()
+
+    def refill(self):
+        """Start background creates until ready + in-flight reaches the pool size"""
+        with self.lock:
+            wanted = self.size - len(self.ready) - self.pending
+            self.pending += max(0, wanted)
+        for _ in range(wanted):
+            self.refiller.submit(self.create_one)
+
+    def create_one(self):
+        try:
+            conversation_id = self.openai_client.conversations.create().id
+        except Exception:
+            conversation_id = None  # the next acquire() falls back to an inline create
+        with self.lock:
+            self.pending -= 1
+            if conversation_id is not None:
+                self.ready.append(conversation_id)
+                self.stats["created"] += 1
+
+    def acquire(self):
+        """Take a fresh conversation id; each one is used for exactly one call"""
+        with self.lock:
+            conversation_id = self.ready.popleft() if self.ready else None
+            self.stats["hits" if conversation_id else "misses"] += 1
+        if conversation_id is None:
+            conversation_id = self.openai_client.conversations.create().id
+        self.refill()
+        return conversation_id
+
+    def close(self):
+        """Stop refilling and delete the conversations that were never used"""
+        self.refiller.shutdown(wait=True)
+        with self.lock:
+            leftover = list(self.ready)
+            self.ready.clear()
+        for conversation_id in leftover:
+            try:
+                self.openai_client.conversations.delete(conversation_id=conversation_id)
+            except Exception:
+                pass
+        return len(leftover)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(openai_client):
+    """Process-wide pool for a client, created on first use"""
+    with _pools_lock:
+        if id(openai_client) not in _pools:
+            _pools[id(openai_client)] = ConversationPool(openai_client)
+        return _pools[id(openai_client)]
+
+def conversation_kwargs(openai_client, mode=None):
+    """Extra responses.create arguments for a single-shot call in the given (or configured) mode"""
+    mode = mode or CALL_MODE
+    if mode == "stateless":
+        return {}
+    if mode == "pool":
+        return {"conversation": get_pool(openai_client).acquire()}
+    if mode == "conversation":
+        return {"conversation": openai_client.conversations.create().id}
+    raise ValueError(f"unknown AGENT_CALL_MODE '{mode}' (expected one of {', '.join(CALL_MODES)})")
+
+def close_pools():
+    """Delete unused pooled conversations (call before exiting)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    return sum(pool.close() for pool in pools)
@@ -1,15 +1,13 @@
 import os
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
 from azure.ai.projects.models import WorkflowAgentDefinition
 
+from workflow_compiler import require_valid, load_known_agents
+import foundry_clients
+
 load_dotenv()
 
-project_client = AIProjectClient(
-    endpoint=os.environ["PROJECT_ENDPOINT"],
-    credential=DefaultAzureCredential(),
-)
+project_client = foundry_clients.get_project_client()
 
 # Create a corrected workflow that matches our deployed agents exactly
 corrected_workflow = """
@@ -47,6 +45,9 @@ trigger:
 """
 
 try:
+    # Validate offline before spending a create_version round trip
+    require_valid(corrected_workflow, load_known_agents())
+
     # Create a new working workflow agent
     working_workflow = project_client.agents.create_version(
         agent_name="working-multi-agent-workflow", 
@@ -57,7 +58,7 @@ try:
     print(f"   ID: {working_workflow.id}")
     
     # Test the new workflow
-    openai_client = project_client.get_openai_client()
+    openai_client = foundry_clients.get_openai_client()
     conversation = openai_client.conversations.create()
     
     print("Testing the new working workflow...")
@@ -0,0 +1,137 @@
+"""
+Token credential that remembers access tokens across runs.
+Tokens are kept in a user-only (0600) file under .foundry/ and reused until shortly
+before they expire, and the credential type that produced the last token is pinned
+so the next run builds it directly instead of walking DefaultAzureCredential's chain.
+"""
+
+import os
+import json
+import time
+import threading
+
+CACHE_PATH = os.environ.get("CREDENTIAL_CACHE_PATH", os.path.join(".foundry", "token-cache.json"))
+REFRESH_MARGIN = int(os.environ.get("CREDENTIAL_CACHE_REFRESH_MARGIN", "300"))  # seconds before expiry
+
+# Chain members that can be built without arguments, by class name
+PINNABLE_CREDENTIALS = (
+    "EnvironmentCredential",
+    "WorkloadIdentityCredential",
+    "ManagedIdentityCredential",
+    "SharedTokenCacheCredential",
+    "VisualStudioCodeCredential",
+    "AzureCliCredential",
+    "AzurePowerShellCredential",
+    "AzureDeveloperCliCredential",
+)
+
+def cache_scope():
+    """Tokens are only reused for the same tenant/endpoint configuration"""
+    return "|".join([os.environ.get("AZURE_TENANT_ID", ""), os.environ.get("PROJECT_ENDPOINT", "")])
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, path=CACHE_PATH):
+    """Write the cache atomically, readable by the current user only"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.chmod(tmp_path, 0o600)  # in case the file already existed with wider permissions
+    os.replace(tmp_path, path)
+
+class CachedTokenCredential:
+    """get_token() front end for DefaultAzureCredential with a persistent token cache"""
+
+    def __init__(self, path=CACHE_PATH, refresh_margin=REFRESH_MARGIN):
+        self.path = path
+        self.refresh_margin = refresh_margin
+        self.lock = threading.Lock()
+        self.inner = None
+        self.pinned = None
+        self.tokens = {}  # (cache scope, token key) -> {"token", "expires_on"}, as in the file
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "acquired": 0, "pinned_failures": 0}
+
+    def build_inner(self):
+        """Use the pinned credential type if there is one, else the full default chain"""
+        import azure.identity
+
+        self.pinned = load_cache(self.path).get(cache_scope(), {}).get("credential")
+        if self.pinned in PINNABLE_CREDENTIALS:
+            return getattr(azure.identity, self.pinned)()
+        self.pinned = None
+        return azure.identity.DefaultAzureCredential()
+
+    def get_token(self, *scopes, claims=None, tenant_id=None, **kwargs):
+        from azure.core.credentials import AccessToken
+
+        key = " ".join(sorted(scopes)) + (f"|{tenant_id}" if tenant_id else "")
+        with self.lock:
+            # The file is only read once the token in memory is near expiry
+            token = self.tokens.get((cache_scope(), key))
+            if self.usable(token, claims):
+                self.stats["memory_hits"] += 1
+                return AccessToken(token["token"], token["expires_on"])
+
+            cache = load_cache(self.path)
+            entry = cache.get(cache_scope(), {})
+            token = entry.get("tokens", {}).get(key)
+            if self.usable(token, claims):
+                self.tokens[(cache_scope(), key)] = token
+                self.stats["disk_hits"] += 1
+                return AccessToken(token["token"], token["expires_on"])
+
+            access_token = self.acquire(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+            token = self.tokens[(cache_scope(), key)] = {"token": access_token.token, "expires_on": access_token.expires_on}
+            entry.setdefault("tokens", {})[key] = token
+            entry["credential"] = self.credential_name()
+            cache[cache_scope()] = entry
+            save_cache(cache, self.path)
+            self.stats["acquired"] += 1
+            return access_token
+
+    def usable(self, token, claims=None):
+        """A cached token is reused until refresh_margin before it expires; claims challenges need a fresh one"""
+        return bool(token) and not claims and token["expires_on"] - self.refresh_margin > time.time()
+
+    def acquire(self, *scopes, **kwargs):
+        """Fetch a token, falling back to the full chain if the pinned credential stops working"""
+        from azure.identity import DefaultAzureCredential
+
+        if self.inner is None:
+            self.inner = self.build_inner()
+        try:
+            return self.inner.get_token(*scopes, **kwargs)
+        except Exception:
+            if self.pinned is None:
+                raise
+            self.stats["pinned_failures"] += 1
+            self.pinned = None
+            self.inner = DefaultAzureCredential()
+            return self.inner.get_token(*scopes, **kwargs)
+
+    def credential_name(self):
+        """Class name of the credential that actually produced the token"""
+        if self.pinned:
+            return self.pinned
+        successful = getattr(self.inner, "_successful_credential", None)
+        name = type(successful).__name__ if successful is not None else None
+        return name if name in PINNABLE_CREDENTIALS else None
+
+    def close(self):
+        if self.inner is not None and hasattr(self.inner, "close"):
+            self.inner.close()
+
+def clear_cache(path=CACHE_PATH):
+    """Forget cached tokens and the pinned credential (e.g. after `az login` as someone else)"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
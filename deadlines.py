@@ -0,0 +1,159 @@
+"""
+Deadlines for agent calls.
+Each call gets its own deadline and the whole fan-out an overall one; when either
+passes, the call's stream is closed (which cancels the response server-side, so it
+stops using quota) and the caller gets a "timeout" result instead of waiting.
+"""
+
+import os
+import asyncio
+import threading
+
+AGENT_TIMEOUT = float(os.environ.get("AGENT_TIMEOUT", "30"))  # seconds per agent call
+ORCHESTRATION_TIMEOUT = float(os.environ.get("ORCHESTRATION_TIMEOUT", "90"))  # seconds for the whole fan-out
+
+# Task cancel message for calls dropped because their answer is no longer needed (e.g. a
+# quorum was reached); such calls count as "cancelled" rather than timed out
+NOT_NEEDED = "not needed"
+
+class CancelToken:
+    """Cancellation signal for a streaming call running on a worker thread
+
+    The worker attaches its stream; set() closes it immediately, so even a stream
+    that is stuck waiting for its next event is abandoned at once.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.stream = None
+        self.linked = []
+
+    def attach(self, stream):
+        with self.lock:
+            self.stream = stream
+            cancelled = self.event.is_set()
+        if cancelled:
+            close_quietly(stream)
+
+    def link(self, token):
+        """Set token too whenever this one is set (e.g. each attempt of a hedged call)"""
+        with self.lock:
+            self.linked.append(token)
+            cancelled = self.event.is_set()
+        if cancelled:
+            token.set()
+
+    def set(self):
+        with self.lock:
+            self.event.set()
+            stream = self.stream
+            linked = list(self.linked)
+        if stream is not None:
+            close_quietly(stream)
+        for token in linked:
+            token.set()
+
+    def is_set(self):
+        return self.event.is_set()
+
+def close_quietly(stream):
+    try:
+        stream.close()
+    except Exception:
+        pass
+
+def cancelled_status(error):
+    """Status for a call interrupted by CancelledError: cancelled if it was not needed, else timeout"""
+    return "cancelled" if NOT_NEEDED in error.args else "timeout"
+
+def timed_out(agent_info, seconds):
+    """Result dict for a call abandoned at its deadline"""
+    return {
+        "agent": agent_info['name'],
+        "model": agent_info['model'],
+        "response": f"{agent_info['name']} did not answer within {seconds:g}s; the request was cancelled.",
+        "status": "timeout",
+        "ttft": None,
+        "total_time": seconds,
+    }
+
+async def run_with_deadline(agent_info, start, timeout):
+    """Await start(cancel_token), cancelling it and returning a timeout result after timeout seconds
+
+    Cancelling the awaiting task (e.g. at the overall deadline) also cancels the call.
+    """
+    cancel = CancelToken()
+    call = asyncio.ensure_future(start(cancel))
+    try:
+        done, _ = await asyncio.wait({call}, timeout=timeout)
+    except asyncio.CancelledError as error:
+        cancel.set()
+        call.cancel(*error.args[:1])
+        raise
+    if call in done:
+        return call.result()
+    cancel.set()
+    call.cancel()
+    return timed_out(agent_info, timeout)
+
+async def gather_with_deadline(agents, calls, deadline):
+    """Await one call task per agent until the overall deadline
+
+    Calls still running then are cancelled and reported as timed out, so the
+    results that did arrive are returned instead of waiting for the slowest agent.
+    """
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    if tasks:
+        await asyncio.wait(tasks, timeout=deadline)
+    results = collect_results(agents, tasks, deadline)
+    await unwind(tasks)
+    return results
+
+async def unwind(tasks):
+    """Wait for cancelled tasks to finish unwinding
+
+    A cancelled call only closes its stream (cancelling the request server-side) once the
+    event loop runs it again, so this must return before anything blocks the loop.
+    """
+    pending = [task for task in tasks if not task.done()]
+    if pending:
+        await asyncio.wait(pending)
+
+def cancelled(agent_info, task, deadline):
+    """Result dict for a task that ended cancelled: "cancelled" if it was not needed, else timed out"""
+    try:
+        task.result()
+    except asyncio.CancelledError as error:
+        if cancelled_status(error) == "cancelled":
+            return {
+                "agent": agent_info['name'],
+                "model": agent_info['model'],
+                "response": f"{agent_info['name']} was not needed; the request was cancelled.",
+                "status": "cancelled",
+            }
+    return timed_out(agent_info, deadline)
+
+def collect_results(agents, tasks, deadline):
+    """Results of the finished tasks; unfinished ones are cancelled and reported as timed out
+
+    Await unwind(tasks) afterwards so the cancelled calls have closed their streams.
+    """
+    results = []
+    for agent_info, task in zip(agents, tasks):
+        if not task.done():
+            task.cancel()
+            results.append(timed_out(agent_info, deadline))
+        elif task.cancelled():
+            # task.exception() would raise CancelledError and lose every other result
+            results.append(cancelled(agent_info, task, deadline))
+        elif task.exception() is not None:
+            results.append({
+                "agent": agent_info['name'],
+                "model": agent_info['model'],
+                "response": f"Sorry, {agent_info['name']} failed during parallel execution.",
+                "status": "error",
+            })
+        else:
+            results.append(task.result())
+    return results
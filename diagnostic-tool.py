@@ -5,14 +5,18 @@ Helps identify common issues preventing workflows from executing
 """
 
 import os
+import time
 import asyncio
+import argparse
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
+
+import agent_registry
+import diagnostic_probes
+import foundry_clients
 
 load_dotenv()
 
-async def run_diagnostic():
+async def run_diagnostic(warmup=1, samples=3, concurrency=diagnostic_probes.DIAGNOSTIC_CONCURRENCY):
     """Run comprehensive diagnostic of your Foundry setup"""
     print("🔍 Microsoft Foundry Workflow Diagnostic Tool")
     print("=" * 60)
@@ -33,10 +37,7 @@ async def run_diagnostic():
     print("-" * 30)
     
     try:
-        project_client = AIProjectClient(
-            endpoint=project_endpoint,
-            credential=DefaultAzureCredential(),
-        )
+        project_client = foundry_clients.get_project_client()
         print("✅ Azure connection successful")
     except Exception as e:
         print(f"❌ Azure connection failed: {e}")
@@ -47,11 +48,8 @@ async def run_diagnostic():
     print("-" * 30)
     
     try:
-        agents = project_client.agents.list()
-        if hasattr(agents, 'data') and agents.data:
-            agent_list = agents.data
-        else:
-            agent_list = agents if isinstance(agents, list) else []
+        # agents.list() pages lazily; materialize it
+        agent_list = list(project_client.agents.list())
             
         if not agent_list:
             print("❌ No agents found")
@@ -59,14 +57,16 @@ async def run_diagnostic():
         
         deployed_agents = {}
         for agent in agent_list:
+            latest = agent.versions.latest
             deployed_agents[agent.name] = {
-                'id': agent.id,
-                'version': agent.version,
-                'model': getattr(agent, 'model', 'Unknown')
+                'id': latest.id,
+                'version': latest.version,
+                'kind': getattr(latest.definition, 'kind', None),
+                'model': getattr(latest.definition, 'model', None) or 'Unknown'
             }
             print(f"✅ {agent.name}")
-            print(f"   ID: {agent.id}")
-            print(f"   Version: {agent.version}")
+            print(f"   ID: {latest.id}")
+            print(f"   Version: {latest.version}")
     
     except Exception as e:
         print(f"❌ Error listing agents: {e}")
@@ -112,35 +112,39 @@ async def run_diagnostic():
     else:
         print("✅ All expected agents found - workflow should execute properly")
     
-    # Check 6: Model Deployments
-    print("\n6️⃣ MODEL DEPLOYMENT CHECK")
-    print("-" * 30)
-    
-    expected_models = ["DeepSeek-V3.2", "gpt-5.2", "Mistral-Large-3"]
-    print("Expected model deployments:")
-    for model in expected_models:
-        print(f"   • {model} (verify this exists in Azure AI Foundry portal)")
-    
-    # Check 7: Test Simple Agent Call
-    print("\n7️⃣ AGENT CONNECTIVITY TEST")
+    # Check 6: Probe every prompt agent and model deployment concurrently
+    print("\n6️⃣ AGENT & MODEL DEPLOYMENT LATENCY")
     print("-" * 30)
     
-    if deployed_agents:
-        test_agent_name = list(deployed_agents.keys())[0]
-        try:
-            openai_client = project_client.get_openai_client()
-            conversation = openai_client.conversations.create()
-            
-            response = openai_client.responses.create(
-                conversation=conversation.id,
-                extra_body={"agent": {"name": test_agent_name, "type": "agent_reference"}},
-                input="Hello, this is a connectivity test.",
-            )
-            print(f"✅ Agent connectivity test passed with {test_agent_name}")
-            print(f"   Response preview: {response.output_text[:100]}...")
-        except Exception as e:
-            print(f"❌ Agent connectivity test failed: {e}")
-            print(f"   This may indicate model deployment or permission issues")
+    # Workflows are skipped: probing one would run the whole multi-agent workflow
+    probe_agents = [name for name, info in deployed_agents.items() if info['kind'] != "workflow"]
+    expected_models = sorted(
+        {spec.model for spec in agent_registry.load_registry().values()}
+        | {info['model'] for info in deployed_agents.values() if info['model'] != 'Unknown'}
+    )
+    print(f"Probing {len(probe_agents)} agents and {len(expected_models)} model deployments "
+          f"({warmup} warm-up + {samples} measured requests each, {concurrency} at a time)...")
+    
+    started = time.perf_counter()
+    probe_results = diagnostic_probes.probe_all(
+        foundry_clients.get_openai_client(),
+        probe_agents,
+        expected_models,
+        project_client=project_client,
+        warmup=warmup,
+        samples=samples,
+        max_workers=concurrency,
+    )
+    print(diagnostic_probes.format_probe_table(probe_results))
+    print(f"⏱️  Probed {len(probe_results)} targets in {time.perf_counter() - started:.1f}s")
+    
+    unreachable = [result['target'] for result in probe_results if not result['stats']['count']]
+    throttled = [result['target'] for result in probe_results if result['throttled']]
+    if unreachable:
+        print(f"❌ No successful responses from: {', '.join(unreachable)}")
+        print(f"   This may indicate model deployment or permission issues")
+    if throttled:
+        print(f"⚠️  Throttled (429): {', '.join(throttled)} - check quota limits")
     
     # Summary and Recommendations
     print("\n" + "=" * 60)
@@ -170,8 +174,13 @@ async def run_diagnostic():
 
 def main():
     """Run the diagnostic tool"""
+    parser = argparse.ArgumentParser(description="Diagnose the Foundry project, its agents and model deployments")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured requests per agent/deployment")
+    parser.add_argument("--samples", type=int, default=3, help="measured requests per agent/deployment")
+    parser.add_argument("--concurrency", type=int, default=diagnostic_probes.DIAGNOSTIC_CONCURRENCY, help="targets probed at once")
+    args = parser.parse_args()
     try:
-        asyncio.run(run_diagnostic())
+        asyncio.run(run_diagnostic(args.warmup, args.samples, args.concurrency))
     except Exception as e:
         print(f"\n❌ Diagnostic failed: {e}")
         print("Check your .env file and Azure configuration")
@@ -0,0 +1,111 @@
+"""
+Concurrent latency probes for the diagnostic tool.
+Every deployed prompt agent and every expected model deployment gets a few warm-up
+requests and a few measured ones, all targets in parallel, and the results are
+summarized per target (min/median/max latency, error classes, throttling).
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from latency_stats import summarize
+
+PROBE_INPUT = "Reply with the single word OK."
+PROBE_MAX_OUTPUT_TOKENS = 16
+DIAGNOSTIC_CONCURRENCY = int(os.environ.get("DIAGNOSTIC_CONCURRENCY", "16"))
+SLOW_FACTOR = 2.0  # flag targets whose median is this many times the overall median
+
+def error_class(error):
+    """Short label for a failed probe, e.g. 'RateLimitError (429)'"""
+    status = getattr(error, "status_code", None)
+    return f"{type(error).__name__} ({status})" if status else type(error).__name__
+
+def is_throttled(error):
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+def run_probe(target, kind, request, warmup, samples):
+    """Call request() warmup + samples times and collect latencies and failures"""
+    result = {"target": target, "kind": kind, "latencies": [], "errors": {}, "throttled": 0, "attempts": samples}
+    for attempt in range(warmup + samples):
+        started = time.perf_counter()
+        try:
+            request()
+        except Exception as e:
+            if attempt >= warmup:
+                label = error_class(e)
+                result["errors"][label] = result["errors"].get(label, 0) + 1
+                result["throttled"] += is_throttled(e)
+            continue
+        if attempt >= warmup:
+            result["latencies"].append(time.perf_counter() - started)
+    result["stats"] = summarize(result["latencies"])
+    return result
+
+def agent_request(openai_client, agent_name):
+    def request():
+        openai_client.responses.create(
+            extra_body={"agent": {"name": agent_name, "type": "agent_reference"}},
+            input=PROBE_INPUT,
+        )
+    return request
+
+def deployment_request(openai_client, model):
+    def request():
+        openai_client.responses.create(model=model, input=PROBE_INPUT, max_output_tokens=PROBE_MAX_OUTPUT_TOKENS)
+    return request
+
+def check_deployment(project_client, model):
+    """Return an error label if the deployment doesn't exist (or can't be read), else None"""
+    if project_client is None:
+        return None
+    try:
+        project_client.deployments.get(model)
+    except Exception as e:
+        return "missing" if type(e).__name__ == "ResourceNotFoundError" else error_class(e)
+    return None
+
+def probe_all(openai_client, agent_names, models, project_client=None, warmup=1, samples=3, max_workers=DIAGNOSTIC_CONCURRENCY):
+    """Probe every agent and model deployment concurrently; results keep the input order"""
+
+    def probe_model(model):
+        missing = check_deployment(project_client, model)
+        if missing:
+            return {"target": model, "kind": "model", "latencies": [], "errors": {missing: 1},
+                    "throttled": 0, "attempts": 0, "stats": summarize([])}
+        return run_probe(model, "model", deployment_request(openai_client, model), warmup, samples)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="probe") as pool:
+        futures = [
+            pool.submit(run_probe, name, "agent", agent_request(openai_client, name), warmup, samples)
+            for name in agent_names
+        ]
+        futures += [pool.submit(probe_model, model) for model in models]
+        return [future.result() for future in futures]
+
+def format_probe_table(results):
+    """Compact per-target table; slow targets and failures stand out"""
+    medians = [result["stats"]["p50"] for result in results if result["stats"]["count"]]
+    overall = summarize(medians)["p50"] if medians else None
+
+    lines = [f"   {'TARGET':<32}{'KIND':<7}{'OK':>6}{'MIN':>9}{'MEDIAN':>9}{'MAX':>9}  {'THROTTLED':<10}ERRORS"]
+    for result in results:
+        stats = result["stats"]
+        if stats["count"]:
+            timing = f"{stats['min']:>8.2f}s{stats['p50']:>8.2f}s{stats['max']:>8.2f}s"
+        else:
+            timing = f"{'-':>9}{'-':>9}{'-':>9}"
+        errors = ", ".join(f"{label} x{count}" for label, count in result["errors"].items())
+        if not stats["count"]:
+            emoji = "❌"
+        elif result["errors"]:
+            emoji = "⚠️ "
+        elif overall and stats["p50"] > SLOW_FACTOR * overall:
+            emoji = "🐢"
+        else:
+            emoji = "✅"
+        lines.append(
+            f"{emoji} {result['target']:<32}{result['kind']:<7}{stats['count']:>3}/{result['attempts']:<2}"
+            f"{timing}  {result['throttled'] or '-':<10}{errors or '-'}"
+        )
+    return "\n".join(lines)
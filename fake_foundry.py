@@ -0,0 +1,260 @@
+"""
+In-process fake of the Foundry OpenAI client for benchmarks and offline runs.
+Implements the slice of the API this project uses (conversations.create/delete and
+responses.create, including stream=True) with configurable latency, error rates and an
+optional requests-per-minute quota that answers 429 with Retry-After like the real service,
+and an optional capacity beyond which concurrent calls slow down (queueing on the server).
+workflow_events() builds a synthetic hosted-workflow stream for stream_recording replays.
+"""
+
+import math
+import time
+import random
+import threading
+from types import SimpleNamespace
+
+class FakeServiceError(Exception):
+    """Raised by the fake to simulate a failed model call"""
+
+    def __init__(self, message, status_code=500, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        headers = {"retry-after-ms": str(int(retry_after * 1000))} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+class LatencyModel:
+    """Draws per-call latencies (seconds) from a fixed, uniform or lognormal distribution"""
+
+    def __init__(self, median=0.05, distribution="lognormal", sigma=0.5, seed=None):
+        self.median = median
+        self.distribution = distribution
+        self.sigma = sigma
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def sample(self):
+        with self.lock:
+            if self.distribution == "fixed":
+                return self.median
+            if self.distribution == "uniform":
+                return self.random.uniform(self.median * (1 - self.sigma), self.median * (1 + self.sigma))
+            return self.median * math.exp(self.random.gauss(0.0, self.sigma))
+
+class FakeConversations:
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, **kwargs):
+        time.sleep(self.client.conversation_latency)
+        with self.client.lock:
+            self.client.conversation_count += 1
+            return SimpleNamespace(id=f"conv_fake_{self.client.conversation_count}")
+
+    def delete(self, conversation_id=None, **kwargs):
+        return SimpleNamespace(id=conversation_id, deleted=True)
+
+class FakeResponses:
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, input=None, stream=False, extra_body=None, **kwargs):
+        agent_name = ((extra_body or {}).get("agent") or {}).get("name", "model")
+        started = time.perf_counter()
+        self.client.check_quota()
+        latency = self.client.latency_for(agent_name).sample() * self.client.start_call()
+        failed = self.client.random_failure()
+        text = self.client.answer(agent_name, input)
+
+        with self.client.lock:
+            self.client.response_count += 1
+            response_id = f"resp_fake_{self.client.response_count}"
+        usage = SimpleNamespace(
+            input_tokens=len(str(input).split()),
+            output_tokens=len(text.split()),
+            total_tokens=len(str(input).split()) + len(text.split()),
+            input_tokens_details=SimpleNamespace(cached_tokens=0),
+        )
+        if stream:
+            return FakeStream(self.client, agent_name, latency, started, lambda stream: stream_events(
+                stream, response_id, text, latency, failed, usage
+            ))
+
+        time.sleep(latency)
+        self.client.end_call()
+        self.client.record(agent_name, latency, "error" if failed else "success", started)
+        if failed:
+            raise failed
+        return SimpleNamespace(id=response_id, output_text=text, status="completed", usage=usage)
+
+class FakeStream:
+    """A streamed fake response; like the SDK's, it can be closed before the first event or from another thread
+
+    The call ends (leaves the in-flight count and is recorded) exactly once: when it
+    completes, fails, or is closed.
+    """
+
+    def __init__(self, client, agent_name, latency, started, events):
+        self.client = client
+        self.agent_name = agent_name
+        self.latency = latency
+        self.started = started
+        self.lock = threading.Lock()
+        self.ended = False
+        self.closed = False
+        self.events = events(self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.events)
+
+    def close(self):
+        self.closed = True
+        try:
+            self.events.close()
+        except ValueError:  # being iterated on another thread; it stops at its next event
+            pass
+        self.end("cancelled")
+
+    def end(self, status):
+        with self.lock:
+            if self.ended:
+                return
+            self.ended = True
+        self.client.end_call()
+        self.client.record(self.agent_name, self.latency, status, self.started)
+
+def stream_events(stream, response_id, text, latency, failed, usage):
+    """Yield Responses streaming events, spending ~30% of the latency before the first token"""
+    try:
+        sequence = 0
+        yield SimpleNamespace(type="response.created", sequence_number=sequence, response=SimpleNamespace(id=response_id))
+        time.sleep(latency * 0.3)
+        if failed:
+            stream.end("error")
+            yield SimpleNamespace(type="error", sequence_number=sequence + 1, message=str(failed), code=str(failed.status_code))
+            return
+        words = text.split(" ")
+        per_word = latency * 0.7 / max(1, len(words))
+        for index, word in enumerate(words):
+            if stream.closed:
+                return
+            sequence += 1
+            yield SimpleNamespace(type="response.output_text.delta", sequence_number=sequence, delta=word if index == 0 else " " + word)
+            time.sleep(per_word)
+        stream.end("success")
+        yield SimpleNamespace(
+            type="response.completed",
+            sequence_number=sequence + 1,
+            response=SimpleNamespace(id=response_id, output_text=text, status="completed", usage=usage),
+        )
+    finally:
+        stream.end("cancelled")
+
+class FakeOpenAIClient:
+    """Drop-in stand-in for project_client.get_openai_client() in benchmarks"""
+
+    def __init__(self, latency=None, error_rate=0.0, conversation_latency=0.005, per_agent_latency=None, seed=None,
+                 requests_per_minute=None, capacity=None):
+        self.latency = latency or LatencyModel(seed=seed)
+        self.per_agent_latency = per_agent_latency or {}
+        self.error_rate = error_rate
+        self.conversation_latency = conversation_latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.conversation_count = 0
+        self.response_count = 0
+        self.calls = []
+        # Quota enforced per one-second window, as requests_per_minute / 60 calls per second
+        self.requests_per_second = requests_per_minute / 60 if requests_per_minute else None
+        self.window = (0, 0)  # (second, calls admitted in it)
+        self.throttled_count = 0
+        # Calls beyond `capacity` in flight stretch every new call's latency proportionally
+        self.capacity = capacity
+        self.in_flight = 0
+        self.conversations = FakeConversations(self)
+        self.responses = FakeResponses(self)
+
+    def latency_for(self, agent_name):
+        return self.per_agent_latency.get(agent_name, self.latency)
+
+    def check_quota(self):
+        """Raise a 429 with Retry-After when this second's share of the quota is used up"""
+        if self.requests_per_second is None:
+            return
+        with self.lock:
+            now = time.monotonic()
+            second, admitted = self.window
+            if int(now) != second:
+                second, admitted = int(now), 0
+            if admitted >= self.requests_per_second:
+                self.throttled_count += 1
+                raise FakeServiceError("rate limit exceeded", status_code=429, retry_after=second + 1 - now)
+            self.window = (second, admitted + 1)
+
+    def start_call(self):
+        """Count a call in flight and return its latency multiplier"""
+        with self.lock:
+            self.in_flight += 1
+            return max(1.0, self.in_flight / self.capacity) if self.capacity else 1.0
+
+    def end_call(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def random_failure(self):
+        with self.lock:
+            if self.random.random() < self.error_rate:
+                return FakeServiceError("simulated model failure")
+        return None
+
+    def answer(self, agent_name, user_input):
+        return f"{agent_name} tells a short story about: {user_input}"
+
+    def record(self, agent_name, latency, status, started):
+        """calls gets (agent, sampled latency, finished, status, started), times from perf_counter
+
+        status is "success", "error" or "cancelled" (closed before it completed).
+        """
+        with self.lock:
+            self.calls.append((agent_name, latency, time.perf_counter(), status, started))
+
+def workflow_events(agents=4, setup_actions=6, words=200, agent_latency=2.0, seed=None):
+    """(offset, event) pairs shaped like a hosted workflow run's stream, for offline replay
+
+    A chain of SetVariable/CreateConversation actions followed by InvokeAzureAgent actions,
+    each streaming `words` text deltas over roughly `agent_latency` seconds.
+    """
+    rng = random.Random(seed)
+    events = []
+    clock = 0.0
+
+    def emit(type, **fields):
+        events.append((clock, SimpleNamespace(type=type, sequence_number=len(events), **fields)))
+
+    def action(type, action_id, kind, status, previous):
+        item = SimpleNamespace(type="workflow_action", id=f"wfa_{action_id}", kind=kind, action_id=action_id,
+                               parent_action_id=None, previous_action_id=previous, status=status)
+        emit(type, output_index=0, item=item)
+
+    emit("response.created", response=SimpleNamespace(id="resp_fake_workflow", status="in_progress"))
+    previous = None
+    steps = [(f"setup_{index}", "SetVariable") for index in range(setup_actions)]
+    steps += [(f"agent_{index}", "InvokeAzureAgent") for index in range(agents)]
+    for action_id, kind in steps:
+        clock += 0.01
+        if kind != "InvokeAzureAgent":
+            action("response.output_item.added", action_id, kind, "completed", previous)
+        else:
+            action("response.output_item.added", action_id, kind, "in_progress", previous)
+            latency = agent_latency * math.exp(rng.gauss(0.0, 0.5))
+            for index in range(words):
+                clock += latency / words
+                emit("response.output_text.delta", item_id=f"msg_{action_id}", output_index=0, content_index=0,
+                     delta=("" if index == 0 else " ") + f"word{index}")
+            action("response.output_item.done", action_id, kind, "completed", previous)
+        previous = action_id
+    clock += 0.01
+    emit("response.completed", response=SimpleNamespace(id="resp_fake_workflow", status="completed", output_text=""))
+    return events
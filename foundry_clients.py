@@ -0,0 +1,124 @@
+"""
+Process-wide, lazily created Foundry clients.
+get_project_client() and get_openai_client() build one AIProjectClient and one OpenAI
+client per process on first use, over connection pools sized for concurrent fan-out,
+so calls reuse keep-alive connections instead of paying a new TLS handshake each time.
+Tracing (see instrumentation) is applied when it is enabled before the first call.
+"""
+
+import os
+import threading
+
+import instrumentation
+
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "64"))
+HTTP_MAX_KEEPALIVE = int(os.environ.get("HTTP_MAX_KEEPALIVE", "32"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "300"))
+# "auto" uses HTTP/2 for the Responses API when the optional h2 package is installed
+HTTP2 = os.environ.get("HTTP2", "auto")
+# The OpenAI SDK's own retries. Off by default so throttling.py alone handles 429s and 5xx:
+# SDK retries would sleep on 429s before the deployment is paused, and multiply its attempts
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "0"))
+
+_lock = threading.Lock()
+_credential = None
+_project_client = None
+_traced_project_client = None
+_openai_client = None
+
+def http2_enabled():
+    if HTTP2 == "auto":
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+    return HTTP2 == "1"
+
+def get_credential():
+    """Shared credential: DefaultAzureCredential behind the persistent token cache unless CREDENTIAL_CACHE=0"""
+    global _credential
+    with _lock:
+        if _credential is None:
+            if os.environ.get("CREDENTIAL_CACHE", "1") == "1":
+                from credential_cache import CachedTokenCredential
+                _credential = CachedTokenCredential()
+            else:
+                from azure.identity import DefaultAzureCredential
+                _credential = DefaultAzureCredential()
+        return _credential
+
+def build_project_transport():
+    """requests transport whose connection pool can hold a full fan-out"""
+    import requests
+    from azure.core.pipeline.transport import RequestsTransport
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_MAX_CONNECTIONS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(
+        session=session,
+        session_owner=False,
+        connection_timeout=HTTP_CONNECT_TIMEOUT,
+        read_timeout=HTTP_READ_TIMEOUT,
+    )
+
+def build_http_client():
+    """httpx client for the OpenAI client, with keep-alive pool limits and timeouts"""
+    import httpx
+    from openai import DefaultHttpxClient
+
+    return DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=http_timeout(),
+        http2=http2_enabled(),
+    )
+
+def http_timeout():
+    import httpx
+    return httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+
+def get_raw_project_client():
+    """The shared AIProjectClient without tracing"""
+    global _project_client
+    credential = get_credential()
+    with _lock:
+        if _project_client is None:
+            from azure.ai.projects import AIProjectClient
+            _project_client = AIProjectClient(
+                endpoint=os.environ["PROJECT_ENDPOINT"],
+                credential=credential,
+                transport=build_project_transport(),
+            )
+        return _project_client
+
+def get_project_client():
+    """Shared AIProjectClient (traced when tracing is enabled)"""
+    global _traced_project_client
+    project_client = get_raw_project_client()
+    with _lock:
+        if _traced_project_client is None:
+            _traced_project_client = instrumentation.instrument(project_client)
+        return _traced_project_client
+
+def get_openai_client():
+    """Shared OpenAI client for the Responses API (traced when tracing is enabled)"""
+    global _openai_client
+    project_client = get_raw_project_client()
+    with _lock:
+        if _openai_client is None:
+            # get_openai_client() sets its own http_client argument, so swap ours in on a copy
+            client = project_client.get_openai_client().with_options(
+                http_client=build_http_client(),
+                timeout=http_timeout(),
+                max_retries=OPENAI_MAX_RETRIES,
+            )
+            _openai_client = instrumentation.instrument_openai(client)
+        return _openai_client
@@ -0,0 +1,140 @@
+"""
+Hedged agent calls.
+If a call hasn't answered within a percentile of the agent's recent latency, a
+duplicate goes to a backup agent (the same agent unless agents.toml names one);
+the first successful answer wins and the other request is cancelled.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+
+from latency_stats import percentile
+from deadlines import CancelToken, NOT_NEEDED
+
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "10"))
+HEDGE_INITIAL_DELAY = float(os.environ.get("HEDGE_INITIAL_DELAY", "5.0"))  # seconds, until there is enough history
+HEDGE_WINDOW = 200  # recent latencies kept per agent
+
+class HedgePolicy:
+    """Per-agent hedge delays from recent latency, plus hedge statistics"""
+
+    def __init__(self, backups=None, pct=HEDGE_PERCENTILE, min_samples=HEDGE_MIN_SAMPLES, initial_delay=HEDGE_INITIAL_DELAY):
+        self.backups = backups or {}
+        self.pct = pct
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.history = {}
+        self.lock = threading.Lock()
+        self.stats = {"calls": 0, "hedged": 0, "backup_wins": 0}
+        self.latencies = []  # end-to-end latency of each call, hedged or not
+        self.unhedged = []  # primary latency, or a lower bound when the primary was cancelled
+
+    def backup_for(self, agent_info):
+        return self.backups.get(agent_info['name'], agent_info)
+
+    def delay_for(self, agent_name):
+        """How long to wait on the primary before hedging"""
+        with self.lock:
+            recent = list(self.history.get(agent_name, ()))
+        if len(recent) < self.min_samples:
+            return self.initial_delay
+        return percentile(recent, self.pct)
+
+    def record(self, agent_name, latency, primary_latency, hedged, backup_won):
+        with self.lock:
+            self.history.setdefault(agent_name, deque(maxlen=HEDGE_WINDOW)).append(primary_latency)
+            self.stats["calls"] += 1
+            self.stats["hedged"] += hedged
+            self.stats["backup_wins"] += backup_won
+            self.latencies.append(latency)
+            self.unhedged.append(primary_latency)
+
+    def format_stats(self):
+        calls = self.stats["calls"]
+        if not calls:
+            return "🪁 Hedging: no calls"
+        line = (
+            f"🪁 Hedging: {self.stats['hedged']}/{calls} calls hedged ({self.stats['hedged'] / calls:.0%}), "
+            f"backup won {self.stats['backup_wins']}"
+        )
+        hedged_p99 = percentile(self.latencies, 99)
+        unhedged_p99 = percentile(self.unhedged, 99)
+        return line + f"; p99 {hedged_p99:.2f}s vs ≥{unhedged_p99:.2f}s without hedging"
+
+def succeeded(task):
+    return task.done() and not task.cancelled() and task.exception() is None and task.result()['status'] == "success"
+
+async def hedged_call(policy, agent_info, start, cancel=None):
+    """Run start(agent_info, cancel_event) and hedge it with the backup if it is slow
+
+    start must return an awaitable result dict and stop early once its CancelToken is set.
+    Cancelling the hedged call itself (e.g. at a deadline), or setting cancel, cancels both requests.
+    """
+    started = time.perf_counter()
+    primary_cancel = CancelToken()
+    if cancel is not None:
+        cancel.link(primary_cancel)
+    primary = asyncio.ensure_future(start(agent_info, primary_cancel))
+    try:
+        await asyncio.wait({primary}, timeout=policy.delay_for(agent_info['name']))
+    except asyncio.CancelledError as error:
+        await settle({primary: primary_cancel}, error.args[0] if error.args else None)
+        raise
+    if primary.done():
+        elapsed = time.perf_counter() - started
+        policy.record(agent_info['name'], elapsed, elapsed, hedged=False, backup_won=False)
+        return primary.result()
+
+    backup_info = policy.backup_for(agent_info)
+    backup_cancel = CancelToken()
+    if cancel is not None:
+        cancel.link(backup_cancel)
+    backup = asyncio.ensure_future(start(backup_info, backup_cancel))
+    pending = {primary, backup}
+    try:
+        while pending:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if succeeded(primary) or succeeded(backup):
+                break
+    except asyncio.CancelledError as error:
+        await settle({primary: primary_cancel, backup: backup_cancel}, error.args[0] if error.args else None)
+        raise
+
+    elapsed = time.perf_counter() - started
+    backup_won = succeeded(backup) and not succeeded(primary)
+    # Stop the loser; its worker closes the stream, which cancels the request server-side
+    if backup_won:
+        await settle({primary: primary_cancel})
+    else:
+        await settle({backup: backup_cancel})
+    # A cancelled primary would have taken at least this long
+    primary_latency = elapsed if backup_won else finished_primary_latency(primary, started)
+    policy.record(agent_info['name'], elapsed, primary_latency, hedged=True, backup_won=backup_won)
+
+    if not backup_won:
+        return primary.result()
+    result = dict(backup.result())
+    result.update(agent=agent_info['name'], hedged=True, answered_by=backup_info['name'])
+    return result
+
+async def settle(attempts, message=NOT_NEEDED):
+    """Cancel the attempts (task -> CancelToken) still running and wait for them
+
+    message is the cancel reason they see (None at a deadline, so it counts as a timeout).
+    Once this returns, their spans, concurrency slots and errors are all accounted for.
+    """
+    for task, cancel in attempts.items():
+        if not task.done():
+            cancel.set()
+            task.cancel(message)
+    await asyncio.gather(*attempts, return_exceptions=True)
+
+def finished_primary_latency(primary, started):
+    """Latency of a primary that finished (successfully or not) during the hedge"""
+    if primary.done() and not primary.cancelled() and primary.exception() is None:
+        return primary.result().get('total_time') or time.perf_counter() - started
+    return time.perf_counter() - started
@@ -0,0 +1,358 @@
+"""
+Lightweight spans for Foundry API calls.
+Wraps a project client (agents.create_version/get/list, get_openai_client) and its
+OpenAI client (conversations.create, responses.create, including streams) so every
+call records agent, model, phase, duration, status and token usage. Spans opened
+inside another span on the same thread (e.g. an "agent.call") record it as parent,
+which lets the summary split latency into conversation, model and client time.
+Gauges record values that change during a run, such as per-deployment concurrency limits.
+"""
+
+import os
+import json
+import time
+import threading
+import itertools
+import contextlib
+from dataclasses import dataclass, asdict
+
+from latency_stats import percentile
+
+TRACE_PATH = os.environ.get("FOUNDRY_TRACE_PATH", os.path.join(".foundry", "traces.jsonl"))
+
+@dataclass
+class Span:
+    span_id: int
+    parent_id: int
+    phase: str
+    agent: str = None
+    model: str = None
+    started_at: float = 0.0  # epoch seconds
+    duration: float = None
+    status: str = "success"
+    error: str = None
+    ttft: float = None
+    input_tokens: int = None
+    output_tokens: int = None
+    cached_tokens: int = None
+
+    def record_usage(self, usage):
+        """Copy token counts from a Responses API usage object"""
+        if usage is None:
+            return
+        self.input_tokens = getattr(usage, "input_tokens", None)
+        self.output_tokens = getattr(usage, "output_tokens", None)
+        details = getattr(usage, "input_tokens_details", None)
+        self.cached_tokens = getattr(details, "cached_tokens", None)
+
+class Tracer:
+    """Collects finished spans (thread-safe) and reports on them"""
+
+    def __init__(self):
+        self.spans = []
+        self.gauges = {}  # name -> [(epoch seconds, value)]
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.local = threading.local()
+
+    def start(self, phase, agent=None, model=None):
+        stack = self.local.__dict__.setdefault("stack", [])
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            # e.g. conversations.create inside an agent.call belongs to that agent
+            agent = agent or parent.agent
+            model = model or parent.model
+        span = Span(next(self.ids), parent.span_id if parent else None, phase, agent, model, time.time())
+        span._started = time.perf_counter()
+        span._stack = stack
+        stack.append(span)
+        return span
+
+    def finish(self, span):
+        """Record a span; finishing it again (e.g. a stream closed from another thread) is a no-op"""
+        with self.lock:
+            if span.duration is not None:
+                return
+            span.duration = time.perf_counter() - span._started
+            self.spans.append(span)
+        # The stack of the thread that started it, which may not be this one
+        if span in span._stack:
+            span._stack.remove(span)
+
+    def record_gauge(self, name, value):
+        with self.lock:
+            self.gauges.setdefault(name, []).append((time.time(), value))
+
+    @contextlib.contextmanager
+    def span(self, phase, agent=None, model=None):
+        """Time a block; an exception marks the span as an error and propagates"""
+        span = self.start(phase, agent, model)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = str(e)
+            raise
+        finally:
+            self.finish(span)
+
+    def export_jsonl(self, path=TRACE_PATH):
+        """Append every span as one JSON line"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self.lock:
+            spans = list(self.spans)
+        with open(path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(asdict(span)) + "\n")
+        return len(spans)
+
+    def format_summary(self):
+        """Per-phase latency/token table plus the conversation/model/client split of agent calls"""
+        with self.lock:
+            spans = list(self.spans)
+        if not spans:
+            return "📈 No Foundry API calls were traced"
+
+        phases = {}
+        for span in spans:
+            phases.setdefault(span.phase, []).append(span)
+
+        lines = [
+            f"📈 Foundry API spans ({len(spans)})",
+            f"{'PHASE':<22}{'CALLS':>6}{'ERR':>5}{'P50':>9}{'P95':>9}{'TOTAL':>9}{'IN TOK':>9}{'OUT TOK':>9}{'CACHED':>8}",
+        ]
+        for phase, group in phases.items():
+            durations = [span.duration for span in group]
+            tokens = [
+                sum(getattr(span, name) or 0 for span in group)
+                for name in ("input_tokens", "output_tokens", "cached_tokens")
+            ]
+            lines.append(
+                f"{phase:<22}{len(group):>6}{len([s for s in group if s.status == 'error']):>5}"
+                f"{percentile(durations, 50):>8.3f}s{percentile(durations, 95):>8.3f}s{sum(durations):>8.2f}s"
+                f"{tokens[0]:>9}{tokens[1]:>9}{tokens[2]:>8}"
+            )
+
+        calls = phases.get("agent.call", [])
+        if calls:
+            children = {}
+            for span in spans:
+                if span.parent_id is not None:
+                    children.setdefault(span.parent_id, []).append(span)
+            conversation = model = 0.0
+            for call in calls:
+                for child in children.get(call.span_id, []):
+                    if child.phase == "conversations.create":
+                        conversation += child.duration
+                    elif child.phase == "responses.create":
+                        model += child.duration
+            total = sum(call.duration for call in calls)
+            client = max(0.0, total - conversation - model)
+            share = lambda part: f"{part:.2f}s ({part / total:.0%})" if total else f"{part:.2f}s"
+            lines.append(
+                f"🔍 agent.call time: conversation {share(conversation)}, model {share(model)}, client {share(client)}"
+            )
+        with self.lock:
+            gauges = {name: list(samples) for name, samples in self.gauges.items()}
+        for name, samples in gauges.items():
+            values = [value for _, value in samples]
+            lines.append(
+                f"🎚️  {name}: {values[0]:g} → {values[-1]:g} (min {min(values):g}, max {max(values):g}, {len(values) - 1} changes)"
+            )
+        return "\n".join(lines)
+
+def agent_name_from(extra_body):
+    return ((extra_body or {}).get("agent") or {}).get("name")
+
+class InstrumentedConversations:
+    def __init__(self, conversations, tracer):
+        self.conversations = conversations
+        self.tracer = tracer
+
+    def create(self, *args, **kwargs):
+        with self.tracer.span("conversations.create"):
+            return self.conversations.create(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.conversations, name)
+
+class TracedStream:
+    """A traced response stream that, like the SDK's, can be closed from another thread
+
+    close() goes straight to the underlying HTTP stream, so a reader blocked waiting
+    for the next event is released (a generator can't be closed while it is running).
+    """
+
+    def __init__(self, stream, span, events, tracer):
+        self.stream = stream
+        self.span = span
+        self.events = events
+        self.tracer = tracer
+
+    def __iter__(self):
+        return self.events
+
+    def close(self):
+        # A stream closed after it ended (e.g. a hedge loser that finished first) keeps its status
+        with self.tracer.lock:
+            if self.span.duration is None:
+                self.span.status = "cancelled"
+        try:
+            self.events.close()
+        except ValueError:  # being iterated on another thread right now
+            pass
+        if hasattr(self.stream, "close"):
+            self.stream.close()
+        # A generator closed before its first event runs none of its body, so nothing else finishes the span
+        self.tracer.finish(self.span)
+
+class InstrumentedResponses:
+    def __init__(self, responses, tracer, agent_models):
+        self.responses = responses
+        self.tracer = tracer
+        self.agent_models = agent_models
+
+    def create(self, *args, **kwargs):
+        agent = agent_name_from(kwargs.get("extra_body"))
+        span = self.tracer.start("responses.create", agent, self.agent_models.get(agent) or kwargs.get("model"))
+        try:
+            result = self.responses.create(*args, **kwargs)
+        except BaseException as e:
+            span.status, span.error = "error", str(e)
+            self.tracer.finish(span)
+            raise
+        if kwargs.get("stream"):
+            return TracedStream(result, span, self.traced_stream(result, span), self.tracer)
+        span.model = getattr(result, "model", None) or span.model
+        span.record_usage(getattr(result, "usage", None))
+        self.tracer.finish(span)
+        return result
+
+    def traced_stream(self, stream, span):
+        """Pass events through, keeping the span open until the stream ends"""
+        try:
+            for event in stream:
+                if event.type == "response.output_text.delta" and span.ttft is None:
+                    span.ttft = time.perf_counter() - span._started
+                elif event.type == "response.completed":
+                    span.model = getattr(event.response, "model", None) or span.model
+                    span.record_usage(getattr(event.response, "usage", None))
+                elif event.type in ("response.failed", "error"):
+                    span.status = "error"
+                    span.error = getattr(event, "message", None) or str(getattr(event.response, "error", ""))
+                yield event
+        except GeneratorExit:
+            # The caller stopped reading (e.g. a hedged call lost); close the HTTP stream too
+            span.status = "cancelled"
+            if hasattr(stream, "close"):
+                stream.close()
+            raise
+        except BaseException as e:
+            if span.status != "cancelled":  # closed from another thread by TracedStream.close()
+                span.status, span.error = "error", str(e)
+            raise
+        finally:
+            self.tracer.finish(span)
+
+    def __getattr__(self, name):
+        return getattr(self.responses, name)
+
+class InstrumentedOpenAIClient:
+    """Proxy for the Foundry OpenAI client that traces conversations and responses"""
+
+    def __init__(self, client, tracer, agent_models=None):
+        self.client = client
+        self.conversations = InstrumentedConversations(client.conversations, tracer)
+        self.responses = InstrumentedResponses(client.responses, tracer, agent_models or {})
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+class InstrumentedAgents:
+    def __init__(self, agents, tracer, agent_models):
+        self.agents = agents
+        self.tracer = tracer
+        self.agent_models = agent_models
+
+    def create_version(self, agent_name, *args, **kwargs):
+        model = getattr(kwargs.get("definition"), "model", None)
+        with self.tracer.span("agents.create_version", agent_name, model):
+            return self.agents.create_version(agent_name, *args, **kwargs)
+
+    def get(self, agent_name, *args, **kwargs):
+        with self.tracer.span("agents.get", agent_name, self.agent_models.get(agent_name)):
+            return self.agents.get(agent_name, *args, **kwargs)
+
+    def list(self, *args, **kwargs):
+        """Time the whole (paged) listing, not just the first request
+
+        The pages are read inside the span and returned as a list, so spans the caller
+        opens per item aren't parented under agents.list.
+        """
+        with self.tracer.span("agents.list"):
+            return list(self.agents.list(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self.agents, name)
+
+class InstrumentedProjectClient:
+    """Proxy for AIProjectClient whose agents and OpenAI client are traced"""
+
+    def __init__(self, client, tracer, agent_models=None):
+        self.client = client
+        self.tracer = tracer
+        self.agent_models = agent_models or {}
+        self.agents = InstrumentedAgents(client.agents, tracer, self.agent_models)
+
+    def get_openai_client(self, *args, **kwargs):
+        return InstrumentedOpenAIClient(self.client.get_openai_client(*args, **kwargs), self.tracer, self.agent_models)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def enable_tracing():
+    """Turn on the process-wide tracer (e.g. from a --trace flag)"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+    return _tracer
+
+def get_tracer():
+    """Process-wide tracer, or None unless enabled (FOUNDRY_TRACE=1 or enable_tracing())"""
+    if _tracer is None and os.environ.get("FOUNDRY_TRACE", "0") == "1":
+        enable_tracing()
+    return _tracer
+
+# agent name -> model deployment, used to label spans; scripts register their agents here
+AGENT_MODELS = {}
+
+def instrument(project_client, agent_models=None):
+    """Wrap a project client when tracing is enabled, otherwise return it unchanged"""
+    tracer = get_tracer()
+    if tracer is None:
+        return project_client
+    return InstrumentedProjectClient(project_client, tracer, AGENT_MODELS if agent_models is None else agent_models)
+
+def instrument_openai(openai_client, agent_models=None):
+    """Wrap an OpenAI client when tracing is enabled, otherwise return it unchanged"""
+    tracer = get_tracer()
+    if tracer is None:
+        return openai_client
+    return InstrumentedOpenAIClient(openai_client, tracer, AGENT_MODELS if agent_models is None else agent_models)
+
+def gauge(name, value):
+    """Record the current value of a gauge when tracing is enabled"""
+    tracer = get_tracer()
+    if tracer is not None:
+        tracer.record_gauge(name, value)
+
+def traced(phase, agent=None, model=None):
+    """Span context for caller-defined phases; a throwaway span when tracing is off"""
+    tracer = get_tracer()
+    if tracer is None:
+        return contextlib.nullcontext(Span(0, None, phase, agent, model))
+    return tracer.span(phase, agent, model)
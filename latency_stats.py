@@ -0,0 +1,28 @@
+"""
+Small latency statistics helpers shared by benchmarks, diagnostics and instrumentation.
+"""
+
+import math
+import statistics
+
+def percentile(values, pct):
+    """Nearest-rank percentile (pct in 0-100) of a list of numbers, or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(values):
+    """min/median/mean/p95/p99/max of a list of latencies"""
+    if not values:
+        return {"count": 0, "min": None, "p50": None, "mean": None, "p95": None, "p99": None, "max": None}
+    return {
+        "count": len(values),
+        "min": min(values),
+        "p50": statistics.median(values),
+        "mean": statistics.fmean(values),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
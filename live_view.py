@@ -0,0 +1,69 @@
+"""
+Live side-by-side terminal view for streamed agent responses.
+Renders one column per agent, showing the tail of each agent's text as it arrives.
+"""
+
+import shutil
+import textwrap
+
+MIN_COLUMN_WIDTH = 28
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+STATUS_EMOJI = {
+    "pending": "⏳",
+    "streaming": "✍️",
+    "success": "✅",
+    "error": "❌",
+    "timeout": "⏱️",
+    "cancelled": "🚫",
+    "skipped": "⚡",
+}
+
+def format_stream_header(state):
+    """Build the one-line header for an agent column"""
+    emoji = STATUS_EMOJI.get(state['status'], "•")
+    ttft = f"{state['ttft']:.2f}s" if state['ttft'] is not None else "--"
+    return f"{emoji} {state['agent']} ({state['model']}) ttft {ttft}"
+
+def render_columns(states, width=None, height=None):
+    """Render agent stream states as a grid of side-by-side columns"""
+    terminal = shutil.get_terminal_size((120, 40))
+    width = width or terminal.columns
+    height = height or terminal.lines
+
+    per_row = max(1, min(len(states), width // MIN_COLUMN_WIDTH))
+    column_width = width // per_row
+    text_width = column_width - 2
+    row_count = -(-len(states) // per_row)
+    body_lines = max(3, (height - 2) // row_count - 2)
+
+    lines = []
+    for row_start in range(0, len(states), per_row):
+        row = states[row_start:row_start + per_row]
+        columns = []
+        for state in row:
+            wrapped = []
+            for paragraph in state['text'].splitlines() or [""]:
+                wrapped.extend(textwrap.wrap(paragraph, text_width) or [""])
+            body = wrapped[-body_lines:]
+            body += [""] * (body_lines - len(body))
+            header = format_stream_header(state)[:text_width]
+            columns.append([header, "-" * text_width] + body)
+        for line_parts in zip(*columns):
+            lines.append("".join(part.ljust(column_width) for part in line_parts).rstrip())
+    return "\n".join(lines)
+
+def draw(states):
+    """Redraw the live view in place"""
+    print(CLEAR_SCREEN + render_columns(states), end="", flush=True)
+
+def format_stream_timings(results):
+    """Format time-to-first-token and total time for each streamed agent"""
+    output = "⏱️  STREAM TIMINGS\n"
+    output += "-" * 60 + "\n"
+    output += f"{'AGENT':<24}{'MODEL':<20}{'TTFT':>8}{'TOTAL':>8}\n"
+    for result in results:
+        ttft = f"{result['ttft']:.2f}s" if result.get('ttft') is not None else "--"
+        total = f"{result['total_time']:.2f}s" if result.get('total_time') is not None else "--"
+        output += f"{result['agent']:<24}{result['model']:<20}{ttft:>8}{total:>8}\n"
+    return output
@@ -1,6 +1,135 @@
-def main():
-    print("Hello from foundryqs!")
+"""
+foundryqs command line entry point.
+Subcommands hand off to the feature scripts, which are only loaded (together with the
+Azure and OpenAI SDKs) when the subcommand runs, so --help and local-only commands
+start quickly.
+"""
 
+import os
+import sys
+import argparse
+
+from conversation_pool import CALL_MODES
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Subcommands that forward their remaining arguments to a script: command -> (script or {subcommand: script}, help)
+FORWARDED = {
+    "coordinate": ("agent-coordinator.py", "run the multi-agent coordinator (see agent-coordinator.py --help)"),
+    "diagnose": ("diagnostic-tool.py", "check the project setup, agents and connectivity"),
+    "workflow": (
+        {"local": "workflow-local.py", "validate": "workflow-validate.py", "deploy": "workflow-visual-fixed.py"},
+        "run a workflow locally, validate workflow YAML offline, or deploy the visual workflow",
+    ),
+    "bench": (
+        {"orchestration": "bench-orchestration.py", "startup": "bench-startup.py"},
+        "benchmark orchestration against a fake client, or CLI/credential cold start",
+    ),
+}
+
+def run_script(script, args):
+    """Run a project script as __main__ with the given arguments"""
+    import runpy
+
+    sys.argv = [script, *args]
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    try:
+        runpy.run_path(os.path.join(ROOT, script), run_name="__main__")
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
+def cmd_provision(args):
+    """Provision agents from agents.toml concurrently (unchanged definitions are skipped)"""
+    import time
+    import agent_registry
+
+    try:
+        specs = agent_registry.select(args.agents, args.group)
+    except agent_registry.RegistryError as e:
+        print(f"❌ {e}")
+        return 1
+    if not specs:
+        print("⚠️  No agents selected")
+        return 1
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    import foundry_clients
+
+    print(f"🚀 Provisioning {len(specs)} agents ({args.concurrency} at a time)")
+    started = time.perf_counter()
+    results = agent_registry.provision_all(
+        foundry_clients.get_project_client(),
+        specs,
+        max_workers=args.concurrency,
+        on_result=lambda result: print(agent_registry.format_provision_result(result), flush=True),
+    )
+    print(agent_registry.format_provision_summary(results, time.perf_counter() - started))
+    return 1 if any(result.error for result in results) else 0
+
+def cmd_run(args):
+    """Send one prompt to one agent and print the answer"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    import foundry_clients
+    import response_cache
+    import conversation_pool
+
+    if args.cache:
+        response_cache.enable_response_cache()
+    output_text, cached = response_cache.cached_agent_response(
+        foundry_clients.get_openai_client(), args.agent, args.prompt, foundry_clients.get_project_client(),
+        call_mode=args.call_mode,
+    )
+    print(output_text)
+    if cached:
+        print("💾 (cached)", file=sys.stderr)
+    conversation_pool.close_pools()
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="foundryqs", description="Azure AI Foundry multi-agent quickstart")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    provision = commands.add_parser("provision", help="create or update the agents in agents.toml")
+    provision.add_argument("agents", nargs="*", metavar="AGENT", help="agents to provision (default: all)")
+    provision.add_argument("--group", help="only agents in this group (e.g. storytelling, visual-workflow)")
+    provision.add_argument("--concurrency", type=int, default=int(os.environ.get("PROVISION_CONCURRENCY", "8")),
+                           help="agents provisioned at once")
+    provision.set_defaults(handler=cmd_provision)
+
+    run = commands.add_parser("run", help="send one prompt to an agent")
+    run.add_argument("agent", help="agent (or workflow) name")
+    run.add_argument("prompt", help="prompt text")
+    run.add_argument("--cache", action="store_true", help="reuse a cached answer for the same prompt")
+    run.add_argument("--call-mode", choices=CALL_MODES, help="see AGENT_CALL_MODE")
+    run.set_defaults(handler=cmd_run)
+
+    # Forwarded commands parse their own options, so they don't get an -h of their own here
+    for name, (target, description) in FORWARDED.items():
+        forwarded = commands.add_parser(name, help=description, add_help=False)
+        if isinstance(target, dict):
+            forwarded.add_argument("target", choices=list(target), help=description)
+        forwarded.set_defaults(script=target)
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 0
+    if args.command in FORWARDED:
+        script = args.script[args.target] if isinstance(args.script, dict) else args.script
+        return run_script(script, extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.handler(args)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Quorum (racing) fan-out: stop waiting once K agents have answered.
+Results are taken as they complete. Once QUORUM_SIZE calls have succeeded, the calls
+still running are either cancelled (their streams are closed, which cancels them
+server-side) or, with QUORUM_LEFTOVERS=finish, left to finish in the background so
+their answers land in the response cache for the next run.
+"""
+
+import os
+import time
+import asyncio
+import contextlib
+
+import deadlines
+
+QUORUM_SIZE = int(os.environ.get("QUORUM_SIZE", "0"))  # 0 waits for every agent
+QUORUM_LEFTOVERS = os.environ.get("QUORUM_LEFTOVERS", "cancel")  # cancel | finish
+LEFTOVER_MODES = ("cancel", "finish")
+
+# Calls left running after a quorum; awaited by drain() before the event loop closes
+background = set()
+
+async def as_completed(agents, calls, deadline):
+    """Yield (agent_info, task) for each call as it finishes, until all are done or the deadline passes"""
+    tasks = {asyncio.ensure_future(call): agent_info for agent_info, call in zip(agents, calls)}
+    pending = set(tasks)
+    started = time.perf_counter()
+    while pending:
+        remaining = deadline - (time.perf_counter() - started)
+        if remaining <= 0:
+            return
+        done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield tasks[task], task
+
+def not_needed(agent_info, quorum, elapsed, leftovers):
+    """Result dict for a call that was still running when the quorum was reached"""
+    if leftovers == "finish":
+        response = f"Still running when {quorum} answers had arrived after {elapsed:.1f}s; finishing in the background."
+    else:
+        response = f"Not needed: {quorum} answers had arrived after {elapsed:.1f}s, so the request was cancelled."
+    return {"agent": agent_info['name'], "model": agent_info['model'], "response": response, "status": "cancelled"}
+
+async def race(agents, calls, quorum, deadline, leftovers=None, on_result=None):
+    """Await the calls until `quorum` of them succeed (or all finish, or the deadline passes)
+
+    Returns the finished results in completion order, then a "cancelled" result for each
+    call dropped at the quorum and a timeout for each call still running at the deadline.
+    on_result(result, successes) is called as each result arrives.
+    """
+    leftovers = leftovers or QUORUM_LEFTOVERS
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    results = {}
+    successes = 0
+    async with contextlib.aclosing(as_completed(agents, tasks, deadline)) as completed:
+        async for agent_info, task in completed:
+            result = results[task] = deadlines.collect_results([agent_info], [task], deadline)[0]
+            successes += result['status'] == "success"
+            if on_result is not None:
+                on_result(result, successes)
+            if successes >= quorum:
+                break
+
+    reached = successes >= quorum
+    elapsed = time.perf_counter() - started
+    dropped = []
+    cancelled = []
+    for agent_info, task in zip(agents, tasks):
+        if task in results:
+            continue
+        if task.done() or not reached:
+            dropped.extend(deadlines.collect_results([agent_info], [task], deadline))
+            cancelled.append(task)
+        elif leftovers == "finish":
+            background.add(task)
+            task.add_done_callback(background.discard)
+            dropped.append(not_needed(agent_info, quorum, elapsed, leftovers))
+        else:
+            task.cancel(deadlines.NOT_NEEDED)
+            dropped.append(not_needed(agent_info, quorum, elapsed, leftovers))
+            cancelled.append(task)
+    # The dropped calls' streams are only closed once they have unwound
+    await deadlines.unwind(cancelled)
+    return list(results.values()) + dropped
+
+async def drain(timeout=None):
+    """Wait for calls left running in the background; returns how many finished successfully"""
+    if not background:
+        return 0
+    tasks = list(background)
+    done, pending = await asyncio.wait(tasks, timeout=timeout or deadlines.AGENT_TIMEOUT)
+    for task in pending:
+        task.cancel(deadlines.NOT_NEEDED)
+    await deadlines.unwind(pending)
+    return len([task for task in done if not task.cancelled() and task.exception() is None and task.result()['status'] == "success"])
@@ -0,0 +1,256 @@
+"""
+Opt-in persistent cache for agent responses.
+Entries are keyed by agent name, agent definition fingerprint and normalized input,
+kept in an in-memory LRU backed by a size-bounded SQLite file, and expire after a TTL.
+Re-provisioning an agent changes its fingerprint, which invalidates its old entries.
+"""
+
+import os
+import re
+import time
+import atexit
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from agent_provisioning import MANIFEST_PATH, load_manifest
+from conversation_pool import conversation_kwargs
+
+CACHE_PATH = os.environ.get("RESPONSE_CACHE_PATH", os.path.join(".foundry", "response-cache.sqlite"))
+DEFAULT_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", "86400"))
+DEFAULT_MEMORY_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MEMORY_ENTRIES", "256"))
+DEFAULT_DISK_BYTES = int(os.environ.get("RESPONSE_CACHE_DISK_BYTES", str(64 * 1024 * 1024)))
+ACCESS_FLUSH_BATCH = 64  # hits whose access time is written back to disk together
+
+def normalize_input(user_input):
+    """Collapse whitespace so trivially different prompts share an entry"""
+    return re.sub(r"\s+", " ", user_input).strip()
+
+def make_key(agent_name, fingerprint, user_input):
+    material = "\x1f".join([agent_name, fingerprint, normalize_input(user_input)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+_fingerprints = {}
+_manifest = (None, {})  # (mtime of the manifest file, its contents)
+
+def cached_manifest(path=MANIFEST_PATH):
+    """The provisioning manifest, parsed again only when the file changes (e.g. re-provisioning)"""
+    global _manifest
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime != _manifest[0]:
+        _manifest = (mtime, load_manifest(path) if mtime is not None else {})
+    return _manifest[1]
+
+def agent_fingerprint(agent_name, project_client=None):
+    """Identify the current definition of an agent, or None if it can't be determined
+
+    Uses the provisioning manifest first, then (once per process) the latest server version.
+    """
+    entry = cached_manifest().get(os.environ.get("PROJECT_ENDPOINT", ""), {}).get(agent_name)
+    if entry:
+        return entry["definition_hash"]
+    if project_client is None:
+        return None
+    if agent_name not in _fingerprints:
+        try:
+            latest = project_client.agents.get(agent_name).versions.latest
+            _fingerprints[agent_name] = (latest.metadata or {}).get("definition_hash") or f"version:{latest.id}"
+        except Exception:
+            _fingerprints[agent_name] = None
+    return _fingerprints[agent_name]
+
+class ResponseCache:
+    """Two-tier (memory + disk) LRU cache with TTL and hit/miss statistics"""
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_memory_entries=DEFAULT_MEMORY_ENTRIES, max_disk_bytes=DEFAULT_DISK_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.accessed = {}  # key -> access time not yet written to disk
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "evictions": 0, "invalidated": 0}
+        self.purged_agents = set()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, agent TEXT, fingerprint TEXT, response TEXT,"
+            " size INTEGER, created_at REAL, accessed_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_agent ON responses (agent)")
+        self.db.commit()
+
+    def lookup(self, agent_name, fingerprint, user_input):
+        """Return the cached response text, or None on a miss"""
+        key = make_key(agent_name, fingerprint or "", user_input)
+        now = time.time()
+        with self.lock:
+            if fingerprint is None:
+                self.stats["bypassed"] += 1
+                return None
+            self.purge_stale_definitions(agent_name, fingerprint)
+
+            entry = self.memory.get(key)
+            if entry and now - entry[1] <= self.ttl:
+                self.memory.move_to_end(key)
+                self.touch(key, now)
+                self.stats["memory_hits"] += 1
+                return entry[0]
+
+            row = self.db.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl:
+                self.touch(key, now)
+                self.remember(key, row[0], row[1])
+                self.stats["disk_hits"] += 1
+                return row[0]
+            if row:
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.db.commit()
+            self.memory.pop(key, None)
+            self.stats["misses"] += 1
+            return None
+
+    def store(self, agent_name, fingerprint, user_input, response_text):
+        """Cache a successful response"""
+        if fingerprint is None:
+            return
+        key = make_key(agent_name, fingerprint, user_input)
+        now = time.time()
+        size = len(response_text.encode("utf-8"))
+        with self.lock:
+            self.remember(key, response_text, now)
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, agent_name, fingerprint, response_text, size, now, now),
+            )
+            self.enforce_disk_limit()
+            self.db.commit()
+            self.stats["stores"] += 1
+
+    def touch(self, key, now):
+        """Note a hit's access time; they reach disk in batches rather than one commit per hit"""
+        self.accessed[key] = now
+        if len(self.accessed) >= ACCESS_FLUSH_BATCH:
+            self.flush_accessed()
+            self.db.commit()
+
+    def flush_accessed(self):
+        """Write pending access times (the caller commits)"""
+        if self.accessed:
+            self.db.executemany("UPDATE responses SET accessed_at = ? WHERE key = ?", [(at, key) for key, at in self.accessed.items()])
+            self.accessed.clear()
+
+    def close(self):
+        """Write pending access times and close the database"""
+        with self.lock:
+            if self.db is None:
+                return
+            self.flush_accessed()
+            self.db.commit()
+            self.db.close()
+            self.db = None
+
+    def remember(self, key, response_text, created_at):
+        self.memory[key] = (response_text, created_at)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def enforce_disk_limit(self):
+        """Evict least recently used rows until the disk tier fits its byte budget"""
+        self.flush_accessed()  # so recently hit rows aren't taken for the least recently used
+        self.db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while total > self.max_disk_bytes:
+            row = self.db.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            self.db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self.memory.pop(row[0], None)
+            self.stats["evictions"] += 1
+            total -= row[1]
+
+    def purge_stale_definitions(self, agent_name, fingerprint):
+        """Drop entries written for an older definition of this agent (once per agent per process)"""
+        if (agent_name, fingerprint) in self.purged_agents:
+            return
+        self.purged_agents.add((agent_name, fingerprint))
+        stale = [row[0] for row in self.db.execute(
+            "SELECT key FROM responses WHERE agent = ? AND fingerprint != ?", (agent_name, fingerprint)
+        )]
+        if stale:
+            self.db.execute("DELETE FROM responses WHERE agent = ? AND fingerprint != ?", (agent_name, fingerprint))
+            self.db.commit()
+            for key in stale:
+                self.memory.pop(key, None)
+            self.stats["invalidated"] += len(stale)
+
+    def invalidate_agent(self, agent_name):
+        """Drop every cached response for an agent"""
+        with self.lock:
+            keys = [row[0] for row in self.db.execute("SELECT key FROM responses WHERE agent = ?", (agent_name,))]
+            self.db.execute("DELETE FROM responses WHERE agent = ?", (agent_name,))
+            self.db.commit()
+            for key in keys:
+                self.memory.pop(key, None)
+            self.stats["invalidated"] += len(keys)
+
+    def format_stats(self):
+        """One-line hit/miss summary"""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        rate = f"{hits / lookups:.0%}" if lookups else "n/a"
+        return (
+            f"💾 Response cache: {hits}/{lookups} hits ({rate}; memory {self.stats['memory_hits']}, disk {self.stats['disk_hits']}), "
+            f"{self.stats['stores']} stored, {self.stats['evictions']} evicted, "
+            f"{self.stats['invalidated']} invalidated, {self.stats['bypassed']} bypassed"
+        )
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def enable_response_cache():
+    """Turn on the process-wide cache (e.g. from a --cache flag)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+            atexit.register(_cache.close)
+    return _cache
+
+def get_response_cache():
+    """Process-wide cache instance, or None unless enabled (RESPONSE_CACHE=1 or enable_response_cache())"""
+    if _cache is None and os.environ.get("RESPONSE_CACHE", "0") == "1":
+        enable_response_cache()
+    return _cache
+
+def cached_agent_response(openai_client, agent_name, user_input, project_client=None, call_mode=None):
+    """Single-shot agent call through the cache (when enabled); returns (output_text, was_cached)
+
+    call_mode overrides AGENT_CALL_MODE (see conversation_pool), e.g. "conversation" for workflows.
+    """
+    cache = get_response_cache()
+    fingerprint = None
+    if cache is not None:
+        fingerprint = agent_fingerprint(agent_name, project_client)
+        cached = cache.lookup(agent_name, fingerprint, user_input)
+        if cached is not None:
+            return cached, True
+
+    response = openai_client.responses.create(
+        **conversation_kwargs(openai_client, call_mode),
+        extra_body={"agent": {"name": agent_name, "type": "agent_reference"}},
+        input=user_input,
+    )
+    if cache is not None:
+        cache.store(agent_name, fingerprint, user_input, response.output_text)
+    return response.output_text, False
@@ -0,0 +1,82 @@
+"""
+Request coalescing (single-flight) for identical concurrent agent calls.
+Calls are keyed by agent name and normalized input. A call whose key is already in
+flight waits for that call instead of sending its own `responses.create`, and every
+waiter gets a copy of the shared result (or the same exception). When all waiters stop
+waiting, the shared call is cancelled as well. Nothing is kept once the call finishes;
+repeat calls that arrive later are a job for the response cache.
+"""
+
+import os
+import asyncio
+
+from response_cache import normalize_input
+
+ENABLED = os.environ.get("SINGLE_FLIGHT", "1") != "0"
+
+def flight_key(agent_name, user_input):
+    return agent_name, normalize_input(user_input)
+
+class Flight:
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Shares one in-flight asyncio call among concurrent callers with the same key"""
+
+    def __init__(self):
+        self.flights = {}  # key -> Flight
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    async def do(self, key, call):
+        """Await call() for this key, or join the identical call already in flight"""
+        flight = self.flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.stats["coalesced"] += 1
+        else:
+            flight = self.flights[key] = Flight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(lambda task: self.finish(key, flight))
+            self.stats["calls"] += 1
+
+        flight.waiters += 1
+        try:
+            # shield: one waiter giving up (its deadline, a quorum) mustn't cancel the call for the others
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError as error:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody wants the answer any more; a new caller must not join a call being cancelled
+                self.flights.pop(key, None)
+                flight.task.cancel(*error.args[:1])
+                # Let the shared call close its stream before this waiter's caller moves on
+                await asyncio.wait({flight.task})
+            raise
+        flight.waiters -= 1
+        # Each waiter gets its own copy, so one caller editing its result can't change the others'
+        result = dict(result)
+        if shared:
+            result["coalesced"] = True
+        return result
+
+    def finish(self, key, flight):
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # retrieved here in case every waiter was cancelled
+
+    def format_stats(self):
+        total = self.stats["calls"] + self.stats["coalesced"]
+        return f"🧲 Coalesced: {self.stats['coalesced']} of {total} calls shared an identical request already in flight"
+
+_single_flight = None
+
+def get_single_flight():
+    """The process-wide coalescing layer; None when disabled (SINGLE_FLIGHT=0)"""
+    global _single_flight
+    if not ENABLED:
+        return None
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
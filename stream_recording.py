@@ -0,0 +1,183 @@
+"""
+Record and replay Responses API event streams.
+RecordingStream wraps a live `responses.create(stream=True)` stream and writes every
+event to a gzipped JSON-lines file with its offset from the start of the stream.
+ReplayClient serves such a recording back through the same client calls the workflow
+scripts make, at the original pace or as fast as possible, so the stream consumers can be
+run, profiled and benchmarked offline without paying for a live workflow.
+"""
+
+import os
+import gzip
+import json
+import time
+from types import SimpleNamespace
+
+RECORD_STREAMS = os.environ.get("RECORD_STREAMS", "0") == "1"
+RECORDINGS_DIR = os.environ.get("RECORDINGS_DIR", os.path.join(".foundry", "recordings"))
+FORMAT_VERSION = 1
+
+def to_jsonable(value):
+    """Plain JSON data for an SDK event (pydantic model, SimpleNamespace, enum, ...)"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, SimpleNamespace):
+        value = vars(value)
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value.value if hasattr(value, "value") else value
+    return str(value)
+
+def to_event(data):
+    """Attribute-access view of recorded JSON, so consumers can read event.item.action_id as usual"""
+    if isinstance(data, dict):
+        return SimpleNamespace(**{key: to_event(item) for key, item in data.items()})
+    if isinstance(data, list):
+        return [to_event(item) for item in data]
+    return data
+
+def open_recording(path, mode):
+    return gzip.open(path, mode + "t", encoding="utf-8") if path.endswith(".gz") else open(path, mode, encoding="utf-8")
+
+class RecordingStream:
+    """Passes a stream's events through unchanged while appending them to `path`"""
+
+    def __init__(self, stream, path, request=None, clock=time.perf_counter):
+        self.stream = stream
+        self.path = path
+        self.clock = clock
+        self.started = clock()
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open_recording(path, "w")
+        header = {"format": "responses-stream", "version": FORMAT_VERSION, "recorded_at": time.time(), "request": request or {}}
+        self.file.write(json.dumps(header) + "\n")
+
+    def __iter__(self):
+        try:
+            for event in self.stream:
+                offset = self.clock() - self.started
+                self.file.write(json.dumps([round(offset, 6), to_jsonable(event)], separators=(",", ":")) + "\n")
+                self.count += 1
+                yield event
+        finally:
+            self.close()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+        close = getattr(self.stream, "close", None)
+        if close is not None:
+            close()
+
+def record(stream, name, request=None, directory=RECORDINGS_DIR):
+    """Wrap stream in a RecordingStream when RECORD_STREAMS=1, else return it unchanged"""
+    if not RECORD_STREAMS:
+        return stream
+    path = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.jsonl.gz")
+    print(f"🎙️  Recording stream to {path}")
+    return RecordingStream(stream, path, request)
+
+def load_recording(path):
+    """(header, [(offset, event), ...]) with events already converted for attribute access"""
+    with open_recording(path, "r") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != "responses-stream":
+            raise ValueError(f"{path} is not a recorded Responses stream")
+        events = [(offset, to_event(data)) for offset, data in map(json.loads, f)]
+    return header, events
+
+def write_recording(path, events, request=None):
+    """Save (offset, event) pairs in the recording format (e.g. synthetic or scaled streams)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open_recording(path, "w") as f:
+        f.write(json.dumps({"format": "responses-stream", "version": FORMAT_VERSION, "recorded_at": time.time(), "request": request or {}}) + "\n")
+        for offset, event in events:
+            f.write(json.dumps([round(offset, 6), to_jsonable(event)], separators=(",", ":")) + "\n")
+
+def repeated(events, times):
+    """The recording played `times` times back to back, as one longer stream
+
+    Only the first response.created and the last response.completed are kept, sequence
+    numbers keep increasing and action ids get a #n suffix per copy, so the copies read
+    as distinct actions rather than the same ones finishing again.
+    """
+    if times <= 1:
+        return events
+    duration = events[-1][0] if events else 0.0
+    result = []
+    for copy in range(times):
+        for offset, event in events:
+            if (event.type == "response.created" and copy) or (event.type == "response.completed" and copy < times - 1):
+                continue
+            data = to_jsonable(event)
+            if "sequence_number" in data:
+                data["sequence_number"] += copy * len(events)
+            item = data.get("item")
+            if isinstance(item, dict) and copy:
+                for key in ("action_id", "previous_action_id", "parent_action_id"):
+                    if item.get(key):
+                        item[key] = f"{item[key]}#{copy}"
+            result.append((offset + copy * duration, to_event(data)))
+    return result
+
+class ReplayStream:
+    """Iterates recorded events, sleeping to match their offsets / speed (speed 0: no waiting)"""
+
+    def __init__(self, events, speed=1.0, clock=time.perf_counter):
+        self.events = events
+        self.speed = speed
+        self.clock = clock
+        self.closed = False
+        self.delivered = 0
+
+    def __iter__(self):
+        started = self.clock()
+        for offset, event in self.events:
+            if self.closed:
+                return
+            if self.speed:
+                delay = offset / self.speed - (self.clock() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            self.delivered += 1
+            yield event
+
+    def close(self):
+        self.closed = True
+
+class ReplayResponses:
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, stream=False, **kwargs):
+        self.client.requests.append(kwargs)
+        if stream:
+            return ReplayStream(self.client.events, self.client.speed)
+        completed = [event for _, event in self.client.events if event.type == "response.completed"]
+        if not completed:
+            raise RuntimeError("recording has no response.completed event")
+        return completed[-1].response
+
+class ReplayConversations:
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, **kwargs):
+        return SimpleNamespace(id="conv_replay")
+
+    def delete(self, conversation_id=None, **kwargs):
+        return SimpleNamespace(id=conversation_id, deleted=True)
+
+class ReplayClient:
+    """Stand-in for the OpenAI client that answers every responses.create with the recording"""
+
+    def __init__(self, events, speed=1.0):
+        self.events = events
+        self.speed = speed
+        self.requests = []
+        self.conversations = ReplayConversations(self)
+        self.responses = ReplayResponses(self)
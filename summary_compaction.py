@@ -0,0 +1,148 @@
+"""
+Token-budgeted input for the coordinator's summary call.
+Instead of the side-by-side display text (separators, emoji headers and every answer in
+full), the coordinator gets a plain list of the successful answers with markdown stripped.
+Answers are shortened to fit SUMMARY_TOKEN_BUDGET (off unless set), and failed or skipped agents are
+listed by name only. Each answer gets a fair share of the budget: short answers are kept
+whole and the rest is split between the long ones. A long answer keeps its opening and its
+ending, which are the parts a summary needs most.
+"""
+
+import os
+import re
+
+SUMMARY_TOKEN_BUDGET = int(os.environ.get("SUMMARY_TOKEN_BUDGET", "0"))  # 0 (default) sends the full display text
+MIN_ANSWER_TOKENS = 64  # below this an answer isn't worth including in part, unless the budget allows no more
+HEAD_SHARE = 0.7  # share of a shortened answer kept from its beginning; the rest comes from its end
+ELISION = " […] "
+
+_encoding = None
+
+def count_tokens(text):
+    """Token count with tiktoken when it is installed, else about 4 characters per token"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except (ImportError, ValueError):
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+MARKDOWN_PATTERNS = [
+    (re.compile(r"^\s*([-=*_~]\s*){3,}$", re.MULTILINE), ""),  # horizontal rules / separators
+    (re.compile(r"^\s{0,3}#{1,6}\s*", re.MULTILINE), ""),  # headings
+    (re.compile(r"(\*\*|__|\*|`)"), ""),  # emphasis and code markers
+    (re.compile(r"\[([^\]]*)\]\([^)]*\)"), r"\1"),  # links -> their text
+    (re.compile(r"[ \t]+"), " "),
+    (re.compile(r"\n\s*\n+"), "\n"),  # blank lines
+]
+
+def strip_formatting(text):
+    """Plain text: markdown markers, separators and blank lines removed"""
+    for pattern, replacement in MARKDOWN_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+def shorten(text, tokens):
+    """text cut to about `tokens`: its first sentences and its last ones, joined by an elision mark"""
+    if count_tokens(text) <= tokens:
+        return text
+    sentences = SENTENCE_END.split(text)
+    head_budget = tokens * HEAD_SHARE
+    head, tail = [], []
+    used = 0
+    for sentence in sentences:
+        cost = count_tokens(sentence) + 1
+        if used + cost > head_budget:
+            break
+        head.append(sentence)
+        used += cost
+    for sentence in reversed(sentences[len(head):]):
+        cost = count_tokens(sentence) + 1
+        if used + cost > tokens:
+            break
+        tail.insert(0, sentence)
+        used += cost
+    if not head:
+        # One very long sentence (or no punctuation): cut by characters instead
+        return text[:int(tokens * 4 * HEAD_SHARE)].rstrip() + ELISION.rstrip()
+    return " ".join(head) + (ELISION + " ".join(tail) if tail else ELISION.rstrip())
+
+def allocate(sizes, budget):
+    """Fair (max-min) split of budget tokens: answers that fit get their size, the rest share the remainder"""
+    shares = {}
+    remaining = budget
+    pending = sorted(sizes, key=sizes.get)
+    while pending:
+        fair = remaining / len(pending)
+        name = pending[0]
+        if sizes[name] > fair:
+            for name in pending:
+                shares[name] = int(fair)
+            break
+        shares[name] = sizes[name]
+        remaining -= sizes[name]
+        pending.pop(0)
+    return shares
+
+def build_summary_input(user_input, results, budget=None, original=None):
+    """(coordinator input, stats) for the agent results, within about `budget` tokens (default SUMMARY_TOKEN_BUDGET)
+
+    original: the uncompacted input, to report tokens saved against.
+    """
+    budget = SUMMARY_TOKEN_BUDGET if budget is None else budget
+    answered = [result for result in results if result['status'] == "success"]
+    missing = [result for result in results if result['status'] != "success"]
+
+    header = f"Summarize this multi-agent coordination result.\nPrompt: {user_input}\n"
+    footer = ""
+    if missing:
+        footer = "Not answered: " + ", ".join(f"{result['agent']} ({result['status']})" for result in missing) + "\n"
+    labels = {result['agent']: f"\n[{result['agent']} | {result['model']}]\n" for result in answered}
+    texts = {result['agent']: strip_formatting(result['response']) for result in answered}
+
+    overhead = count_tokens(header) + count_tokens(footer) + sum(count_tokens(label) for label in labels.values())
+    sizes = {name: count_tokens(text) for name, text in texts.items()}
+    available = max(0, budget - overhead)
+    shares = allocate(sizes, available)
+    # Never raise an answer above its even share of the budget, or the total would overshoot it
+    minimum = min(MIN_ANSWER_TOKENS, available // max(1, len(texts)))
+
+    shortened = []
+    body = ""
+    for name, text in texts.items():
+        share = shares[name]
+        if share < sizes[name]:
+            shortened.append(name)
+            text = shorten(text, max(share, minimum))
+        body += labels[name] + text + "\n"
+    compacted = header + body + footer
+
+    original_tokens = count_tokens(original) if original is not None else None
+    compacted_tokens = count_tokens(compacted)
+    stats = {
+        "budget": budget,
+        "original_tokens": original_tokens,
+        "tokens": compacted_tokens,
+        "saved_tokens": (original_tokens - compacted_tokens) if original_tokens is not None else None,
+        "shortened": shortened,
+        "omitted": [result['agent'] for result in missing],
+    }
+    return compacted, stats
+
+def format_stats(stats):
+    """One line: tokens before and after compaction, and what was shortened or left out"""
+    line = f"🗜️  Summary input: {stats['tokens']:,} tokens (budget {stats['budget']:,})"
+    if stats["original_tokens"]:
+        saved = stats["saved_tokens"]
+        line += f", was {stats['original_tokens']:,}: saved {saved:,} ({saved / stats['original_tokens']:.0%})"
+    if stats["shortened"]:
+        line += f", shortened {', '.join(stats['shortened'])}"
+    if stats["omitted"]:
+        line += f", left out {', '.join(stats['omitted'])}"
+    return line
@@ -1,17 +1,16 @@
 import os
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
+
+import response_cache
+import conversation_pool
+import foundry_clients
 
 load_dotenv()
 
-project_client = AIProjectClient(
-    endpoint=os.environ["PROJECT_ENDPOINT"],
-    credential=DefaultAzureCredential(),
-)
+project_client = foundry_clients.get_project_client()
 
 # Let's test the existing workflow by triggering it
-openai_client = project_client.get_openai_client()
+openai_client = foundry_clients.get_openai_client()
 
 # Test the visual workflow that's already created
 print("Testing the existing visual workflow...")
@@ -24,16 +23,14 @@ individual_agents = ["agent-deepseek", "agent-gpt", "agent-mistral"]
 
 for agent_name in individual_agents:
     try:
-        conversation = openai_client.conversations.create()
         print(f"Testing {agent_name}...")
         
-        response = openai_client.responses.create(
-            conversation=conversation.id,
-            extra_body={"agent": {"name": agent_name, "type": "agent_reference"}},
-            input="Quick test - tell a short story about a cat"
+        # Goes through the response cache when RESPONSE_CACHE=1
+        output_text, cached = response_cache.cached_agent_response(
+            openai_client, agent_name, "Quick test - tell a short story about a cat", project_client
         )
         
-        print(f"✅ {agent_name} works: {response.output_text[:100]}...")
+        print(f"✅ {agent_name} works{' (cached)' if cached else ''}: {output_text[:100]}...")
         
     except Exception as e:
         print(f"❌ {agent_name} failed: {e}")
@@ -41,19 +38,19 @@ for agent_name in individual_agents:
 print("\nNow testing the workflow...")
 
 try:
-    # Create fresh conversation  
-    conversation = openai_client.conversations.create()
-    print(f"Created conversation: {conversation.id}")
-    
-    # The workflow name from the portal screenshot
-    response = openai_client.responses.create(
-        conversation=conversation.id,
-        extra_body={"agent": {"name": "visual-multi-agent-storytelling-workflow", "type": "agent_reference"}},
-        input="Tell me a story about a robot who learns to paint"
+    # The workflow name from the portal screenshot; workflows keep state in a conversation
+    output_text, cached = response_cache.cached_agent_response(
+        openai_client, "visual-multi-agent-storytelling-workflow", "Tell me a story about a robot who learns to paint", project_client,
+        call_mode="conversation",
     )
     
-    print("✅ Workflow executed successfully!")
-    print("Response:", response.output_text)
+    print(f"✅ Workflow executed successfully!{' (cached)' if cached else ''}")
+    print("Response:", output_text)
     
 except Exception as e:
-    print(f"❌ Workflow execution failed: {e}")
\ No newline at end of file
+    print(f"❌ Workflow execution failed: {e}")
+
+conversation_pool.close_pools()
+cache = response_cache.get_response_cache()
+if cache is not None:
+    print(cache.format_stats())
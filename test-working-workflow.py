@@ -1,16 +1,12 @@
 import os
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
+import foundry_clients
 
 load_dotenv()
 
-project_client = AIProjectClient(
-    endpoint=os.environ["PROJECT_ENDPOINT"],
-    credential=DefaultAzureCredential(),
-)
+project_client = foundry_clients.get_project_client()
 
-openai_client = project_client.get_openai_client()
+openai_client = foundry_clients.get_openai_client()
 
 print("🚀 Testing the working workflow: working-multi-agent-workflow-v2")
 
@@ -0,0 +1,89 @@
+import os
+import sys
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import adaptive_concurrency
+from adaptive_concurrency import AdaptiveLimit
+
+class AdaptiveLimitTest(unittest.TestCase):
+    def test_success_adds_one_over_the_limit(self):
+        limit = AdaptiveLimit("m", 4, adaptive=True)
+        for _ in range(4):
+            limit.observe(0.1, "success")
+        self.assertEqual(limit.current, 4)  # 1/4 + 1/4.25 + ... falls just short of one round
+        limit.observe(0.1, "success")
+        self.assertEqual(limit.current, 5)
+        self.assertEqual(limit.stats["peak"], 5)
+
+    def test_limit_is_capped_at_the_ceiling(self):
+        limit = AdaptiveLimit("m", 2, adaptive=True, max_limit=3)
+        for _ in range(50):
+            limit.observe(0.1, "success")
+        self.assertEqual(limit.limit, 3)
+
+    def test_timeout_and_throttling_halve_the_limit_once_per_round(self):
+        limit = AdaptiveLimit("m", 8, adaptive=True)
+        limit.in_flight = 3
+        limit.observe(1.0, "timeout")
+        self.assertEqual(limit.current, 4)
+        # Calls sent under the old limit don't cut it again
+        limit.observe(1.0, "error", throttled_total=1)
+        self.assertEqual(limit.current, 4)
+        limit.in_flight = 0
+        limit.draining = 0
+        limit.observe(1.0, "error", throttled_total=2)
+        self.assertEqual(limit.current, 2)
+        self.assertEqual(limit.stats["decreases"], 2)
+
+    def test_limit_never_drops_below_the_minimum(self):
+        limit = AdaptiveLimit("m", 2, adaptive=True, min_limit=2)
+        limit.observe(1.0, "timeout")
+        self.assertEqual(limit.current, 2)
+
+    def test_cancelled_calls_and_fixed_limits_are_left_alone(self):
+        limit = AdaptiveLimit("m", 4, adaptive=True)
+        limit.observe(1.0, "cancelled")
+        fixed = AdaptiveLimit("m", 4, adaptive=False)
+        fixed.observe(1.0, "timeout")
+        self.assertEqual((limit.current, fixed.current), (4, 4))
+
+    def test_slow_calls_after_warmup_cut_the_limit(self):
+        limit = AdaptiveLimit("m", 8, adaptive=True, max_limit=8)
+        for _ in range(adaptive_concurrency.WARMUP_CALLS + 1):
+            limit.observe(0.1, "success")
+        for _ in range(10):
+            limit.observe(1.0, "success")
+        self.assertLess(limit.current, 8)
+
+    def test_acquire_waits_for_a_free_slot(self):
+        async def run():
+            limit = AdaptiveLimit("m", 1, adaptive=False)
+            await limit.acquire()
+            waiter = asyncio.ensure_future(limit.acquire())
+            await asyncio.sleep(0)
+            blocked = not waiter.done()
+            limit.release()
+            await asyncio.wait_for(waiter, 1)
+            return blocked, limit.in_flight
+
+        self.assertEqual(asyncio.run(run()), (True, 1))
+
+    def test_cancelled_waiter_passes_its_slot_on(self):
+        async def run():
+            limit = AdaptiveLimit("m", 1, adaptive=False)
+            await limit.acquire()
+            first = asyncio.ensure_future(limit.acquire())
+            second = asyncio.ensure_future(limit.acquire())
+            await asyncio.sleep(0)
+            limit.release()  # wakes first...
+            first.cancel()  # ...which gives up before it runs
+            await asyncio.wait_for(second, 1)
+            return first.cancelled(), limit.in_flight
+
+        self.assertEqual(asyncio.run(run()), (True, 1))
+
+if __name__ == "__main__":
+    unittest.main()
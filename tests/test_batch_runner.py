@@ -0,0 +1,46 @@
+import os
+import sys
+import json
+import asyncio
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_runner
+
+AGENTS = [{"name": "agent-a", "model": "m"}]
+
+async def answer(agent_info, prompt):
+    return {"agent": agent_info['name'], "model": agent_info['model'], "status": "success", "response": f"🤖 {prompt}"}
+
+class ResumeAfterTornLineTest(unittest.TestCase):
+    """Resuming must survive a crash that cut the last output line, even inside a multibyte character"""
+
+    def resume(self, torn_tail):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "prompts.jsonl")
+            output_path = os.path.join(directory, "results.jsonl")
+            with open(input_path, "w", encoding="utf-8") as f:
+                f.write('{"id": "1", "prompt": "first"}\n{"id": "2", "prompt": "second"}\n')
+            done = {"id": "1", "agent": "agent-a", "model": "m", "status": "success", "response": "🤖 first"}
+            with open(output_path, "wb") as f:
+                f.write((json.dumps(done, ensure_ascii=False) + "\n").encode("utf-8") + torn_tail)
+
+            stats = asyncio.run(batch_runner.run_batch(input_path, output_path, AGENTS, answer, workers=2))
+
+            with open(output_path, "rb") as f:
+                lines = f.read().split(b"\n")
+            self.assertEqual(stats["skipped"], 1)
+            self.assertEqual(stats["success"], 1)
+            self.assertEqual(json.loads(lines[2].decode("utf-8"))["id"], "2")
+            self.assertEqual(batch_runner.completed_keys(output_path), {("1", "agent-a"), ("2", "agent-a")})
+
+    def test_line_torn_inside_ascii(self):
+        self.resume(b'{"id": "2", "agent": "agent-a", "sta')
+
+    def test_line_torn_inside_multibyte_character(self):
+        self.resume('{"id": "2", "agent": "agent-a", "response": "🤖'.encode("utf-8")[:-2])
+
+if __name__ == "__main__":
+    unittest.main()
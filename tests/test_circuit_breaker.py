@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import circuit_breaker
+
+AGENT = {"name": "agent-a", "model": "m"}
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "circuits.json")
+
+    def breaker(self, probe_interval=60):
+        return circuit_breaker.CircuitBreaker(path=self.path, window=4, min_calls=3, failure_rate=0.5, probe_interval=probe_interval)
+
+    def fail(self, breaker, times):
+        for _ in range(times):
+            self.assertTrue(breaker.allow("agent-a"))
+            breaker.record("agent-a", "m", "error")
+
+    def test_opens_after_enough_failures_and_skips_the_agent(self):
+        breaker = self.breaker()
+        self.fail(breaker, 2)
+        self.assertEqual(breaker.circuit("agent-a")["state"], "closed")
+        self.fail(breaker, 1)
+
+        self.assertEqual(breaker.circuit("agent-a")["state"], "open")
+        self.assertFalse(breaker.allow("agent-a"))
+        self.assertEqual(breaker.skipped_result(AGENT)["status"], "skipped")
+        self.assertEqual(breaker.stats["skipped"], 1)
+
+    def test_cancelled_calls_are_ignored(self):
+        breaker = self.breaker()
+        for _ in range(5):
+            breaker.record("agent-a", "m", "cancelled")
+        self.assertEqual(breaker.circuit("agent-a")["outcomes"], [])
+
+    def test_half_open_lets_one_probe_through_and_its_success_closes(self):
+        breaker = self.breaker(probe_interval=0)
+        self.fail(breaker, 3)
+
+        self.assertTrue(breaker.allow("agent-a"))
+        self.assertEqual(breaker.circuit("agent-a")["state"], "half_open")
+        self.assertFalse(breaker.allow("agent-a"))  # one probe at a time
+        breaker.record("agent-a", "m", "success")
+
+        self.assertEqual(breaker.circuit("agent-a")["state"], "closed")
+        self.assertEqual(breaker.circuit("agent-a")["outcomes"], [])
+
+    def test_failed_probe_opens_again(self):
+        breaker = self.breaker(probe_interval=0)
+        self.fail(breaker, 3)
+        self.assertTrue(breaker.allow("agent-a"))
+        breaker.record("agent-a", "m", "timeout")
+        self.assertEqual(breaker.circuit("agent-a")["state"], "open")
+
+    def test_state_is_remembered_across_runs(self):
+        self.fail(self.breaker(), 3)
+        self.assertEqual(self.breaker().circuit("agent-a")["state"], "open")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import credential_cache
+
+SCOPE = "https://ai.azure.com/.default"
+
+class CachedTokenCredentialTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "token-cache.json")
+
+    def write_token(self, expires_on):
+        credential_cache.save_cache(
+            {credential_cache.cache_scope(): {"tokens": {SCOPE: {"token": "cached", "expires_on": expires_on}}}},
+            self.path,
+        )
+
+    def test_valid_token_in_memory_skips_the_file(self):
+        self.write_token(time.time() + 3600)
+        credential = credential_cache.CachedTokenCredential(path=self.path)
+
+        with mock.patch.object(credential_cache, "load_cache", wraps=credential_cache.load_cache) as load:
+            tokens = [credential.get_token(SCOPE).token for _ in range(3)]
+
+        self.assertEqual(tokens, ["cached"] * 3)
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual((credential.stats["disk_hits"], credential.stats["memory_hits"]), (1, 2))
+
+    def test_token_near_expiry_is_acquired_again(self):
+        self.write_token(time.time() + 60)  # inside the refresh margin
+        credential = credential_cache.CachedTokenCredential(path=self.path, refresh_margin=300)
+        fresh = mock.Mock(token="fresh", expires_on=int(time.time()) + 3600)
+
+        with mock.patch.object(credential, "acquire", return_value=fresh) as acquire:
+            self.assertEqual(credential.get_token(SCOPE).token, "fresh")
+            self.assertEqual(credential.get_token(SCOPE).token, "fresh")
+
+        acquire.assert_called_once()
+        self.assertEqual(credential_cache.load_cache(self.path)[credential_cache.cache_scope()]["tokens"][SCOPE]["token"], "fresh")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deadlines
+
+AGENTS = [{"name": name, "model": "m"} for name in ("fast", "dropped", "interrupted", "slow")]
+
+async def answer():
+    return {"agent": "fast", "model": "m", "status": "success", "response": "done"}
+
+class CollectCancelledTasksTest(unittest.TestCase):
+    """A task that ended cancelled must not abort collecting the other results"""
+
+    def test_cancelled_tasks_are_reported(self):
+        async def collect():
+            tasks = [asyncio.ensure_future(call) for call in (answer(), asyncio.sleep(5), asyncio.sleep(5), asyncio.sleep(5))]
+            await asyncio.sleep(0)
+            tasks[1].cancel(deadlines.NOT_NEEDED)
+            tasks[2].cancel()
+            await asyncio.wait(tasks[:3])
+            return deadlines.collect_results(AGENTS, tasks, 2.0)
+
+        results = asyncio.run(collect())
+        self.assertEqual([result['status'] for result in results], ["success", "cancelled", "timeout", "timeout"])
+
+class GatherUnwindsCancelledCallsTest(unittest.TestCase):
+    """Calls cancelled at the overall deadline have unwound (closed their streams) by the time results return"""
+
+    def test_cancelled_calls_unwind_before_returning(self):
+        closed = []
+
+        async def stuck():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                closed.append(True)
+                raise
+
+        async def gather():
+            results = await deadlines.gather_with_deadline(AGENTS[:2], [answer(), stuck()], 0.05)
+            return results, list(closed)
+
+        results, closed_on_return = asyncio.run(gather())
+        self.assertEqual([result['status'] for result in results], ["success", "timeout"])
+        self.assertEqual(closed_on_return, [True])
+
+if __name__ == "__main__":
+    unittest.main()
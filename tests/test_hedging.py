@@ -0,0 +1,87 @@
+import os
+import sys
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deadlines import CancelToken
+from hedging import HedgePolicy, hedged_call
+from fake_foundry import FakeOpenAIClient, LatencyModel
+
+SLOW = {"name": "slow", "model": "m"}
+FAST = {"name": "fast", "model": "m"}
+
+def streaming_start(client):
+    """start() for hedged_call that streams a fake response on a worker thread"""
+
+    def stream_agent(agent_info, cancel):
+        stream = client.responses.create(input="hi", stream=True, extra_body={"agent": {"name": agent_info['name']}})
+        cancel.attach(stream)
+        for event in stream:
+            if event.type == "response.completed":
+                return {"agent": agent_info['name'], "model": agent_info['model'], "status": "success", "response": event.response.output_text}
+        return {"agent": agent_info['name'], "model": agent_info['model'], "status": "cancelled", "response": ""}
+
+    async def start(agent_info, cancel):
+        return await asyncio.get_running_loop().run_in_executor(None, stream_agent, agent_info, cancel)
+
+    return start
+
+class HedgedCallTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeOpenAIClient(
+            latency=LatencyModel(0.01, "fixed"),
+            per_agent_latency={"slow": LatencyModel(0.5, "fixed")},
+        )
+
+    def statuses(self):
+        return sorted((call[0], call[3]) for call in self.client.calls)
+
+    def test_fast_primary_is_not_hedged(self):
+        policy = HedgePolicy(backups={"fast": SLOW}, initial_delay=1.0)
+        result = asyncio.run(hedged_call(policy, FAST, streaming_start(self.client)))
+        self.assertEqual(result['status'], "success")
+        self.assertEqual(policy.stats, {"calls": 1, "hedged": 0, "backup_wins": 0})
+        self.assertEqual(self.statuses(), [("fast", "success")])
+
+    def test_backup_wins_and_the_primary_is_cancelled_before_returning(self):
+        policy = HedgePolicy(backups={"slow": FAST}, initial_delay=0.05)
+        result = asyncio.run(hedged_call(policy, SLOW, streaming_start(self.client)))
+
+        self.assertEqual((result['agent'], result['answered_by'], result['hedged']), ("slow", "fast", True))
+        self.assertEqual(policy.stats, {"calls": 1, "hedged": 1, "backup_wins": 1})
+        # The loser's stream was closed and recorded by the time the call returned
+        self.assertEqual(self.statuses(), [("fast", "success"), ("slow", "cancelled")])
+        self.assertEqual(self.client.in_flight, 0)
+
+    def test_setting_the_callers_token_cancels_both_attempts(self):
+        policy = HedgePolicy(backups={"slow": SLOW}, initial_delay=0.05)
+        cancel = CancelToken()
+
+        async def run():
+            call = asyncio.ensure_future(hedged_call(policy, SLOW, streaming_start(self.client), cancel))
+            await asyncio.sleep(0.2)
+            cancel.set()
+            return await asyncio.wait_for(call, 1)
+
+        result = asyncio.run(run())
+        self.assertEqual(result['status'], "cancelled")
+        self.assertEqual(self.statuses(), [("slow", "cancelled"), ("slow", "cancelled")])
+
+    def test_cancelling_the_call_settles_both_attempts(self):
+        policy = HedgePolicy(backups={"slow": SLOW}, initial_delay=0.05)
+
+        async def run():
+            call = asyncio.ensure_future(hedged_call(policy, SLOW, streaming_start(self.client)))
+            await asyncio.sleep(0.2)
+            call.cancel()
+            await asyncio.wait({call})
+            return call.cancelled()
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(self.statuses(), [("slow", "cancelled"), ("slow", "cancelled")])
+        self.assertEqual(self.client.in_flight, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import instrumentation
+from fake_foundry import FakeOpenAIClient, LatencyModel
+
+def traced_client():
+    tracer = instrumentation.Tracer()
+    fake = FakeOpenAIClient(latency=LatencyModel(median=0.001, distribution="fixed"))
+    return tracer, instrumentation.InstrumentedOpenAIClient(fake, tracer)
+
+def open_stream(client):
+    return client.responses.create(input="hi", stream=True, extra_body={"agent": {"name": "agent-a", "type": "agent_reference"}})
+
+class TracedStreamCloseTest(unittest.TestCase):
+    def test_close_after_the_stream_ended_keeps_its_status(self):
+        tracer, client = traced_client()
+        stream = open_stream(client)
+        events = list(stream)
+        stream.close()
+
+        self.assertEqual(events[-1].type, "response.completed")
+        self.assertEqual([span.status for span in tracer.spans], ["success"])
+
+    def test_close_before_the_first_event_finishes_the_span(self):
+        tracer, client = traced_client()
+        stream = open_stream(client)
+        stream.close()
+
+        self.assertEqual([span.status for span in tracer.spans], ["cancelled"])
+        self.assertEqual(list(stream), [])
+        self.assertEqual(tracer.local.stack, [])
+
+class FakeAgents:
+    def list(self):
+        yield from ("agent-a", "agent-b")
+
+    def get(self, agent_name):
+        return agent_name
+
+class InstrumentedAgentsListTest(unittest.TestCase):
+    def test_spans_opened_while_iterating_are_not_children_of_the_listing(self):
+        tracer = instrumentation.Tracer()
+        agents = instrumentation.InstrumentedAgents(FakeAgents(), tracer, {})
+
+        for name in agents.list():
+            agents.get(name)
+
+        spans = {span.phase: span for span in tracer.spans}
+        self.assertEqual([span.phase for span in tracer.spans], ["agents.list", "agents.get", "agents.get"])
+        self.assertIsNone(spans["agents.get"].parent_id)
+        self.assertEqual(tracer.local.stack, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quorum
+
+AGENTS = [{"name": name, "model": "m"} for name in ("first", "second", "third")]
+
+class RaceTest(unittest.TestCase):
+    def setUp(self):
+        self.unwound = []
+
+    async def call(self, agent_info, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.unwound.append(agent_info['name'])
+            raise
+        return {"agent": agent_info['name'], "model": agent_info['model'], "status": "success", "response": "done"}
+
+    def race(self, delays, size, deadline=5.0, leftovers="cancel"):
+        async def run():
+            calls = [self.call(agent_info, delay) for agent_info, delay in zip(AGENTS, delays)]
+            return await quorum.race(AGENTS, calls, size, deadline, leftovers)
+
+        return asyncio.run(run())
+
+    def test_returns_once_the_quorum_has_answered(self):
+        results = self.race([0.01, 0.02, 5.0], 2)
+        self.assertEqual([(result['agent'], result['status']) for result in results],
+                         [("first", "success"), ("second", "success"), ("third", "cancelled")])
+        # The dropped call has unwound (and closed its stream) before race returns
+        self.assertEqual(self.unwound, ["third"])
+
+    def test_calls_still_running_at_the_deadline_time_out(self):
+        results = self.race([0.01, 5.0, 5.0], 2, deadline=0.1)
+        self.assertEqual([result['status'] for result in results], ["success", "timeout", "timeout"])
+        self.assertEqual(sorted(self.unwound), ["second", "third"])
+
+    def test_leftovers_can_finish_in_the_background(self):
+        async def run():
+            calls = [self.call(agent_info, delay) for agent_info, delay in zip(AGENTS, [0.01, 0.05, 0.05])]
+            results = await quorum.race(AGENTS, calls, 1, 5.0, "finish")
+            return results, await quorum.drain(1.0)
+
+        results, finished = asyncio.run(run())
+        self.assertEqual([result['status'] for result in results], ["success", "cancelled", "cancelled"])
+        self.assertEqual((finished, self.unwound), (2, []))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import response_cache
+
+class AccessTimeBatchingTest(unittest.TestCase):
+    """Hits keep their access time in memory and write it back in batches"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = response_cache.ResponseCache(path=os.path.join(self.directory.name, "cache.sqlite"))
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(self.cache.close)
+
+    def accessed_at(self, key):
+        return self.cache.db.execute("SELECT accessed_at FROM responses WHERE key = ?", (key,)).fetchone()[0]
+
+    def test_memory_hits_do_not_write_to_disk(self):
+        self.cache.store("agent-a", "v1", "Tell me a story", "Once upon a time")
+        changes = self.cache.db.total_changes
+
+        for _ in range(3):
+            self.assertEqual(self.cache.lookup("agent-a", "v1", "Tell  me a story"), "Once upon a time")
+
+        self.assertEqual(self.cache.db.total_changes, changes)
+        self.assertEqual(self.cache.stats["memory_hits"], 3)
+
+    def test_access_times_reach_disk_on_close(self):
+        path = self.cache.path
+        self.cache.store("agent-a", "v1", "prompt", "answer")
+        key = response_cache.make_key("agent-a", "v1", "prompt")
+        stored = self.accessed_at(key)
+        time.sleep(0.01)
+        self.cache.lookup("agent-a", "v1", "prompt")
+        self.cache.close()
+
+        reopened = response_cache.ResponseCache(path=path)
+        self.addCleanup(reopened.close)
+        accessed = reopened.db.execute("SELECT accessed_at FROM responses WHERE key = ?", (key,)).fetchone()[0]
+        self.assertGreater(accessed, stored)
+
+class CachedManifestTest(unittest.TestCase):
+    def test_manifest_is_parsed_again_only_when_it_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "manifest.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"endpoint": {"agent-a": {"definition_hash": "v1"}}}')
+            first = response_cache.cached_manifest(path)
+            self.assertIs(response_cache.cached_manifest(path), first)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"endpoint": {"agent-a": {"definition_hash": "v2"}}}')
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            self.assertEqual(response_cache.cached_manifest(path)["endpoint"]["agent-a"]["definition_hash"], "v2")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import single_flight
+
+class SingleFlightTest(unittest.TestCase):
+    def test_identical_concurrent_calls_share_one_request(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"status": "success", "response": "shared"}
+
+        async def run():
+            flights = single_flight.SingleFlight()
+            key = single_flight.flight_key("agent-a", "Tell me  a story")
+            same = single_flight.flight_key("agent-a", "Tell me a story")
+            return flights, await asyncio.gather(flights.do(key, call), flights.do(same, call))
+
+        flights, results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([result.get("coalesced", False) for result in results], [False, True])
+        self.assertEqual(flights.stats, {"calls": 1, "coalesced": 1})
+        self.assertEqual(flights.flights, {})
+
+    def test_one_waiter_giving_up_leaves_the_call_for_the_others(self):
+        async def call():
+            await asyncio.sleep(0.02)
+            return {"status": "success"}
+
+        async def run():
+            flights = single_flight.SingleFlight()
+            first = asyncio.ensure_future(flights.do("key", call))
+            second = asyncio.ensure_future(flights.do("key", call))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second, first.cancelled()
+
+        result, first_cancelled = asyncio.run(run())
+        self.assertTrue(first_cancelled)
+        self.assertEqual(result["status"], "success")
+
+    def test_last_waiter_cancelling_cancels_and_awaits_the_call(self):
+        unwound = []
+
+        async def call():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                unwound.append(True)
+                raise
+
+        async def run():
+            flights = single_flight.SingleFlight()
+            waiter = asyncio.ensure_future(flights.do("key", call))
+            await asyncio.sleep(0)
+            waiter.cancel("not needed")
+            await asyncio.wait({waiter})
+            # The shared call has unwound by the time its last waiter is done
+            return list(unwound), flights.flights
+
+        unwound_on_return, remaining = asyncio.run(run())
+        self.assertEqual(unwound_on_return, [True])
+        self.assertEqual(remaining, {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import importlib
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import summary_compaction
+
+STORY = " ".join(f"Sentence number {index} of a long story about a robot chef." for index in range(200))
+
+def answers(count, response=STORY):
+    return [{"agent": f"agent-{index}", "model": "m", "status": "success", "response": response} for index in range(count)]
+
+class BuildSummaryInputTest(unittest.TestCase):
+    def test_off_by_default(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("SUMMARY_TOKEN_BUDGET", None)
+            self.assertEqual(importlib.reload(summary_compaction).SUMMARY_TOKEN_BUDGET, 0)
+        importlib.reload(summary_compaction)
+
+    def test_many_answers_stay_within_a_small_budget(self):
+        # 8 answers x MIN_ANSWER_TOKENS would be more than the whole budget
+        _, stats = summary_compaction.build_summary_input("prompt", answers(8), budget=400)
+        self.assertLessEqual(stats["tokens"], 400)
+        self.assertEqual(len(stats["shortened"]), 8)
+
+    def test_short_answers_are_kept_whole(self):
+        results = answers(2) + [{"agent": "brief", "model": "m", "status": "success", "response": "A **short** answer."}]
+        text, stats = summary_compaction.build_summary_input("prompt", results, budget=1000)
+        self.assertIn("A short answer.", text)
+        self.assertNotIn("brief", stats["shortened"])
+        self.assertLessEqual(stats["tokens"], 1000)
+
+    def test_failed_agents_are_listed_by_name_only(self):
+        results = answers(1) + [{"agent": "broken", "model": "m", "status": "error", "response": "Sorry, broken is unavailable."}]
+        text, stats = summary_compaction.build_summary_input("prompt", results, budget=1000)
+        self.assertIn("Not answered: broken (error)", text)
+        self.assertNotIn("unavailable", text)
+        self.assertEqual(stats["omitted"], ["broken"])
+
+if __name__ == "__main__":
+    unittest.main()
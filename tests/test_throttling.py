@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+from email.utils import formatdate
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import throttling
+from deadlines import CancelToken
+from fake_foundry import FakeServiceError
+
+def error_with_headers(headers, status_code=429):
+    error = Exception("throttled")
+    error.status_code = status_code
+    error.response = SimpleNamespace(status_code=status_code, headers=headers)
+    return error
+
+class ClassifyTest(unittest.TestCase):
+    def test_status_codes_and_error_types(self):
+        class APITimeoutError(Exception):
+            pass
+
+        self.assertEqual(throttling.classify(FakeServiceError("busy", status_code=429)), "throttled")
+        self.assertEqual(throttling.classify(FakeServiceError("down", status_code=503)), "transient")
+        self.assertEqual(throttling.classify(APITimeoutError()), "transient")
+        self.assertEqual(throttling.classify(FakeServiceError("bad", status_code=400)), "fatal")
+        self.assertEqual(throttling.classify(ValueError()), "fatal")
+
+class RetryAfterTest(unittest.TestCase):
+    def test_milliseconds_header_wins(self):
+        self.assertEqual(throttling.retry_after(FakeServiceError("busy", 429, retry_after=1.5)), 1.5)
+
+    def test_seconds_and_http_date(self):
+        self.assertEqual(throttling.retry_after(error_with_headers({"retry-after": "7"})), 7.0)
+        later = throttling.retry_after(error_with_headers({"retry-after": formatdate(time.time() + 30, usegmt=True)}))
+        self.assertTrue(28 <= later <= 30, later)
+        past = throttling.retry_after(error_with_headers({"retry-after": formatdate(time.time() - 30, usegmt=True)}))
+        self.assertEqual(past, 0.0)
+
+    def test_missing_or_unreadable(self):
+        self.assertIsNone(throttling.retry_after(ValueError()))
+        self.assertIsNone(throttling.retry_after(error_with_headers({})))
+        self.assertIsNone(throttling.retry_after(error_with_headers({"retry-after": "soon"})))
+
+class TokenBucketTest(unittest.TestCase):
+    def test_reservations_queue_up_at_the_refill_rate(self):
+        with mock.patch.object(throttling.time, "monotonic", return_value=100.0):
+            bucket = throttling.TokenBucket(60)  # one per second, burst of one
+            self.assertEqual(bucket.reserve(1), 0.0)
+            self.assertEqual(bucket.reserve(1), 1.0)
+            self.assertEqual(bucket.reserve(1), 2.0)
+            bucket.refund(1)
+            self.assertEqual(bucket.reserve(1), 2.0)
+
+    def test_refill_is_capped_at_the_burst(self):
+        with mock.patch.object(throttling.time, "monotonic", return_value=100.0):
+            bucket = throttling.TokenBucket(120)
+            bucket.reserve(2)
+        with mock.patch.object(throttling.time, "monotonic", return_value=200.0):
+            self.assertEqual(bucket.reserve(2), 0.0)
+            self.assertEqual(bucket.reserve(1), 0.5)
+
+class CallWithRetriesTest(unittest.TestCase):
+    def setUp(self):
+        throttling.configure({})
+        self.addCleanup(throttling.configure, {})
+
+    def test_throttled_call_is_retried_after_retry_after(self):
+        attempts = []
+
+        def request():
+            attempts.append(time.monotonic())
+            if len(attempts) < 3:
+                raise FakeServiceError("rate limit exceeded", status_code=429, retry_after=0.01)
+            return "ok"
+
+        self.assertEqual(throttling.call_with_retries(request, "test-deployment", 10), "ok")
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(throttling.get_limiter("test-deployment").throttled, 2)
+
+    def test_fatal_errors_are_not_retried(self):
+        attempts = []
+
+        def request():
+            attempts.append(1)
+            raise FakeServiceError("bad request", status_code=400)
+
+        with self.assertRaises(FakeServiceError):
+            throttling.call_with_retries(request, "test-deployment", 10)
+        self.assertEqual(len(attempts), 1)
+
+    def test_cancel_stops_the_retry_wait(self):
+        cancel = CancelToken()
+
+        def request():
+            cancel.set()
+            raise FakeServiceError("rate limit exceeded", status_code=429, retry_after=5)
+
+        started = time.monotonic()
+        with self.assertRaises(FakeServiceError):
+            throttling.call_with_retries(request, "test-deployment", 10, cancel)
+        self.assertLess(time.monotonic() - started, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflow_compiler import compile_workflow
+
+WORKFLOW = """
+kind: workflow
+name: test
+trigger:
+  kind: OnConversationStart
+  id: start
+  actions:
+{actions}
+"""
+
+SET_PROMPT = """
+    - kind: SetVariable
+      id: set_prompt
+      variable: Local.Prompt
+      value: =UserMessage(System.LastMessageText)
+"""
+
+INVOKE = """
+    - kind: InvokeAzureAgent
+      id: call_agent
+      agent:
+        name: agent-a
+      input:
+        messages: =Local.Prompt
+      output:
+        messages: Local.Story
+"""
+
+SEND = """
+    - kind: SendActivity
+      id: send_story
+      activity: {activity}
+"""
+
+def compile_actions(*actions, known_agents=None):
+    return compile_workflow(WORKFLOW.format(actions="".join(actions)), known_agents, use_cache=False)
+
+def errors(compiled):
+    return [(issue.action_id, issue.message) for issue in compiled.errors]
+
+class CompileWorkflowTest(unittest.TestCase):
+    def test_valid_workflow_compiles(self):
+        compiled = compile_actions(SET_PROMPT, INVOKE, SEND.format(activity='"Story: {Last(Local.Story).Text}"'))
+        self.assertEqual(errors(compiled), [])
+        self.assertEqual(compiled.agents, ["agent-a"])
+
+    def test_non_string_variable_is_an_error(self):
+        compiled = compile_actions("""
+    - kind: SetVariable
+      id: set_count
+      variable: 3
+      value: 1
+""")
+        self.assertEqual(errors(compiled), [("set_count", "'variable' must name a Local.* variable, got 3")])
+
+    def test_non_string_conversation_id_is_an_error(self):
+        compiled = compile_actions("""
+    - kind: CreateConversation
+      id: create_conversation
+      conversationId:
+        name: Local.Conversation
+""")
+        self.assertEqual([action_id for action_id, _ in errors(compiled)], ["create_conversation"])
+        self.assertIn("'conversationId' must name a Local.* variable", errors(compiled)[0][1])
+
+    def test_non_string_activity_is_an_error(self):
+        compiled = compile_actions(SET_PROMPT, INVOKE, SEND.format(activity="{type: message, text: =Local.Story}"))
+        self.assertEqual([action_id for action_id, _ in errors(compiled)], ["send_story"])
+        self.assertIn("activity must be text", errors(compiled)[0][1])
+
+    def test_unclosed_template_brace_is_an_error(self):
+        compiled = compile_actions(SET_PROMPT, INVOKE, SEND.format(activity='"Story: {Last(Local.Story).Text"'))
+        self.assertEqual(errors(compiled), [("send_story", "bad expression 'Story: {Last(Local.Story).Text': unbalanced '{' or '}' in template")])
+
+    def test_use_before_set_is_an_error(self):
+        compiled = compile_actions(INVOKE, SET_PROMPT)
+        self.assertIn(("call_agent", "'Local.Prompt' is used before it is set"), errors(compiled))
+
+    def test_unknown_agent_is_an_error_only_with_an_agent_list(self):
+        actions = (SET_PROMPT, INVOKE, SEND.format(activity='"{Last(Local.Story).Text}"'))
+        self.assertEqual(errors(compile_actions(*actions)), [])
+        self.assertEqual(
+            errors(compile_actions(*actions, known_agents={"agent-b"})),
+            [("call_agent", "agent 'agent-a' is not deployed")],
+        )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import asyncio
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflow_engine import FoundryRuntime, WorkflowEngine, build_graph, load_workflow
+from fake_foundry import FakeOpenAIClient, LatencyModel
+
+WORKFLOW_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "workflows", "story-teller-multi-agent-workflow.yaml")
+STORYTELLERS = {"deepseek_storyteller", "gpt_storyteller", "mistral_storyteller"}
+
+def load_story_workflow():
+    with open(WORKFLOW_PATH, encoding="utf-8") as f:
+        return load_workflow(f.read())
+
+class BuildGraphTest(unittest.TestCase):
+    def test_storytellers_only_wait_for_the_prompt(self):
+        actions = {action.id: action for action in load_story_workflow()}
+        for action_id in STORYTELLERS:
+            self.assertEqual(actions[action_id].deps, {"set_user_prompt"})
+
+    def test_activities_follow_every_earlier_agent_call_in_declared_order(self):
+        actions = {action.id: action for action in load_story_workflow()}
+        self.assertLessEqual(STORYTELLERS, actions["send_results_summary"].deps)
+        self.assertIn("send_results_summary", actions["send_deepseek_story"].deps)
+        self.assertIn("send_gpt_story", actions["send_mistral_story"].deps)
+        self.assertEqual(actions["end_workflow"].deps, set(actions) - {"end_workflow"})
+
+    def test_writes_wait_for_earlier_reads_and_writes(self):
+        actions = {action.id: action for action in build_graph([
+            {"kind": "SetVariable", "id": "a", "variable": "Local.X", "value": "1"},
+            {"kind": "SetVariable", "id": "b", "variable": "Local.Y", "value": "=Local.X"},
+            {"kind": "SetVariable", "id": "c", "variable": "Local.X", "value": "2"},
+            {"kind": "SetVariable", "id": "d", "variable": "Local.Z", "value": "3"},
+        ])}
+        self.assertEqual(actions["b"].deps, {"a"})
+        self.assertEqual(actions["c"].deps, {"a", "b"})
+        self.assertEqual(actions["d"].deps, set())
+
+class WorkflowEngineTest(unittest.TestCase):
+    def test_agents_run_concurrently_and_activities_keep_their_order(self):
+        client = FakeOpenAIClient(latency=LatencyModel(0.1, "fixed"))
+        actions = load_story_workflow()
+        engine = WorkflowEngine(FoundryRuntime(client))
+        run = asyncio.run(engine.run(actions, "a lighthouse keeper"))
+
+        agent_timings = [timing for timing in run.timings if timing.action_id in STORYTELLERS]
+        self.assertEqual(len(agent_timings), 3)
+        self.assertLess(max(timing.start for timing in agent_timings), min(timing.end for timing in agent_timings))
+        self.assertEqual(len(run.activities), 4)
+        self.assertTrue(all(call[3] == "success" for call in client.calls))
+        self.assertIn("a lighthouse keeper", run.activities[1])
+
+if __name__ == "__main__":
+    unittest.main()
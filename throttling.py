@@ -0,0 +1,196 @@
+"""
+Retries and client-side rate limiting for model calls.
+Failed calls are classified (throttled / transient / fatal); throttled and transient
+ones are retried after the server's Retry-After or a jittered exponential backoff.
+Each model deployment also gets token buckets for requests and tokens per minute,
+set from its quota in agents.toml, so calls wait for capacity instead of piling into
+429s, and a 429 pauses the whole deployment rather than just the call that got it.
+"""
+
+import os
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+RETRY_MAX_ATTEMPTS = int(os.environ.get("RETRY_MAX_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", "0.5"))  # seconds, doubled per attempt
+RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", "30"))  # cap for backoff and Retry-After
+EXPECTED_OUTPUT_TOKENS = int(os.environ.get("EXPECTED_OUTPUT_TOKENS", "512"))  # reserved per call until usage is known
+BURST_SECONDS = 1  # Azure enforces per-minute quotas over windows as short as a second, so allow little burst
+
+TRANSIENT_STATUS = {408, 409, 500, 502, 503, 504}
+TRANSIENT_ERRORS = {
+    "APIConnectionError", "APITimeoutError", "ConnectionError", "TimeoutError",
+    "ServiceRequestError", "ServiceResponseError",
+}
+
+def classify(error):
+    """'throttled' (429), 'transient' (timeouts, connection errors, 5xx) or 'fatal'"""
+    status = getattr(error, "status_code", None)
+    if status == 429 or type(error).__name__ == "RateLimitError":
+        return "throttled"
+    if status in TRANSIENT_STATUS or (status or 0) >= 500 or (status is None and type(error).__name__ in TRANSIENT_ERRORS):
+        return "transient"
+    return "fatal"
+
+def retry_after(error):
+    """Seconds the server asked us to wait (Retry-After / retry-after-ms headers), or None"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """Full-jitter exponential backoff for the given (1-based) attempt"""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+def estimate_tokens(text, output_tokens=EXPECTED_OUTPUT_TOKENS):
+    """Rough token count for a call (about 4 characters per input token, plus the expected output)"""
+    return len(str(text)) // 4 + output_tokens
+
+class TokenBucket:
+    """Reservation-style token bucket refilled at per_minute / 60 per second
+
+    reserve() always succeeds and returns how long the caller must wait before its
+    share is available, so concurrent callers queue up fairly without polling.
+    """
+
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60.0
+        self.capacity = self.rate * BURST_SECONDS
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount):
+        with self.lock:
+            now = time.monotonic()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            self.level -= amount
+            return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount):
+        """Give back (or, if negative, take) tokens once the real usage is known"""
+        with self.lock:
+            self.level = min(self.capacity, self.level + amount)
+
+class DeploymentLimiter:
+    """Requests- and tokens-per-minute limits for one model deployment, plus 429 pauses"""
+
+    def __init__(self, model, requests_per_minute=None, tokens_per_minute=None):
+        self.model = model
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.paused_until = 0.0
+        self.throttled = 0  # 429s seen, for adaptive concurrency
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens):
+        """Seconds to wait before a call estimated at `tokens` may start"""
+        waits = [0.0]
+        if self.requests:
+            waits.append(self.requests.reserve(1))
+        if self.tokens:
+            waits.append(self.tokens.reserve(tokens))
+        with self.lock:
+            waits.append(self.paused_until - time.monotonic())
+        return max(waits)
+
+    def settle(self, estimated, actual):
+        if self.tokens:
+            self.tokens.refund(estimated - actual)
+
+    def pause(self, seconds):
+        """Hold every call to this deployment for `seconds` (after a 429)"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.throttled += 1
+
+_limiters = {}
+_quotas = None
+_lock = threading.Lock()
+stats = {"calls": 0, "retries": 0, "throttled": 0, "gave_up": 0, "waited": 0.0}
+
+def configure(quotas):
+    """Set {model: {"requests_per_minute": ..., "tokens_per_minute": ...}} (replaces agents.toml quotas)"""
+    global _quotas
+    with _lock:
+        _quotas = dict(quotas)
+        _limiters.clear()
+
+def get_limiter(model):
+    """Limiter for a deployment, using its quota from agents.toml (unlimited if it has none)"""
+    global _quotas
+    with _lock:
+        if _quotas is None:
+            import agent_registry
+            _quotas = agent_registry.deployment_quotas()
+        if model not in _limiters:
+            _limiters[model] = DeploymentLimiter(model, **_quotas.get(model, {}))
+        return _limiters[model]
+
+def record(**counts):
+    with _lock:
+        for key, value in counts.items():
+            stats[key] += value
+
+def wait(seconds, cancel=None):
+    """Sleep, returning early (True) if the call is cancelled meanwhile"""
+    if seconds <= 0:
+        return cancel is not None and cancel.is_set()
+    record(waited=seconds)
+    if cancel is not None:
+        return cancel.event.wait(seconds)
+    time.sleep(seconds)
+    return False
+
+def call_with_retries(request, model, estimated_tokens, cancel=None):
+    """Run request() within the deployment's rate limits, retrying throttled and transient failures
+
+    Re-raises the last error once it is fatal, attempts run out, or the call is cancelled.
+    The caller should report the real token usage with record_usage().
+    """
+    limiter = get_limiter(model)
+    record(calls=1)
+    for attempt in range(1, RETRY_MAX_ATTEMPTS + 1):
+        if wait(limiter.reserve(estimated_tokens), cancel):
+            raise RuntimeError("cancelled while waiting for rate limit capacity")
+        try:
+            return request()
+        except Exception as e:
+            limiter.settle(estimated_tokens, 0)  # rejected calls don't use quota
+            kind = classify(e)
+            if kind == "fatal" or attempt == RETRY_MAX_ATTEMPTS or (cancel is not None and cancel.is_set()):
+                record(gave_up=kind != "fatal")
+                raise
+            delay = retry_after(e)
+            delay = min(RETRY_MAX_DELAY, delay) if delay is not None else backoff_delay(attempt)
+            if kind == "throttled":
+                limiter.pause(delay)
+                record(throttled=1)
+            record(retries=1)
+            if wait(delay, cancel):
+                raise
+
+def record_usage(model, estimated_tokens, usage):
+    """Correct the deployment's token bucket with a finished call's real usage"""
+    actual = getattr(usage, "total_tokens", None)
+    if actual is not None:
+        get_limiter(model).settle(estimated_tokens, actual)
+
+def format_stats():
+    return (
+        f"🔁 Retries: {stats['retries']} retried ({stats['throttled']} throttled) over {stats['calls']} calls, "
+        f"{stats['gave_up']} gave up, {stats['waited']:.1f}s of waiting (summed over calls)"
+    )
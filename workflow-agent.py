@@ -1,93 +1,46 @@
 import os
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
 from azure.ai.projects.models import WorkflowAgentDefinition
 
+from agent_provisioning import ensure_agent_version, describe
+from workflow_compiler import require_valid, load_known_agents
+import foundry_clients
+
 load_dotenv()
 
 # Workflow agent configuration
 WORKFLOW_AGENT_NAME = "story-teller-multi-agent-workflow"
 MODEL_DEPLOYMENT_NAME = "gpt-5.2"
+WORKFLOWS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workflows")
 
 print(f"Using PROJECT_ENDPOINT: {os.environ['PROJECT_ENDPOINT']}")
 print(f"Creating workflow: {WORKFLOW_AGENT_NAME}")
 
-project_client = AIProjectClient(
-    endpoint=os.environ["PROJECT_ENDPOINT"],
-    credential=DefaultAzureCredential(),
-)
+project_client = foundry_clients.get_project_client()
+
+# Load the multi-agent workflow definition (exact working YAML format)
+with open(os.path.join(WORKFLOWS_DIR, "story-teller-multi-agent-workflow.yaml"), encoding="utf-8") as f:
+    workflow_definition = f.read()
 
-# Define the multi-agent workflow using the exact working YAML format
-workflow_definition = """
-kind: workflow
-trigger:
-  kind: OnConversationStart
-  id: story_teller_multi_agent_workflow
-  actions:
-    - kind: SetVariable
-      id: set_user_prompt
-      variable: Local.UserPrompt
-      value: =UserMessage(System.LastMessageText)
-    - kind: InvokeAzureAgent
-      id: deepseek_storyteller
-      description: DeepSeek creates a story
-      agent:
-        name: agent-deepseek
-      input:
-        messages: =Local.UserPrompt
-      output:
-        messages: Local.DeepSeekStory
-    - kind: InvokeAzureAgent
-      id: gpt_storyteller
-      description: GPT creates a story
-      agent:
-        name: agent-gpt
-      input:
-        messages: =Local.UserPrompt
-      output:
-        messages: Local.GPTStory
-    - kind: InvokeAzureAgent
-      id: mistral_storyteller
-      description: Mistral creates a story
-      agent:
-        name: agent-mistral
-      input:
-        messages: =Local.UserPrompt
-      output:
-        messages: Local.MistralStory
-    - kind: SendActivity
-      id: send_results_summary
-      activity: "🎯 Multi-Agent Storytelling Results - All three agents have completed their stories"
-    - kind: SendActivity
-      id: send_deepseek_story
-      activity: "🔷 DeepSeek: {Last(Local.DeepSeekStory).Text}"
-    - kind: SendActivity
-      id: send_gpt_story
-      activity: "🟢 GPT: {Last(Local.GPTStory).Text}"
-    - kind: SendActivity
-      id: send_mistral_story
-      activity: "🔶 Mistral: {Last(Local.MistralStory).Text}"
-    - kind: EndConversation
-      id: end_workflow
-name: story-teller-multi-agent-workflow
-"""
+# Validate offline before spending a create_version round trip
+require_valid(workflow_definition, load_known_agents())
 
 # Create NEW Foundry workflow agent with YAML definition
-workflow_agent = project_client.agents.create_version(
+workflow_agent = ensure_agent_version(
+    project_client,
     agent_name=WORKFLOW_AGENT_NAME,
     definition=WorkflowAgentDefinition(
         workflow=workflow_definition
     ),
 )
 
-print(f"✅ NEW Foundry Workflow Agent created!")
+print(f"✅ NEW Foundry Workflow Agent {describe(workflow_agent)}!")
 print(f"   ID: {workflow_agent.id}")
 print(f"   Name: {workflow_agent.name}")
 print(f"   Version: {workflow_agent.version}")
 
 # Test the workflow
-openai_client = project_client.get_openai_client()
+openai_client = foundry_clients.get_openai_client()
 
 # Create conversation for the workflow
 workflow_conversation = openai_client.conversations.create()
@@ -0,0 +1,46 @@
+import os
+import asyncio
+import argparse
+from dotenv import load_dotenv
+
+from workflow_engine import WorkflowEngine, FoundryRuntime, WorkflowError, load_workflow, format_graph, format_run_report
+import foundry_clients
+
+load_dotenv()
+
+WORKFLOWS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workflows")
+DEFAULT_WORKFLOW = os.path.join(WORKFLOWS_DIR, "visual-multi-agent-storytelling-workflow-fixed.yaml")
+
+async def run_local_workflow(workflow_path, user_input, max_concurrency):
+    """Run a workflow YAML client-side with dependency-aware parallel scheduling"""
+    with open(workflow_path, encoding="utf-8") as f:
+        actions = load_workflow(f.read())
+
+    print(f"📄 Workflow: {workflow_path}")
+    print(f"🔗 Dataflow graph ({len(actions)} actions):")
+    print(format_graph(actions))
+
+    # foundry_clients only imports the SDKs once we know the workflow is runnable
+    runtime = FoundryRuntime(foundry_clients.get_openai_client())
+    engine = WorkflowEngine(runtime, max_concurrency=max_concurrency)
+
+    print(f"\n🚀 Running locally with max concurrency {max_concurrency}: '{user_input}'\n")
+    run = await engine.run(actions, user_input)
+
+    for activity in run.activities:
+        print(activity)
+        print()
+    print(format_run_report(run, actions))
+    return run
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a Foundry workflow YAML locally with parallel agent calls")
+    parser.add_argument("workflow", nargs="?", default=DEFAULT_WORKFLOW, help="path to the workflow YAML")
+    parser.add_argument("--prompt", default="Write a story about a robot chef who discovers the secret ingredient to happiness")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="use 1 to reproduce the hosted, sequential order")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_local_workflow(args.workflow, args.prompt, args.max_concurrency))
+    except WorkflowError as e:
+        print(f"❌ Workflow failed: {e}")
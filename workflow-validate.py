@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import argparse
+from dotenv import load_dotenv
+
+from workflow_compiler import compile_workflow, load_known_agents, format_issues
+import foundry_clients
+
+load_dotenv()
+
+WORKFLOWS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workflows")
+
+def find_workflow_files(paths):
+    """Expand files and directories into the list of workflow YAML files"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith((".yaml", ".yml")):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate Foundry workflow YAML offline")
+    parser.add_argument("paths", nargs="*", default=[WORKFLOWS_DIR], help="workflow files or directories")
+    parser.add_argument("--refresh-agents", action="store_true", help="refresh the cached agent list from the project")
+    parser.add_argument("--no-agent-check", action="store_true", help="skip checking agent references")
+    parser.add_argument("--no-cache", action="store_true", help="recompile even if a cached result exists")
+    args = parser.parse_args()
+
+    known_agents = None
+    if not args.no_agent_check:
+        project_client = None
+        if args.refresh_agents:
+            project_client = foundry_clients.get_project_client()
+        known_agents = load_known_agents(project_client, max_age=0 if args.refresh_agents else float("inf"))
+        if known_agents is None:
+            print("⚠️  No cached agent list - run with --refresh-agents to check agent references")
+
+    started = time.perf_counter()
+    failed = 0
+    checked = 0
+    for path in find_workflow_files(args.paths):
+        with open(path, encoding="utf-8") as f:
+            compiled = compile_workflow(f.read(), known_agents, use_cache=not args.no_cache)
+        checked += 1
+        source = "cached" if compiled.from_cache else "compiled"
+        if compiled.ok:
+            print(f"✅ {path} ({len(compiled.actions)} actions, {source})")
+        else:
+            failed += 1
+            print(f"❌ {path} ({source})")
+        if compiled.issues:
+            print("   " + format_issues(compiled).replace("\n", "\n   "))
+
+    print(f"\n📋 {checked - failed}/{checked} workflows valid in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,130 +1,51 @@
 import os
 import asyncio
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
 from azure.ai.projects.models import (
     WorkflowAgentDefinition,
     ResponseStreamEventType,
     ItemType
 )
 
+from agent_provisioning import ensure_agent_version, describe
+from workflow_compiler import require_valid, load_known_agents
+import foundry_clients
+import stream_recording
+
 load_dotenv()
 
 # Configuration
-PROJECT_ENDPOINT = os.environ["PROJECT_ENDPOINT"]
+WORKFLOWS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workflows")
 
-print(f"Using PROJECT_ENDPOINT: {PROJECT_ENDPOINT}")
+# Created by connect(), so importing this module (e.g. to replay a recorded stream) has no side effects
+project_client = None
 
-project_client = AIProjectClient(
-    endpoint=PROJECT_ENDPOINT,
-    credential=DefaultAzureCredential(),
-)
+def connect():
+    global project_client
+    print(f"Using PROJECT_ENDPOINT: {os.environ['PROJECT_ENDPOINT']}")
+    project_client = foundry_clients.get_project_client()
 
 async def create_fixed_visual_workflow():
     """Create a corrected visual workflow with proper agent name references"""
     
     print("🔧 Creating corrected visual workflow with matching agent names...")
 
-    # Define the CORRECTED visual workflow YAML with proper agent names
-    workflow_yaml = """
-kind: workflow
-trigger:
-  kind: OnConversationStart
-  id: multi_agent_storytelling_workflow
-  actions:
-    - kind: SetVariable
-      id: set_user_prompt
-      variable: Local.UserPrompt
-      value: "=UserMessage(System.LastMessageText)"
-
-    - kind: SetVariable
-      id: set_story_count
-      variable: Local.StoryCount
-      value: "=0"
-
-    # Create separate conversations for each storytelling agent
-    - kind: CreateConversation
-      id: create_deepseek_conversation
-      conversationId: Local.DeepSeekConversationId
-
-    - kind: CreateConversation
-      id: create_gpt_conversation
-      conversationId: Local.GPTConversationId
-
-    - kind: CreateConversation
-      id: create_mistral_conversation
-      conversationId: Local.MistralConversationId
-
-    - kind: CreateConversation
-      id: create_coordinator_conversation
-      conversationId: Local.CoordinatorConversationId
-
-    # Invoke DeepSeek Storyteller (CORRECTED AGENT NAME)
-    - kind: InvokeAzureAgent
-      id: deepseek_storyteller
-      description: "DeepSeek creates a sci-fi story"
-      conversationId: "=Local.DeepSeekConversationId"
-      agent:
-        name: agent-deepseek
-      input:
-        messages: "=Local.UserPrompt"
-      output:
-        messages: Local.DeepSeekStory
-
-    # Invoke GPT Storyteller (CORRECTED AGENT NAME)
-    - kind: InvokeAzureAgent
-      id: gpt_storyteller
-      description: "GPT creates a character-driven story"
-      conversationId: "=Local.GPTConversationId"
-      agent:
-        name: agent-gpt
-      input:
-        messages: "=Local.UserPrompt"
-      output:
-        messages: Local.GPTStory
-
-    # Invoke Mistral Storyteller (CORRECTED AGENT NAME)
-    - kind: InvokeAzureAgent
-      id: mistral_storyteller
-      description: "Mistral creates an adventure story"
-      conversationId: "=Local.MistralConversationId"
-      agent:
-        name: agent-mistral
-      input:
-        messages: "=Local.UserPrompt"
-      output:
-        messages: Local.MistralStory
-
-    # Coordinator evaluates all stories (CORRECTED AGENT NAME)
-    - kind: InvokeAzureAgent
-      id: story_coordinator
-      description: "Coordinator evaluates and selects the best story"
-      conversationId: "=Local.CoordinatorConversationId"
-      agent:
-        name: agent-coordinator
-      input:
-        messages: "=Concat('Evaluate these three stories and select the best one:\\n\\n**DeepSeek Story:**\\n', Last(Local.DeepSeekStory).Text, '\\n\\n**GPT Story:**\\n', Last(Local.GPTStory).Text, '\\n\\n**Mistral Story:**\\n', Last(Local.MistralStory).Text, '\\n\\nProvide your analysis and selection.')"
-      output:
-        messages: Local.FinalEvaluation
-
-    # Send final results
-    - kind: SendActivity
-      id: send_final_results
-      activity: "=Concat('🎯 **MULTI-AGENT STORYTELLING RESULTS**\\n\\n', '📚 **Stories Generated:**\\n\\n', '🤖 **DeepSeek (Sci-Fi):** ', Last(Local.DeepSeekStory).Text, '\\n\\n', '🤖 **GPT (Character-Driven):** ', Last(Local.GPTStory).Text, '\\n\\n', '🤖 **Mistral (Adventure):** ', Last(Local.MistralStory).Text, '\\n\\n', '🏆 **Coordinator Evaluation:**\\n', Last(Local.FinalEvaluation).Text)"
-
-    - kind: EndConversation
-      id: end_workflow
-"""
+    # Load the CORRECTED visual workflow YAML with proper agent names
+    with open(os.path.join(WORKFLOWS_DIR, "visual-multi-agent-storytelling-workflow-fixed.yaml"), encoding="utf-8") as f:
+        workflow_yaml = f.read()
 
     try:
+        # Validate offline before spending a create_version round trip
+        require_valid(workflow_yaml, load_known_agents())
+
         # Create the corrected visual workflow
-        visual_workflow = project_client.agents.create_version(
+        visual_workflow = ensure_agent_version(
+            project_client,
             agent_name="visual-multi-agent-storytelling-workflow-fixed",
             definition=WorkflowAgentDefinition(workflow=workflow_yaml),
         )
 
-        print(f"✅ CORRECTED Visual Workflow Created!")
+        print(f"✅ CORRECTED Visual Workflow {describe(visual_workflow)}!")
         print(f"   - ID: {visual_workflow.id}")
         print(f"   - Name: {visual_workflow.name}")
         print(f"   - Version: {visual_workflow.version}")
@@ -145,13 +66,25 @@ trigger:
         print("   3. Model deployments not available")
         raise
 
-async def test_workflow_execution(workflow):
-    """Test the corrected workflow execution"""
+def print_execution_stream(stream):
+    """Echo the streamed output text; returns the full response text"""
+    full_response = ""
+    for event in stream:
+        if event.type == ResponseStreamEventType.RESPONSE_OUTPUT_TEXT_DELTA:
+            print(event.delta, end='', flush=True)
+            full_response += event.delta
+        elif event.type == ResponseStreamEventType.RESPONSE_COMPLETED:
+            print(f"\n\n✅ Workflow Execution Completed!")
+            break
+    return full_response
+
+async def test_workflow_execution(workflow, openai_client=None):
+    """Test the corrected workflow execution (openai_client: e.g. a stream_recording.ReplayClient)"""
     print(f"\n🚀 Testing Corrected Visual Workflow: {workflow.name}")
     
     try:
         # Get OpenAI client for running the workflow
-        openai_client = project_client.get_openai_client()
+        openai_client = openai_client or foundry_clients.get_openai_client()
         
         # Create conversation for the workflow
         conversation = openai_client.conversations.create()
@@ -170,18 +103,10 @@ async def test_workflow_execution(workflow):
             stream=True,
         )
         
-        print("\n📡 Workflow Execution Stream:")
-        full_response = ""
+        stream = stream_recording.record(stream, workflow.name, {"workflow": workflow.name, "input": user_input})
         
-        for event in stream:
-            if event.type == ResponseStreamEventType.RESPONSE_DELTA:
-                if hasattr(event, 'delta') and hasattr(event.delta, 'content'):
-                    content = event.delta.content
-                    print(content, end='', flush=True)
-                    full_response += content
-            elif event.type == ResponseStreamEventType.RESPONSE_DONE:
-                print(f"\n\n✅ Workflow Execution Completed!")
-                break
+        print("\n📡 Workflow Execution Stream:")
+        full_response = print_execution_stream(stream)
                 
         return full_response
         
@@ -232,6 +157,8 @@ async def main():
     print("🔧 Microsoft Foundry Visual Workflow Fix Tool")
     print("=" * 50)
     
+    connect()
+
     # Step 1: Verify agents exist
     if not await verify_agents_exist():
         print("\n❌ Cannot proceed - missing required agents")
@@ -1,77 +1,42 @@
 import os
 import asyncio
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
-from azure.ai.projects.models import (
-    PromptAgentDefinition, 
-    WorkflowAgentDefinition,
-    ResponseStreamEventType,
-    ItemType
-)
+from azure.ai.projects.models import WorkflowAgentDefinition
 
-load_dotenv()
+from agent_provisioning import ensure_agent_version, describe
+import agent_registry
+from workflow_compiler import require_valid, load_known_agents
+import foundry_clients
+import stream_recording
+from workflow_profiler import WorkflowProfiler, ConsoleProgress
 
-# Configuration
-PROJECT_ENDPOINT = os.environ["PROJECT_ENDPOINT"]
-MODEL_DEPLOYMENT_NAME = "gpt-5.2"  # Use your model deployment
+load_dotenv()
 
-print(f"Using PROJECT_ENDPOINT: {PROJECT_ENDPOINT}")
-print(f"Using MODEL_DEPLOYMENT_NAME: {MODEL_DEPLOYMENT_NAME}")
+# Created by connect(), so importing this module (e.g. to replay a recorded stream) has no side effects
+project_client = None
 
-project_client = AIProjectClient(
-    endpoint=PROJECT_ENDPOINT,
-    credential=DefaultAzureCredential(),
-)
+def connect():
+    global project_client
+    print(f"Using PROJECT_ENDPOINT: {os.environ['PROJECT_ENDPOINT']}")
+    project_client = foundry_clients.get_project_client()
 
 async def create_visual_workflow():
     """Create a visual workflow that appears in Microsoft Foundry portal"""
     
-    # First, create the individual agents that will be used in the workflow
-    storytelling_agents = []
-    
-    # Create DeepSeek storytelling agent
-    deepseek_agent = project_client.agents.create_version(
-        agent_name="deepseek-storyteller",
-        definition=PromptAgentDefinition(
-            model="DeepSeek-V3.2",
-            instructions="You are a creative storyteller specializing in science fiction and technology themes. Write engaging, imaginative stories.",
-        ),
-    )
-    storytelling_agents.append(deepseek_agent)
-    print(f"Created DeepSeek Agent (id: {deepseek_agent.id}, name: {deepseek_agent.name})")
-    
-    # Create GPT storytelling agent
-    gpt_agent = project_client.agents.create_version(
-        agent_name="gpt-storyteller",
-        definition=PromptAgentDefinition(
-            model="gpt-5.2",
-            instructions="You are a storyteller focused on character development and emotional narratives. Create compelling stories with deep character arcs.",
-        ),
-    )
-    storytelling_agents.append(gpt_agent)
-    print(f"Created GPT Agent (id: {gpt_agent.id}, name: {gpt_agent.name})")
-    
-    # Create Mistral storytelling agent
-    mistral_agent = project_client.agents.create_version(
-        agent_name="mistral-storyteller", 
-        definition=PromptAgentDefinition(
-            model="Mistral-Large-3",
-            instructions="You are a storyteller specializing in adventure and action narratives. Write thrilling, fast-paced stories.",
-        ),
-    )
-    storytelling_agents.append(mistral_agent)
-    print(f"Created Mistral Agent (id: {mistral_agent.id}, name: {mistral_agent.name})")
+    # First, create the individual agents that will be used in the workflow (all at once)
+    results = agent_registry.provision_all(project_client, agent_registry.select(group="visual-workflow"))
+    for result in results:
+        print(agent_registry.format_provision_result(result))
+    failed = [result.spec.name for result in results if result.error]
+    if failed:
+        raise RuntimeError(f"could not provision {', '.join(failed)}")
+    agents = {result.spec.name: result.agent for result in results}
     
-    # Create Coordinator Agent
-    coordinator_agent = project_client.agents.create_version(
-        agent_name="story-coordinator",
-        definition=PromptAgentDefinition(
-            model=MODEL_DEPLOYMENT_NAME,
-            instructions="You are a story coordinator that evaluates and selects the best story from multiple AI storytellers. Provide analysis and pick the winner.",
-        ),
-    )
-    print(f"Created Coordinator Agent (id: {coordinator_agent.id}, name: {coordinator_agent.name})")
+    deepseek_agent = agents["deepseek-storyteller"]
+    gpt_agent = agents["gpt-storyteller"]
+    mistral_agent = agents["mistral-storyteller"]
+    coordinator_agent = agents["story-coordinator"]
+    storytelling_agents = [deepseek_agent, gpt_agent, mistral_agent]
 
     # Define the visual workflow YAML
     workflow_yaml = f"""
@@ -164,13 +129,17 @@ trigger:
       id: end_workflow
 """
 
+    # Validate offline before spending a create_version round trip
+    require_valid(workflow_yaml, load_known_agents())
+
     # Create the visual workflow
-    visual_workflow = project_client.agents.create_version(
+    visual_workflow = ensure_agent_version(
+        project_client,
         agent_name="visual-multi-agent-storytelling-workflow",
         definition=WorkflowAgentDefinition(workflow=workflow_yaml),
     )
 
-    print(f"✅ Visual Workflow Created!")
+    print(f"✅ Visual Workflow {describe(visual_workflow)}!")
     print(f"   - ID: {visual_workflow.id}")
     print(f"   - Name: {visual_workflow.name}")
     print(f"   - Version: {visual_workflow.version}")
@@ -178,12 +147,21 @@ trigger:
     
     return visual_workflow, storytelling_agents, coordinator_agent
 
-async def run_visual_workflow(workflow):
-    """Execute the visual workflow"""
+def consume_workflow_stream(stream):
+    """Turn the streamed events into a per-action timeline, printing action transitions as they happen"""
+    profiler = WorkflowProfiler()
+    progress = ConsoleProgress()
+    for event in stream:
+        progress.update(profiler.observe(event))
+    progress.close()
+    return profiler
+
+async def run_visual_workflow(workflow, openai_client=None):
+    """Execute the visual workflow (openai_client: e.g. a stream_recording.ReplayClient)"""
     print(f"\n🚀 Running Visual Workflow: {workflow.name}")
     
     # Get OpenAI client for running the workflow
-    openai_client = project_client.get_openai_client()
+    openai_client = openai_client or foundry_clients.get_openai_client()
     
     # Create conversation for the workflow
     conversation = openai_client.conversations.create()
@@ -199,21 +177,16 @@ async def run_visual_workflow(workflow):
         stream=True,
         metadata={"x-ms-debug-mode-enabled": "1"},
     )
+    stream = stream_recording.record(stream, workflow.name, {"workflow": workflow.name, "input": user_input})
 
     print(f"🎬 Executing workflow with prompt: '{user_input}'\n")
     
-    # Process streaming events
-    for event in stream:
-        print(f"Event {event.sequence_number} type '{event.type}'", end="")
-        if (
-            event.type == ResponseStreamEventType.RESPONSE_OUTPUT_ITEM_ADDED
-            or event.type == ResponseStreamEventType.RESPONSE_OUTPUT_ITEM_DONE
-        ) and event.item.type == ItemType.WORKFLOW_ACTION:
-            print(
-                f": action ID '{event.item.action_id}' is '{event.item.status}' (previous: '{event.item.previous_action_id}')",
-                end="",
-            )
-        print("", flush=True)
+    # Process streaming events into a per-action timeline
+    profiler = consume_workflow_stream(stream)
+
+    print("\n" + profiler.format_report())
+    profile_path, trace_path = profiler.export(workflow.name)
+    print(f"📁 Profile saved to {profile_path} (Chrome trace: {trace_path})")
 
     # Clean up
     openai_client.conversations.delete(conversation_id=conversation.id)
@@ -225,6 +198,8 @@ async def main():
     print("=" * 80)
     
     try:
+        connect()
+
         # Create the visual workflow and agents
         workflow, agents, coordinator = await create_visual_workflow()
         
@@ -0,0 +1,312 @@
+"""
+Offline compiler/validator for Foundry workflow YAML.
+Checks the action schema used in workflow-agent.py, resolves Local.* variables
+against their uses, checks agent references against a cached agent list, and
+caches the validated, normalized form keyed by content hash.
+"""
+
+import os
+import json
+import time
+import difflib
+import hashlib
+from dataclasses import dataclass, field, asdict
+
+from workflow_engine import (
+    SUPPORTED_KINDS,
+    LOCAL_REFERENCE,
+    TEMPLATE_REFERENCE,
+    FUNCTIONS,
+    ExpressionParser,
+    WorkflowError,
+    parse_document,
+    document_actions,
+    build_graph,
+    collect_strings,
+)
+from agent_provisioning import load_manifest
+
+CACHE_DIR = os.environ.get("WORKFLOW_CACHE_DIR", os.path.join(".foundry", "compiled-workflows"))
+AGENT_LIST_PATH = os.environ.get("AGENT_LIST_PATH", os.path.join(".foundry", "agent-list.json"))
+AGENT_LIST_MAX_AGE = 3600  # seconds
+# Part of the cache key; bump when the compiled form (e.g. dependency rules) changes
+COMPILED_FORMAT = 3
+
+# Allowed keys per action kind: (required, optional)
+ACTION_SCHEMA = {
+    "SetVariable": ({"kind", "id", "variable", "value"}, {"description"}),
+    "CreateConversation": ({"kind", "id", "conversationId"}, {"description"}),
+    "InvokeAzureAgent": ({"kind", "id", "agent", "input"}, {"description", "conversationId", "output"}),
+    "SendActivity": ({"kind", "id", "activity"}, {"description"}),
+    "EndConversation": ({"kind", "id"}, {"description"}),
+}
+
+# Keys people reach for that the workflow dialect doesn't use
+KNOWN_MISTAKES = {
+    "variable_name": "variable (e.g. variable: Local.UserPrompt)",
+    "variable_value": "value",
+    "agent_name": "agent.name",
+    "output_variable": "output.messages (e.g. output: {messages: Local.Story})",
+    "conversation_id": "conversationId",
+}
+
+class WorkflowCompileError(WorkflowError):
+    """Raised when a workflow has validation errors"""
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        super().__init__(format_issues(compiled))
+
+@dataclass
+class Issue:
+    severity: str  # "error" or "warning"
+    action_id: str
+    message: str
+
+@dataclass
+class CompiledWorkflow:
+    content_hash: str
+    name: str
+    actions: list
+    agents: list
+    issues: list = field(default_factory=list)
+    from_cache: bool = False
+
+    @property
+    def errors(self):
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+def content_hash(workflow_yaml):
+    """Content hash used as the compiled-form cache key"""
+    return hashlib.sha256(f"{COMPILED_FORMAT}\n{workflow_yaml}".encode("utf-8")).hexdigest()
+
+class SyntaxChecker(ExpressionParser):
+    """Parses an expression for structure only, without evaluating it"""
+
+    def __init__(self, expression):
+        super().__init__(expression, {})
+
+    def parse_call(self, name):
+        if name not in FUNCTIONS:
+            raise WorkflowError(f"unsupported function '{name}'")
+        self.take("(")
+        if self.peek()[1] != ")":
+            self.parse_value()
+            while self.peek()[1] == ",":
+                self.take(",")
+                self.parse_value()
+        self.take(")")
+
+    def parse_path(self, scope):
+        self.take(".")
+        self.take()
+
+    @staticmethod
+    def member(value, member):
+        return None
+
+def check_expression(value):
+    """Return a syntax error message for a workflow value, or None"""
+    try:
+        if value.startswith("="):
+            SyntaxChecker(value[1:]).parse()
+        else:
+            for match in TEMPLATE_REFERENCE.finditer(value):
+                SyntaxChecker(match.group(1)).parse()
+            if any(brace in TEMPLATE_REFERENCE.sub("", value) for brace in "{}"):
+                return "unbalanced '{' or '}' in template"
+    except WorkflowError as e:
+        return str(e)
+    return None
+
+def check_keys(spec, action_id, issues):
+    """Check an action's keys against the schema for its kind"""
+    required, optional = ACTION_SCHEMA[spec["kind"]]
+    for key in sorted(required - spec.keys()):
+        issues.append(Issue("error", action_id, f"missing required key '{key}'"))
+    for key in sorted(spec.keys() - required - optional):
+        hint = KNOWN_MISTAKES.get(key) or ", ".join(difflib.get_close_matches(key, required | optional, n=1))
+        suffix = f" (did you mean {hint}?)" if hint else ""
+        issues.append(Issue("error", action_id, f"unknown key '{key}'{suffix}"))
+
+    if spec["kind"] == "InvokeAzureAgent":
+        if "agent" in spec and (not isinstance(spec["agent"], dict) or not spec["agent"].get("name")):
+            issues.append(Issue("error", action_id, "agent must be a mapping with a 'name'"))
+        if "input" in spec and (not isinstance(spec["input"], dict) or "messages" not in spec["input"]):
+            issues.append(Issue("error", action_id, "input must be a mapping with 'messages'"))
+        if "output" in spec and not isinstance(spec["output"], dict):
+            issues.append(Issue("error", action_id, "output must be a mapping such as {messages: Local.Story}"))
+    elif spec["kind"] == "SendActivity":
+        if "activity" in spec and not isinstance(spec["activity"], str):
+            issues.append(Issue("error", action_id, f"activity must be text, got {spec['activity']!r}"))
+
+def check_variable_target(spec, key, action_id, issues):
+    """Assignment targets must be plain Local.* names, not expressions"""
+    target = spec.get(key)
+    if target is not None and not (isinstance(target, str) and LOCAL_REFERENCE.fullmatch(target)):
+        issues.append(Issue("error", action_id, f"'{key}' must name a Local.* variable, got {target!r}"))
+
+def compile_structure(workflow_yaml, digest):
+    """Parse and validate everything that doesn't depend on the deployed agents"""
+    try:
+        document = parse_document(workflow_yaml)
+        raw_actions = document_actions(document)
+    except WorkflowError as e:
+        return CompiledWorkflow(digest, "", [], [], [Issue("error", "-", str(e))])
+
+    if document.get("kind", "workflow") != "workflow":
+        message = f"top-level kind must be 'workflow', got {document.get('kind')!r}"
+        return CompiledWorkflow(digest, "", [], [], [Issue("error", "-", message)])
+
+    issues = []
+    seen_ids = set()
+    valid_actions = []
+    for index, spec in enumerate(raw_actions):
+        if not isinstance(spec, dict):
+            issues.append(Issue("error", f"#{index}", "action must be a mapping"))
+            continue
+        action_id = spec.get("id") or f"#{index}"
+        if spec.get("kind") not in SUPPORTED_KINDS:
+            issues.append(Issue("error", action_id, f"unsupported kind '{spec.get('kind')}'"))
+            continue
+        if action_id in seen_ids:
+            issues.append(Issue("error", action_id, "duplicate action id"))
+        seen_ids.add(action_id)
+
+        issue_count = len(issues)
+        check_keys(spec, action_id, issues)
+        if spec["kind"] == "SetVariable":
+            check_variable_target(spec, "variable", action_id, issues)
+        elif spec["kind"] == "CreateConversation":
+            check_variable_target(spec, "conversationId", action_id, issues)
+        elif spec["kind"] == "InvokeAzureAgent" and isinstance(spec.get("output"), dict):
+            check_variable_target(spec["output"], "messages", action_id, issues)
+        for text in collect_strings(spec, {"kind", "id", "description"}):
+            error = check_expression(text)
+            if error:
+                issues.append(Issue("error", action_id, f"bad expression {text!r}: {error}"))
+        # Only schema-clean actions take part in the dataflow analysis
+        if len(issues) == issue_count:
+            valid_actions.append(spec)
+
+    actions = build_graph(valid_actions)
+
+    # Resolve Local.* variables: every read needs an earlier write, every write should be read
+    defined = set()
+    used = set()
+    for action in actions:
+        for variable in sorted(action.reads - defined):
+            issues.append(Issue("error", action.id, f"'{variable}' is used before it is set"))
+        used.update(action.reads)
+        defined.update(action.writes)
+    for variable in sorted(defined - used):
+        writer = next(action.id for action in actions if variable in action.writes)
+        issues.append(Issue("warning", writer, f"'{variable}' is set but never used"))
+
+    normalized = [
+        {
+            "id": action.id,
+            "kind": action.kind,
+            "spec": action.spec,
+            "reads": sorted(action.reads),
+            "writes": sorted(action.writes),
+            "deps": sorted(action.deps),
+        }
+        for action in actions
+    ]
+    agents = sorted({action.spec["agent"]["name"] for action in actions if action.kind == "InvokeAzureAgent"})
+    return CompiledWorkflow(digest, document.get("name") or "", normalized, agents, issues)
+
+def cache_path(digest, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{digest}.json")
+
+def load_cached(digest, cache_dir=CACHE_DIR):
+    """Load a previously compiled workflow, or None"""
+    try:
+        with open(cache_path(digest, cache_dir), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    data["issues"] = [Issue(**issue) for issue in data["issues"]]
+    return CompiledWorkflow(**data, from_cache=True)
+
+def store_cached(compiled, cache_dir=CACHE_DIR):
+    """Persist a compiled workflow under its content hash"""
+    os.makedirs(cache_dir, exist_ok=True)
+    data = asdict(compiled)
+    data.pop("from_cache")
+    tmp_path = cache_path(compiled.content_hash, cache_dir) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path(compiled.content_hash, cache_dir))
+
+def load_known_agents(project_client=None, max_age=AGENT_LIST_MAX_AGE, path=AGENT_LIST_PATH):
+    """Cached set of deployed agent names, refreshed from the service when stale
+
+    Without a project client a stale cache is still used, so validation stays offline.
+    Agents recorded in the provisioning manifest are added to the fetched list. Returns
+    None (skip the check) when no list has been fetched: the manifest alone only holds
+    the agents provisioned from this machine, not every agent on the service.
+    """
+    scope = os.environ.get("PROJECT_ENDPOINT", "")
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(scope)
+
+    if project_client is not None and (entry is None or time.time() - entry["fetched_at"] > max_age):
+        entry = {"fetched_at": time.time(), "agents": sorted(agent.name for agent in project_client.agents.list())}
+        cache[scope] = entry
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+
+    if entry is None:
+        return None
+    names = set(entry["agents"])
+    names.update(load_manifest().get(scope, {}).keys())
+    return names
+
+def compile_workflow(workflow_yaml, known_agents=None, use_cache=True, cache_dir=CACHE_DIR):
+    """Compile workflow YAML, reusing the cached structural result when the content is unchanged
+
+    known_agents=None skips the agent reference check (no agent list available).
+    """
+    digest = content_hash(workflow_yaml)
+    compiled = load_cached(digest, cache_dir) if use_cache else None
+    if compiled is None:
+        compiled = compile_structure(workflow_yaml, digest)
+        if use_cache:
+            store_cached(compiled, cache_dir)
+
+    if known_agents is not None:
+        for agent_name in compiled.agents:
+            if agent_name not in known_agents:
+                action_id = next(
+                    action["id"] for action in compiled.actions
+                    if action["kind"] == "InvokeAzureAgent" and action["spec"]["agent"]["name"] == agent_name
+                )
+                compiled.issues.append(Issue("error", action_id, f"agent '{agent_name}' is not deployed"))
+    return compiled
+
+def require_valid(workflow_yaml, known_agents=None):
+    """Compile a workflow and raise WorkflowCompileError if it has errors"""
+    compiled = compile_workflow(workflow_yaml, known_agents)
+    if not compiled.ok:
+        raise WorkflowCompileError(compiled)
+    return compiled
+
+def format_issues(compiled):
+    """One line per issue, errors first"""
+    issues = sorted(compiled.issues, key=lambda issue: issue.severity != "error")
+    lines = []
+    for issue in issues:
+        emoji = "❌" if issue.severity == "error" else "⚠️ "
+        lines.append(f"{emoji} {issue.action_id}: {issue.message}")
+    return "\n".join(lines)
@@ -0,0 +1,409 @@
+"""
+Local execution engine for Foundry workflow YAML.
+Parses the workflow dialect used in this project (SetVariable, CreateConversation,
+InvokeAzureAgent, SendActivity, EndConversation), builds a dataflow graph from the
+Local.* variables each action reads and writes, and runs independent actions concurrently.
+"""
+
+import re
+import time
+import asyncio
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+SUPPORTED_KINDS = {"SetVariable", "CreateConversation", "InvokeAzureAgent", "SendActivity", "EndConversation"}
+LOCAL_REFERENCE = re.compile(r"\bLocal\.[A-Za-z_][A-Za-z0-9_]*")
+TEMPLATE_REFERENCE = re.compile(r"\{([^{}]+)\}")
+
+class WorkflowError(Exception):
+    """Raised when a workflow can't be parsed or executed"""
+
+@dataclass
+class WorkflowAction:
+    index: int
+    id: str
+    kind: str
+    spec: dict
+    reads: set = field(default_factory=set)
+    writes: set = field(default_factory=set)
+    deps: set = field(default_factory=set)
+
+@dataclass
+class ActionTiming:
+    action_id: str
+    kind: str
+    start: float
+    end: float
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+@dataclass
+class WorkflowRun:
+    variables: dict
+    activities: list
+    timings: list
+    wall_time: float
+
+    @property
+    def busy_time(self):
+        """Sum of action durations, i.e. what a strictly sequential run would take"""
+        return sum(timing.duration for timing in self.timings)
+
+    @property
+    def speedup(self):
+        return self.busy_time / self.wall_time if self.wall_time else 1.0
+
+# ---------------------------------------------------------------------------
+# Parsing and dependency analysis
+# ---------------------------------------------------------------------------
+
+def parse_document(workflow_yaml):
+    """Parse workflow YAML into its top-level mapping"""
+    try:
+        document = yaml.safe_load(workflow_yaml)
+    except yaml.YAMLError as e:
+        raise WorkflowError(f"invalid workflow YAML: {e}") from e
+    if not isinstance(document, dict):
+        raise WorkflowError("workflow YAML must be a mapping")
+    return document
+
+def document_actions(document):
+    """Extract the raw action specs from a parsed workflow document"""
+    actions = (document.get("trigger") or {}).get("actions")
+    if not isinstance(actions, list):
+        raise WorkflowError("workflow has no trigger.actions list")
+    return actions
+
+def parse_workflow(workflow_yaml):
+    """Parse workflow YAML into the list of raw action specs"""
+    return document_actions(parse_document(workflow_yaml))
+
+def write_targets(kind, spec):
+    """Variables an action assigns"""
+    if kind == "SetVariable":
+        return {spec["variable"]}
+    if kind == "CreateConversation":
+        return {spec["conversationId"]}
+    if kind == "InvokeAzureAgent":
+        return {target for target in (spec.get("output") or {}).values() if isinstance(target, str)}
+    return set()
+
+def collect_strings(value, skip=()):
+    """Yield every string nested in an action spec, skipping top-level keys in skip"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key not in skip:
+                yield from collect_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from collect_strings(item)
+
+def read_references(kind, spec):
+    """Local.* variables an action reads"""
+    skip = {"kind", "id", "description"}
+    if kind == "SetVariable":
+        skip.add("variable")
+    elif kind == "CreateConversation":
+        skip.add("conversationId")
+    elif kind == "InvokeAzureAgent":
+        skip.add("output")
+    reads = set()
+    for text in collect_strings(spec, skip):
+        reads.update(LOCAL_REFERENCE.findall(text))
+    return reads
+
+def build_graph(raw_actions):
+    """Turn raw action specs into WorkflowActions with dataflow dependencies"""
+    actions = []
+    last_writer = {}
+    readers_since_write = {}
+    last_activity = None
+    invocations = []
+
+    for index, spec in enumerate(raw_actions):
+        kind = spec.get("kind")
+        if kind not in SUPPORTED_KINDS:
+            raise WorkflowError(f"action #{index} has unsupported kind '{kind}'")
+        action_id = spec.get("id") or f"{kind.lower()}_{index}"
+        try:
+            writes = write_targets(kind, spec)
+        except KeyError as e:
+            raise WorkflowError(f"action '{action_id}' is missing required key {e}") from e
+        action = WorkflowAction(index, action_id, kind, spec, read_references(kind, spec), writes)
+
+        # Read-after-write: wait for the value we read
+        for variable in action.reads:
+            if variable in last_writer:
+                action.deps.add(last_writer[variable])
+        # Write-after-read / write-after-write: don't clobber a value still being used
+        for variable in action.writes:
+            if variable in last_writer:
+                action.deps.add(last_writer[variable])
+            action.deps.update(readers_since_write.get(variable, ()))
+        # Activities are user-visible, so they keep their declared order, both among
+        # themselves and after the agent calls before them (which they may announce)
+        if kind == "SendActivity":
+            if last_activity is not None:
+                action.deps.add(last_activity)
+            action.deps.update(invocations)
+            last_activity = action.id
+        if kind == "InvokeAzureAgent":
+            invocations.append(action.id)
+        # EndConversation is a barrier behind everything declared before it
+        if kind == "EndConversation":
+            action.deps.update(previous.id for previous in actions)
+        action.deps.discard(action.id)
+
+        for variable in action.reads:
+            readers_since_write.setdefault(variable, set()).add(action.id)
+        for variable in action.writes:
+            last_writer[variable] = action.id
+            readers_since_write[variable] = set()
+        actions.append(action)
+
+    return actions
+
+def load_workflow(workflow_yaml):
+    """Parse workflow YAML straight into a dependency graph"""
+    return build_graph(parse_workflow(workflow_yaml))
+
+def format_graph(actions):
+    """Describe the dataflow graph, one action per line"""
+    order = {action.id: action.index for action in actions}
+    lines = []
+    for action in actions:
+        deps = ", ".join(sorted(action.deps, key=order.get)) or "-"
+        lines.append(f"{action.id:<36} {action.kind:<20} after: {deps}")
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# Expression evaluation (the Power Fx subset these workflows use)
+# ---------------------------------------------------------------------------
+
+TOKEN = re.compile(r"\s*(?:(?P<string>'(?:[^']|'')*')|(?P<number>\d+(?:\.\d+)?)|(?P<name>[A-Za-z_][A-Za-z0-9_]*)|(?P<punct>[().,]))")
+
+def tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN.match(expression, position)
+        if not match:
+            raise WorkflowError(f"can't parse expression near: {expression[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+    return tokens
+
+def to_text(value):
+    """Flatten a workflow value (text, message or message list) to plain text"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return to_text(value.get("text"))
+    if isinstance(value, list):
+        return "\n".join(to_text(item) for item in value)
+    return str(value)
+
+FUNCTIONS = {
+    "Concat": lambda *args: "".join(to_text(arg) for arg in args),
+    "Last": lambda items: items[-1] if items else None,
+    "First": lambda items: items[0] if items else None,
+    "UserMessage": lambda text: {"role": "user", "text": to_text(text)},
+}
+
+class ExpressionParser:
+    def __init__(self, expression, variables):
+        self.tokens = tokenize(expression)
+        self.position = 0
+        self.variables = variables
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, expected=None):
+        token = self.peek()
+        if token[0] is None or (expected is not None and token[1] != expected):
+            raise WorkflowError(f"expected {expected!r} in expression, got {token[1]!r}")
+        self.position += 1
+        return token
+
+    def parse(self):
+        value = self.parse_value()
+        if self.position != len(self.tokens):
+            raise WorkflowError(f"unexpected {self.peek()[1]!r} in expression")
+        return value
+
+    def parse_value(self):
+        kind, text = self.take()
+        if kind == "string":
+            value = text[1:-1].replace("''", "'")
+        elif kind == "number":
+            value = float(text) if "." in text else int(text)
+        elif kind == "name" and self.peek()[1] == "(":
+            value = self.parse_call(text)
+        elif kind == "name":
+            value = self.parse_path(text)
+        else:
+            raise WorkflowError(f"unexpected {text!r} in expression")
+        # Member access such as Last(Local.Story).Text
+        while self.peek()[1] == ".":
+            self.take(".")
+            member = self.take()[1]
+            value = self.member(value, member)
+        return value
+
+    def parse_call(self, name):
+        if name not in FUNCTIONS:
+            raise WorkflowError(f"unsupported function '{name}'")
+        self.take("(")
+        args = []
+        if self.peek()[1] != ")":
+            args.append(self.parse_value())
+            while self.peek()[1] == ",":
+                self.take(",")
+                args.append(self.parse_value())
+        self.take(")")
+        return FUNCTIONS[name](*args)
+
+    def parse_path(self, scope):
+        self.take(".")
+        name = self.take()[1]
+        variable = f"{scope}.{name}"
+        if variable not in self.variables:
+            raise WorkflowError(f"variable '{variable}' is not set")
+        return self.variables[variable]
+
+    @staticmethod
+    def member(value, member):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key.lower() == member.lower():
+                    return item
+        raise WorkflowError(f"value has no member '{member}'")
+
+def evaluate(value, variables):
+    """Evaluate a workflow value: '=expr' formulas, '{expr}' templates or plain literals"""
+    if not isinstance(value, str):
+        return value
+    if value.startswith("="):
+        return ExpressionParser(value[1:], variables).parse()
+    return TEMPLATE_REFERENCE.sub(lambda match: to_text(ExpressionParser(match.group(1), variables).parse()), value)
+
+# ---------------------------------------------------------------------------
+# Runtime and scheduler
+# ---------------------------------------------------------------------------
+
+class FoundryRuntime:
+    """Executes the remote parts of a workflow through the Foundry Responses API"""
+
+    def __init__(self, openai_client):
+        self.openai_client = openai_client
+
+    def create_conversation(self):
+        return self.openai_client.conversations.create().id
+
+    def invoke_agent(self, agent_name, input_text, conversation_id=None):
+        if conversation_id is None:
+            conversation_id = self.create_conversation()
+        response = self.openai_client.responses.create(
+            conversation=conversation_id,
+            extra_body={"agent": {"name": agent_name, "type": "agent_reference"}},
+            input=input_text,
+        )
+        return response.output_text
+
+class WorkflowEngine:
+    """Runs a workflow graph, starting each action as soon as its dependencies finish"""
+
+    def __init__(self, runtime, max_concurrency=8):
+        self.runtime = runtime
+        self.max_concurrency = max(1, max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="workflow-action")
+
+    async def run(self, actions, user_message):
+        variables = {"System.LastMessageText": user_message}
+        activities = {}
+        timings = []
+        pending = list(actions)
+        running = {}
+        done = set()
+        ended = False
+        started = time.perf_counter()
+
+        try:
+            while (pending or running) and not ended:
+                # Start ready actions in declared order, up to the concurrency limit
+                for action in list(pending):
+                    if len(running) >= self.max_concurrency:
+                        break
+                    if action.deps <= done:
+                        pending.remove(action)
+                        running[asyncio.ensure_future(self.execute(action, variables, activities))] = action
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    action = running.pop(task)
+                    try:
+                        timings.append(task.result())
+                    except WorkflowError:
+                        raise
+                    except Exception as e:
+                        raise WorkflowError(f"action '{action.id}' failed: {e}") from e
+                    done.add(action.id)
+                    ended = ended or action.kind == "EndConversation"
+        finally:
+            for task in running:
+                task.cancel()
+
+        ordered_activities = [activities[action.id] for action in actions if action.id in activities]
+        return WorkflowRun(variables, ordered_activities, timings, time.perf_counter() - started)
+
+    async def execute(self, action, variables, activities):
+        start = time.perf_counter()
+        spec = action.spec
+        loop = asyncio.get_running_loop()
+
+        if action.kind == "SetVariable":
+            variables[spec["variable"]] = evaluate(spec.get("value"), variables)
+        elif action.kind == "CreateConversation":
+            variables[spec["conversationId"]] = await loop.run_in_executor(self.executor, self.runtime.create_conversation)
+        elif action.kind == "InvokeAzureAgent":
+            input_text = to_text(evaluate((spec.get("input") or {}).get("messages"), variables))
+            conversation_id = evaluate(spec["conversationId"], variables) if "conversationId" in spec else None
+            agent_name = spec["agent"]["name"]
+            output_text = await loop.run_in_executor(
+                self.executor, self.runtime.invoke_agent, agent_name, input_text, conversation_id
+            )
+            target = (spec.get("output") or {}).get("messages")
+            if target:
+                history = list(variables.get(target) or [])
+                history.append({"role": "assistant", "text": output_text, "agent": agent_name})
+                variables[target] = history
+        elif action.kind == "SendActivity":
+            activities[action.id] = to_text(evaluate(spec.get("activity"), variables))
+
+        return ActionTiming(action.id, action.kind, start, time.perf_counter())
+
+def format_run_report(run, actions):
+    """Per-action timeline plus the parallel speedup versus a sequential run"""
+    origin = min((timing.start for timing in run.timings), default=0.0)
+    by_id = {timing.action_id: timing for timing in run.timings}
+    output = "⏱️  LOCAL WORKFLOW TIMELINE\n"
+    output += "-" * 72 + "\n"
+    output += f"{'ACTION':<36}{'KIND':<20}{'START':>8}{'DURATION':>10}\n"
+    for action in actions:
+        timing = by_id.get(action.id)
+        if timing:
+            output += f"{action.id:<36}{action.kind:<20}{timing.start - origin:>7.2f}s{timing.duration:>9.2f}s\n"
+    output += "-" * 72 + "\n"
+    output += f"Wall time {run.wall_time:.2f}s vs sequential {run.busy_time:.2f}s (speedup {run.speedup:.2f}x)\n"
+    return output
@@ -0,0 +1,209 @@
+"""
+Timeline and critical-path profiler for hosted workflow runs.
+Feeds on the Responses stream of a workflow agent: every WORKFLOW_ACTION item that is
+added or done marks an action starting or finishing, so each action gets a start, end,
+duration and the idle gap since the action before it (previous_action_id). Walking the
+previous_action_id chain back from the last action to finish gives the critical path,
+i.e. the steps whose latency adds up to the end-to-end time.
+"""
+
+import os
+import sys
+import json
+import time
+from dataclasses import dataclass, asdict
+
+ACTION_ADDED = "response.output_item.added"
+ACTION_DONE = "response.output_item.done"
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+PROFILE_DIR = os.environ.get("WORKFLOW_PROFILE_DIR", os.path.join(".foundry", "workflow-profiles"))
+CONSOLE_INTERVAL = 0.1  # seconds between console flushes
+
+@dataclass
+class ActionRecord:
+    action_id: str
+    kind: str = None
+    status: str = "in_progress"
+    previous_action_id: str = None
+    parent_action_id: str = None
+    start: float = None  # seconds since the stream started
+    end: float = None
+
+    @property
+    def duration(self):
+        return (self.end - self.start) if self.end is not None else None
+
+class WorkflowProfiler:
+    """Collects per-action timings from streamed workflow events"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.origin = None
+        self.finished_at = None
+        self.actions = {}  # action_id -> ActionRecord, in the order actions appeared
+        self.event_count = 0
+
+    def elapsed(self, at=None):
+        now = self.clock() if at is None else at
+        if self.origin is None:
+            self.origin = now
+        return now - self.origin
+
+    def observe(self, event, at=None):
+        """Record one stream event (at: its clock time, for replays); returns the ActionRecord it touched, if any"""
+        elapsed = self.elapsed(at)
+        self.event_count += 1
+        self.finished_at = elapsed
+        item = getattr(event, "item", None)
+        if event.type not in (ACTION_ADDED, ACTION_DONE) or getattr(item, "type", None) != "workflow_action":
+            return None
+
+        record = self.actions.get(item.action_id)
+        if record is None:
+            record = self.actions[item.action_id] = ActionRecord(item.action_id, start=elapsed)
+        record.kind = getattr(item, "kind", None) or record.kind
+        record.previous_action_id = getattr(item, "previous_action_id", None) or record.previous_action_id
+        record.parent_action_id = getattr(item, "parent_action_id", None) or record.parent_action_id
+        record.status = item.status
+        if item.status in FINISHED_STATUSES:
+            record.end = elapsed
+        return record
+
+    @property
+    def wall_time(self):
+        return self.finished_at or 0.0
+
+    def gap(self, record):
+        """Idle time between the previous action finishing and this one starting"""
+        previous = self.actions.get(record.previous_action_id)
+        if previous is None or previous.end is None:
+            return record.start
+        return max(0.0, record.start - previous.end)
+
+    def critical_path(self):
+        """Top-level actions from the first to the last one to finish, following previous_action_id"""
+        top_level = [record for record in self.actions.values() if not record.parent_action_id]
+        finished = [record for record in top_level if record.end is not None]
+        if not finished:
+            return []
+        path = []
+        record = max(finished, key=lambda record: record.end)
+        while record is not None and record not in path:
+            path.append(record)
+            record = self.actions.get(record.previous_action_id)
+        return path[::-1]
+
+    def dominant_step(self):
+        """The critical-path action that contributes most (its duration plus the gap before it)"""
+        path = self.critical_path()
+        if not path:
+            return None
+        return max(path, key=lambda record: (record.duration or 0.0) + self.gap(record))
+
+    def to_dict(self):
+        critical = {record.action_id for record in self.critical_path()}
+        dominant = self.dominant_step()
+        return {
+            "wall_time": self.wall_time,
+            "events": self.event_count,
+            "actions": [
+                dict(asdict(record), duration=record.duration, gap=self.gap(record), critical=record.action_id in critical)
+                for record in self.actions.values()
+            ],
+            "critical_path": [record.action_id for record in self.critical_path()],
+            "dominant_step": dominant.action_id if dominant else None,
+        }
+
+    def to_chrome_trace(self, name="workflow"):
+        """Chrome trace-event JSON (chrome://tracing, Perfetto); overlapping actions get separate rows"""
+        lanes = []  # end time of the last action in each row
+        events = []
+        critical = {record.action_id for record in self.critical_path()}
+        for record in sorted(self.actions.values(), key=lambda record: record.start):
+            end = record.end if record.end is not None else self.wall_time
+            lane = next((index for index, lane_end in enumerate(lanes) if lane_end <= record.start), len(lanes))
+            if lane == len(lanes):
+                lanes.append(end)
+            lanes[lane] = end
+            events.append({
+                "name": record.action_id,
+                "cat": record.kind or "action",
+                "ph": "X",
+                "ts": record.start * 1e6,
+                "dur": (end - record.start) * 1e6,
+                "pid": 1,
+                "tid": lane + 1,
+                "args": {"status": record.status, "previous": record.previous_action_id, "critical": record.action_id in critical},
+            })
+        events.append({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, name, directory=PROFILE_DIR):
+        """Write <name>-<timestamp>.json and .trace.json; returns both paths"""
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        with open(stem + ".json", "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(stem + ".trace.json", "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(name), f)
+        return stem + ".json", stem + ".trace.json"
+
+    def format_report(self):
+        """Timeline table with the critical path marked, plus the step that dominates latency"""
+        if not self.actions:
+            return f"⏱️  No workflow actions in {self.event_count} events ({self.wall_time:.2f}s)"
+        critical = {record.action_id for record in self.critical_path()}
+        output = "⏱️  WORKFLOW TIMELINE (★ = critical path)\n"
+        output += "-" * 92 + "\n"
+        output += f"  {'ACTION':<34}{'KIND':<22}{'STATUS':<12}{'START':>8}{'DURATION':>10}{'GAP':>8}\n"
+        for record in self.actions.values():
+            marker = "★" if record.action_id in critical else " "
+            duration = f"{record.duration:>9.2f}s" if record.duration is not None else f"{'-':>10}"
+            output += (
+                f"{marker} {record.action_id:<34}{(record.kind or '?'):<22}{record.status:<12}"
+                f"{record.start:>7.2f}s{duration}{self.gap(record):>7.2f}s\n"
+            )
+        output += "-" * 92 + "\n"
+        path = self.critical_path()
+        output += f"🧭 Critical path: {' → '.join(record.action_id for record in path)}\n"
+        dominant = self.dominant_step()
+        if dominant is not None and self.wall_time:
+            share = ((dominant.duration or 0.0) + self.gap(dominant)) / self.wall_time
+            output += (
+                f"🐢 Dominant step: {dominant.action_id} ({dominant.kind}) {dominant.duration or 0.0:.2f}s "
+                f"+ {self.gap(dominant):.2f}s gap = {share:.0%} of {self.wall_time:.2f}s end to end\n"
+            )
+        return output
+
+class ConsoleProgress:
+    """Prints one line per action transition, flushing at most every `interval` seconds
+
+    Other stream events are only counted, so long runs don't flood (or wait on) the terminal.
+    """
+
+    def __init__(self, interval=CONSOLE_INTERVAL, stream=None, clock=time.perf_counter):
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.clock = clock
+        self.last_flush = 0.0
+        self.skipped = 0
+
+    def update(self, record):
+        if record is None:
+            self.skipped += 1
+            return
+        if record.end is None:
+            line = f"▶️  {record.start:7.2f}s {record.action_id} ({record.kind})"
+        else:
+            emoji = "✅" if record.status == "completed" else "❌"
+            line = f"{emoji} {record.end:7.2f}s {record.action_id} {record.status} in {record.duration:.2f}s"
+        self.stream.write(line + "\n")
+        now = self.clock()
+        if now - self.last_flush >= self.interval:
+            self.stream.flush()
+            self.last_flush = now
+
+    def close(self):
+        if self.skipped:
+            self.stream.write(f"   ({self.skipped} other stream events)\n")
+        self.stream.flush()